@@ -0,0 +1,4 @@
+"""Benchmarks for CodeCollab AI.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_scheduler``.
+"""
@@ -0,0 +1,41 @@
+"""Shared helpers for the benchmark scripts."""
+
+import logging
+import math
+from typing import Dict, List, Sequence
+
+
+def quiet_logging():
+    """Silence per-message hub logging so it doesn't dominate measurements."""
+    logging.getLogger("codecollab").setLevel(logging.WARNING)
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``pct`` in 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """p50/p99/p999/max of latency samples, in milliseconds."""
+    return {
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'p999_ms': percentile(samples, 99.9) * 1000,
+        'max_ms': (max(samples) if samples else 0.0) * 1000,
+    }
+
+
+def print_table(headers: List[str], rows: List[List]):
+    """Print a fixed-width results table."""
+    cells = [[str(h) for h in headers]] + [
+        [f"{c:.3f}" if isinstance(c, float) else str(c) for c in row] for row in rows
+    ]
+    widths = [max(len(r[i]) for r in cells) for i in range(len(headers))]
+    for index, row in enumerate(cells):
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if index == 0:
+            print("  ".join("-" * width for width in widths))
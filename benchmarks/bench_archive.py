@@ -0,0 +1,80 @@
+"""Archive lookup latency as the archive grows.
+
+Archives ``MESSAGES`` messages spread over ``CONVERSATIONS`` conversations,
+then reopens the archive (so nothing is cached in Python objects) and times
+random lookups by message id, by conversation and by agent pair. Lookups
+binary-search the memory-mapped index of each segment, so latency grows
+with the number of segments and log(segment size), not with the archive's
+total size.
+
+    python -m benchmarks.bench_archive
+"""
+
+import random
+import tempfile
+import time
+
+from benchmarks._common import print_table, summarize
+from codecollab.core.archive import MessageArchive
+from codecollab.core.communication_hub import AgentRole, Message, MessageType
+
+SIZES = (10_000, 100_000, 400_000)
+CONVERSATIONS = 1_000
+SEGMENT_MESSAGES = 65_536
+LOOKUPS = 2_000
+
+ROLES = list(AgentRole)
+
+
+def timed(fn, arguments):
+    samples = []
+    for argument in arguments:
+        start = time.perf_counter()
+        fn(argument)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def main():
+    rng = random.Random(7)
+    rows = []
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            archive = MessageArchive(directory, segment_messages=SEGMENT_MESSAGES)
+            ids = []
+            start = time.perf_counter()
+            for i in range(size):
+                sender, recipient = rng.sample(ROLES, 2)
+                message = Message(
+                    sender=sender,
+                    recipient=recipient,
+                    message_type=MessageType.STATUS_UPDATE,
+                    content=f"archived message {i}",
+                    conversation_id=f"conv-{i % CONVERSATIONS}"
+                )
+                ids.append(message.id)
+                archive.append(message)
+            archive.close()
+            write_s = time.perf_counter() - start
+
+            archive = MessageArchive(directory, segment_messages=SEGMENT_MESSAGES)
+            by_id = timed(archive.get, rng.sample(ids, LOOKUPS))
+            by_conversation = timed(
+                lambda c: archive.by_conversation(c, limit=20),
+                [f"conv-{rng.randrange(CONVERSATIONS)}" for _ in range(LOOKUPS)]
+            )
+            by_pair = timed(
+                lambda pair: archive.between(*pair, limit=20),
+                [tuple(rng.sample(ROLES, 2)) for _ in range(LOOKUPS)]
+            )
+            stats = archive.get_stats()
+            archive.close()
+        rows.append([size, stats['segments'], size / write_s,
+                     by_id['p50_ms'], by_id['p99_ms'],
+                     by_conversation['p50_ms'], by_pair['p50_ms']])
+    print_table(["messages", "segments", "append/s", "id_p50_ms", "id_p99_ms",
+                 "conv20_p50_ms", "pair20_p50_ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Burst send throughput: per-message send_message vs batched send_messages.
+
+Each run starts a hub with a developer subscriber, pushes a burst of
+messages and waits until the subscriber has seen all of them. ``enqueue``
+is the time spent inside the send call(s); ``total`` runs until the last
+delivery. The ``batched+lane`` mode additionally subscribes the developer
+with ``batch_size`` so the lane hands over lists instead of single messages.
+
+    python -m benchmarks.bench_batch_send
+"""
+
+import asyncio
+import time
+
+from benchmarks._common import print_table, quiet_logging
+from codecollab.core.communication_hub import (
+    AgentRole, CommunicationHub, Message, MessageType
+)
+
+BURSTS = (1_000, 10_000, 100_000)
+LANE_BATCH_SIZE = 256
+
+
+def make_burst(size):
+    return [
+        Message(
+            sender=AgentRole.PRODUCT_MANAGER,
+            recipient=AgentRole.DEVELOPER,
+            message_type=MessageType.STATUS_UPDATE,
+            content=f"update {i}"
+        )
+        for i in range(size)
+    ]
+
+
+async def run(mode, size):
+    hub = CommunicationHub(history_limit=None)
+    done = asyncio.Event()
+    received = 0
+
+    def on_message(message):
+        nonlocal received
+        received += 1
+        if received == size:
+            done.set()
+
+    def on_batch(messages):
+        nonlocal received
+        received += len(messages)
+        if received == size:
+            done.set()
+
+    if mode == "batched+lane":
+        hub.subscribe(AgentRole.DEVELOPER, on_batch, batch_size=LANE_BATCH_SIZE)
+    else:
+        hub.subscribe(AgentRole.DEVELOPER, on_message)
+
+    messages = make_burst(size)
+    await hub.start()
+    try:
+        start = time.perf_counter()
+        if mode == "per-message":
+            for message in messages:
+                await hub.send_message(message)
+        else:
+            await hub.send_messages(messages)
+        enqueued = time.perf_counter()
+        await asyncio.wait_for(done.wait(), timeout=120.0)
+        finished = time.perf_counter()
+    finally:
+        await hub.stop()
+    return enqueued - start, finished - start
+
+
+async def main():
+    quiet_logging()
+    rows = []
+    for size in BURSTS:
+        for mode in ("per-message", "batched", "batched+lane"):
+            enqueue, total = await run(mode, size)
+            rows.append([size, mode, enqueue * 1000, total * 1000, size / total])
+    print_table(["burst", "mode", "enqueue_ms", "total_ms", "msgs/s"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
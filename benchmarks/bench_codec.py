@@ -0,0 +1,67 @@
+"""Encode/decode throughput of the Message codecs.
+
+Compares the dict path (``to_dict`` with its metadata deep copy +
+``json.dumps``, ``json.loads`` + ``Message.from_dict``) with ``JsonCodec``
+and ``BinaryCodec``, for messages with and without metadata.
+
+    python -m benchmarks.bench_codec
+"""
+
+import json
+import time
+
+from benchmarks._common import print_table
+from codecollab.core.codec import BinaryCodec, JsonCodec
+from codecollab.core.message import AgentRole, Message, MessagePriority, MessageType
+
+ITERATIONS = 100_000
+
+
+class DictCodec:
+    """to_dict()/from_dict() through the json module."""
+
+    def encode(self, message):
+        return json.dumps(message.to_dict()).encode('utf-8')
+
+    def decode(self, payload):
+        return Message.from_dict(json.loads(payload))
+
+
+def throughput(func, arg):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(arg)
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+def main():
+    messages = {
+        "plain": Message(
+            sender=AgentRole.DEVELOPER, recipient=AgentRole.REVIEWER,
+            message_type=MessageType.STATUS_UPDATE, content="Build finished: 42 tests passed",
+        ),
+        "metadata": Message(
+            sender=AgentRole.DEVELOPER, recipient=AgentRole.REVIEWER,
+            message_type=MessageType.TASK_RESPONSE, content="Review complete",
+            priority=MessagePriority.HIGH, requires_response=True,
+            metadata={'response_to': 'abc-123', 'agent_id': 'dev-1', 'processing_time': 1.25,
+                      'files': ['api.py', 'models.py']},
+        ),
+    }
+    codecs = [("to_dict+json", DictCodec()),
+              ("JsonCodec", JsonCodec()),
+              ("BinaryCodec", BinaryCodec())]
+    rows = []
+    for label, message in messages.items():
+        for name, codec in codecs:
+            payload = codec.encode(message)
+            rows.append([
+                label, name, len(payload),
+                f"{throughput(codec.encode, message):,.0f}",
+                f"{throughput(codec.decode, payload):,.0f}",
+            ])
+    print_table(["message", "codec", "bytes", "encode_per_sec", "decode_per_sec"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Hub dispatch loop: throughput, ping-pong round trips and idle cost.
+
+- ``stream``: ``MESSAGES`` sends back to back to one subscriber (the
+  dispatcher mostly finds a full queue and drains it in batches)
+- ``ping-pong``: one message in flight at a time, so the dispatcher
+  suspends on an empty queue before every message
+- ``idle``: CPU seconds and event-loop wake-ups while a started hub sits
+  idle for ``IDLE_SECONDS``
+
+Best of ``ROUNDS`` per workload. Run it on two commits to compare::
+
+    python -m benchmarks.bench_dispatch
+"""
+
+import asyncio
+import time
+
+from benchmarks._common import print_table, quiet_logging
+from codecollab.core.communication_hub import (
+    AgentRole, CommunicationHub, Message, MessageType
+)
+
+MESSAGES = 50_000
+PING_PONGS = 20_000
+IDLE_SECONDS = 3.0
+ROUNDS = 3
+
+
+def make_message(i: int) -> Message:
+    return Message(
+        sender=AgentRole.PRODUCT_MANAGER,
+        recipient=AgentRole.DEVELOPER,
+        message_type=MessageType.STATUS_UPDATE,
+        content=f"update {i}",
+        conversation_id="bench"
+    )
+
+
+async def stream() -> float:
+    hub = CommunicationHub(history_limit=1000)
+    done = asyncio.Event()
+    received = 0
+
+    def on_message(message):
+        nonlocal received
+        received += 1
+        if received == MESSAGES:
+            done.set()
+
+    hub.subscribe(AgentRole.DEVELOPER, on_message)
+    await hub.start()
+    try:
+        start = time.perf_counter()
+        for i in range(MESSAGES):
+            await hub.send_message(make_message(i))
+        await asyncio.wait_for(done.wait(), timeout=120.0)
+        return time.perf_counter() - start
+    finally:
+        await hub.stop()
+
+
+async def ping_pong() -> float:
+    hub = CommunicationHub(history_limit=1000)
+    loop = asyncio.get_running_loop()
+    waiter = None
+
+    def on_message(message):
+        waiter.set_result(None)
+
+    hub.subscribe(AgentRole.DEVELOPER, on_message)
+    await hub.start()
+    try:
+        start = time.perf_counter()
+        for i in range(PING_PONGS):
+            waiter = loop.create_future()
+            await hub.send_message(make_message(i))
+            await waiter
+        return time.perf_counter() - start
+    finally:
+        await hub.stop()
+
+
+async def idle():
+    """CPU seconds and loop iterations while a started hub has no traffic."""
+    hub = CommunicationHub()
+    hub.subscribe(AgentRole.DEVELOPER, lambda message: None)
+    await hub.start()
+    loop = asyncio.get_running_loop()
+    wakeups = 0
+    original = loop._run_once
+
+    def counting_run_once():
+        nonlocal wakeups
+        wakeups += 1
+        original()
+
+    try:
+        await asyncio.sleep(0.1)
+        loop._run_once = counting_run_once
+        cpu = time.process_time()
+        await asyncio.sleep(IDLE_SECONDS)
+        cpu = time.process_time() - cpu
+    finally:
+        loop._run_once = original
+        await hub.stop()
+    # The sleep above accounts for two iterations (schedule + wake)
+    return cpu, max(wakeups - 2, 0)
+
+
+async def main():
+    quiet_logging()
+    stream_s = min([await stream() for _ in range(ROUNDS)])
+    ping_s = min([await ping_pong() for _ in range(ROUNDS)])
+    idle_cpu, wakeups = await idle()
+    print_table(["workload", "total_ms", "msgs/s", "us/msg"], [
+        ["stream", stream_s * 1000, MESSAGES / stream_s, stream_s / MESSAGES * 1e6],
+        ["ping-pong", ping_s * 1000, PING_PONGS / ping_s, ping_s / PING_PONGS * 1e6],
+    ])
+    print()
+    print_table(["idle_s", "cpu_ms", "loop_wakeups"], [[IDLE_SECONDS, idle_cpu * 1000, wakeups]])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
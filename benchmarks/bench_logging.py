@@ -0,0 +1,91 @@
+"""Hub throughput with logging off, synchronous, queued and sampled.
+
+Every mode sends the same stream of messages through ``send_message`` to a
+developer subscriber and waits for the last delivery. Output goes to
+``os.devnull`` so only formatting and handler overhead is measured:
+
+- ``off``: ``codecollab`` logger at WARNING (per-message events skipped)
+- ``sync``: a plain ``StreamHandler`` at INFO on the event loop thread,
+  as the old ``basicConfig`` call at import time did
+- ``queued``: ``configure_logging`` - formatting and writes on the
+  background listener thread
+- ``queued 1%``: as above, keeping 1 in 100 per-message events
+
+    python -m benchmarks.bench_logging
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from benchmarks._common import print_table, quiet_logging
+from codecollab.core.communication_hub import (
+    AgentRole, CommunicationHub, Message, MessageType
+)
+from codecollab.core.logging_utils import configure_logging, shutdown_logging
+
+MESSAGES = 50_000
+
+
+async def run(size):
+    hub = CommunicationHub(history_limit=1000)
+    done = asyncio.Event()
+    received = 0
+
+    def on_message(message):
+        nonlocal received
+        received += 1
+        if received == size:
+            done.set()
+
+    hub.subscribe(AgentRole.DEVELOPER, on_message)
+    await hub.start()
+    try:
+        start = time.perf_counter()
+        for i in range(size):
+            await hub.send_message(Message(
+                sender=AgentRole.PRODUCT_MANAGER,
+                recipient=AgentRole.DEVELOPER,
+                message_type=MessageType.STATUS_UPDATE,
+                content=f"update {i}",
+                conversation_id="bench"
+            ))
+        await asyncio.wait_for(done.wait(), timeout=120.0)
+        return time.perf_counter() - start
+    finally:
+        await hub.stop()
+
+
+async def main():
+    logger = logging.getLogger("codecollab")
+    rows = []
+    with open(os.devnull, "w") as devnull:
+        quiet_logging()
+        elapsed = await run(MESSAGES)
+        rows.append(["off", elapsed * 1000, MESSAGES / elapsed])
+
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        try:
+            elapsed = await run(MESSAGES)
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+        rows.append(["sync", elapsed * 1000, MESSAGES / elapsed])
+
+        for label, rate in (("queued", 1.0), ("queued 1%", 0.01)):
+            configure_logging(sample_rate=rate, stream=devnull)
+            try:
+                elapsed = await run(MESSAGES)
+            finally:
+                shutdown_logging()
+            rows.append([label, elapsed * 1000, MESSAGES / elapsed])
+    print_table(["logging", "total_ms", "msgs/s"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
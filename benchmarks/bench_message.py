@@ -0,0 +1,93 @@
+"""Message construction rate and memory: slotted Message vs the old dataclass.
+
+``LegacyMessage`` is the previous ``@dataclass`` definition (uuid4 ids, a
+fresh metadata dict per instance). For each variant the benchmark reports
+messages constructed per second and, via tracemalloc, the bytes and
+allocation count retained per live message.
+
+    python -m benchmarks.bench_message
+"""
+
+import gc
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from benchmarks._common import print_table
+from codecollab.core.communication_hub import (
+    AgentRole, Message, MessagePriority, MessageType
+)
+
+RATE_COUNT = 200_000
+MEMORY_COUNT = 50_000
+
+
+@dataclass
+class LegacyMessage:
+    """The Message dataclass as it was before slots/counter ids."""
+    sender: AgentRole
+    recipient: AgentRole
+    message_type: MessageType
+    content: str
+    id: Optional[str] = None
+    priority: MessagePriority = MessagePriority.MEDIUM
+    timestamp: Optional[float] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    requires_response: bool = False
+    conversation_id: Optional[str] = None
+
+    def __post_init__(self):
+        if self.timestamp is None:
+            self.timestamp = time.time()
+        if self.id is None:
+            self.id = str(uuid.uuid4())
+        if self.conversation_id is None:
+            self.conversation_id = str(uuid.uuid4())
+
+
+def build(cls, count, with_metadata):
+    make = (
+        (lambda: cls(AgentRole.DEVELOPER, AgentRole.REVIEWER, MessageType.STATUS_UPDATE,
+                     "status", metadata={'broadcast': True}))
+        if with_metadata else
+        (lambda: cls(AgentRole.DEVELOPER, AgentRole.REVIEWER, MessageType.STATUS_UPDATE,
+                     "status"))
+    )
+    return [make() for _ in range(count)]
+
+
+def construction_rate(cls, with_metadata):
+    start = time.perf_counter()
+    build(cls, RATE_COUNT, with_metadata)
+    return RATE_COUNT / (time.perf_counter() - start)
+
+
+def retained_memory(cls, with_metadata):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    messages = build(cls, MEMORY_COUNT, with_metadata)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del messages
+    return size / MEMORY_COUNT, blocks / MEMORY_COUNT
+
+
+def main():
+    rows = []
+    for with_metadata in (False, True):
+        for name, cls in (("legacy dataclass", LegacyMessage), ("slotted Message", Message)):
+            rate = construction_rate(cls, with_metadata)
+            size, blocks = retained_memory(cls, with_metadata)
+            rows.append([name, "yes" if with_metadata else "no",
+                         f"{rate:,.0f}", f"{size:.0f}", f"{blocks:.1f}"])
+    print_table(["class", "metadata", "msgs_per_sec", "bytes_per_msg", "allocs_per_msg"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Cost of hub latency instrumentation, and what it reports.
+
+Sends the same stream through ``send_message`` to a developer subscriber
+with ``metrics=None`` and with a ``HubMetrics``, best of ``ROUNDS`` each,
+then prints the per-stage percentiles the instrumented run recorded.
+
+    python -m benchmarks.bench_metrics
+"""
+
+import asyncio
+import time
+
+from benchmarks._common import print_table, quiet_logging
+from codecollab.core.communication_hub import (
+    AgentRole, CommunicationHub, Message, MessageType
+)
+from codecollab.core.metrics import STAGES, HubMetrics
+
+MESSAGES = 50_000
+ROUNDS = 3
+
+
+async def run(metrics):
+    hub = CommunicationHub(history_limit=1000, metrics=metrics)
+    done = asyncio.Event()
+    received = 0
+
+    def on_message(message):
+        nonlocal received
+        received += 1
+        if received == MESSAGES:
+            done.set()
+
+    hub.subscribe(AgentRole.DEVELOPER, on_message)
+    await hub.start()
+    try:
+        start = time.perf_counter()
+        for i in range(MESSAGES):
+            await hub.send_message(Message(
+                sender=AgentRole.PRODUCT_MANAGER,
+                recipient=AgentRole.DEVELOPER,
+                message_type=MessageType.STATUS_UPDATE,
+                content=f"update {i}",
+                conversation_id="bench"
+            ))
+        await asyncio.wait_for(done.wait(), timeout=120.0)
+        return time.perf_counter() - start
+    finally:
+        await hub.stop()
+
+
+async def main():
+    quiet_logging()
+    off = min([await run(None) for _ in range(ROUNDS)])
+    metrics = HubMetrics()
+    on = min([await run(metrics) for _ in range(ROUNDS)])
+    print_table(["metrics", "total_ms", "msgs/s", "overhead_%"], [
+        ["off", off * 1000, MESSAGES / off, 0.0],
+        ["on", on * 1000, MESSAGES / on, (on / off - 1) * 100],
+    ])
+    print()
+    snapshot = metrics.snapshot()
+    print_table(["stage", "count", "p50_ms", "p99_ms", "p999_ms", "max_ms"], [
+        [stage] + [snapshot[stage]['all'][k] for k in ("count", "p50_ms", "p99_ms", "p999_ms", "max_ms")]
+        for stage in STAGES
+    ])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
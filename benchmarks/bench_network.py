@@ -0,0 +1,130 @@
+"""Remote hub throughput and request latency over TCP and Unix sockets.
+
+A HubServer and the HubClients run in one process, so the numbers measure
+framing, socket and codec overhead rather than the network. Throughput is
+pipelined ``send_message`` from one client to a remote subscriber; latency
+is sequential ``send_request`` round trips (client -> hub -> remote agent ->
+hub -> client), compared with the same request on an in-process hub.
+
+    python -m benchmarks.bench_network
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks._common import print_table, quiet_logging, summarize
+from codecollab.core.communication_hub import (
+    AgentRole, CommunicationHub, Message, MessageType
+)
+from codecollab.core.network import HubClient, HubServer
+
+MESSAGES = 20_000
+REQUESTS = 1_000
+
+
+def make_message(i):
+    return Message(
+        sender=AgentRole.ORCHESTRATOR,
+        recipient=AgentRole.DEVELOPER,
+        message_type=MessageType.STATUS_UPDATE,
+        content=f"work item {i}",
+        conversation_id="bench"
+    )
+
+
+def responder(send):
+    async def answer(message):
+        if message.requires_response:
+            await send(Message(
+                sender=AgentRole.DEVELOPER,
+                recipient=message.sender,
+                message_type=MessageType.TASK_RESPONSE,
+                content="ok",
+                metadata={'response_to': message.id}
+            ))
+    return answer
+
+
+async def run_local():
+    hub = CommunicationHub(history_limit=1000)
+    received = 0
+
+    def count(message):
+        nonlocal received
+        received += 1
+        if message.requires_response:
+            return responder(hub.send_message)(message)
+
+    hub.subscribe(AgentRole.DEVELOPER, count)
+    await hub.start()
+    try:
+        return await drive(hub, lambda: received)
+    finally:
+        await hub.stop()
+
+
+async def run_remote(path=None):
+    hub = CommunicationHub(history_limit=1000)
+    server = HubServer(hub, path=path)
+    await hub.start()
+    await server.start()
+    address = {'path': path} if path else {'port': server.address[1]}
+    sender = HubClient(**address)
+    agent = HubClient(**address)
+    received = 0
+
+    def count(message):
+        nonlocal received
+        received += 1
+        if message.requires_response:
+            return responder(agent.send_message)(message)
+
+    agent.subscribe(AgentRole.DEVELOPER, count)
+    try:
+        await sender.connect()
+        await agent.connect()
+        return await drive(sender, lambda: received)
+    finally:
+        await sender.close()
+        await agent.close()
+        await server.stop()
+        await hub.stop()
+
+
+async def drive(sender, received):
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        await sender.send_message(make_message(i))
+    while received() < MESSAGES:
+        await asyncio.sleep(0.001)
+    throughput = MESSAGES / (time.perf_counter() - start)
+
+    samples = []
+    for i in range(REQUESTS):
+        began = time.perf_counter()
+        response = await sender.send_request(
+            AgentRole.ORCHESTRATOR, AgentRole.DEVELOPER, f"request {i}", timeout=5.0
+        )
+        assert response is not None
+        samples.append(time.perf_counter() - began)
+    return throughput, summarize(samples)
+
+
+async def main():
+    quiet_logging()
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, runner in [
+            ("in-process", run_local),
+            ("tcp", run_remote),
+            ("unix", lambda: run_remote(os.path.join(directory, "hub.sock"))),
+        ]:
+            throughput, latency = await runner()
+            rows.append([name, throughput, latency['p50_ms'], latency['p99_ms']])
+    print_table(["transport", "msgs/s", "request_p50_ms", "request_p99_ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
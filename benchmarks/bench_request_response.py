@@ -0,0 +1,99 @@
+"""send_request round-trip latency as the number of completed requests grows.
+
+The hub used to append a response closure to ``broadcast_subscribers`` for
+every request and never remove it, so each later message ran every closure
+ever created. ``LegacyRequestHub`` reproduces that behaviour for a small run;
+the current hub is driven through 100k requests and should report the same
+mean latency in the last window as in the first.
+
+    python -m benchmarks.bench_request_response
+"""
+
+import asyncio
+import time
+import uuid
+
+from benchmarks._common import print_table, quiet_logging, summarize
+from codecollab.core.communication_hub import (
+    AgentRole, CommunicationHub, Message, MessageType
+)
+
+TOTAL_REQUESTS = 100_000
+LEGACY_REQUESTS = 4_000
+WINDOWS = 10
+
+
+class LegacyRequestHub(CommunicationHub):
+    """send_request as it was: one broadcast closure per request, never removed."""
+
+    async def send_request(self, sender, recipient, content,
+                           message_type=MessageType.TASK_REQUEST, timeout=30.0):
+        request_msg = Message(
+            id=str(uuid.uuid4()), sender=sender, recipient=recipient,
+            message_type=message_type, content=content, requires_response=True
+        )
+        response_future = asyncio.get_running_loop().create_future()
+
+        def response_handler(message):
+            metadata = message.metadata or {}
+            if message.sender == recipient and metadata.get('response_to') == request_msg.id:
+                if not response_future.done():
+                    response_future.set_result(message)
+
+        self.subscribe_to_all(response_handler)
+        await self.send_message(request_msg)
+        try:
+            return await asyncio.wait_for(response_future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+async def run(hub_class, total):
+    hub = hub_class()
+
+    async def responder(message):
+        if message.requires_response:
+            await hub.send_message(Message(
+                sender=AgentRole.DEVELOPER,
+                recipient=message.sender,
+                message_type=MessageType.TASK_RESPONSE,
+                content="ok",
+                metadata={'response_to': message.id},
+            ))
+
+    hub.subscribe(AgentRole.DEVELOPER, responder)
+    await hub.start()
+    window = total // WINDOWS
+    rows = []
+    try:
+        samples = []
+        for i in range(total):
+            start = time.perf_counter()
+            response = await hub.send_request(
+                AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "ping", timeout=5.0
+            )
+            assert response is not None
+            samples.append(time.perf_counter() - start)
+            if len(samples) == window:
+                stats = summarize(samples)
+                rows.append([i + 1, sum(samples) / len(samples) * 1000,
+                             stats['p50_ms'], stats['p99_ms'],
+                             len(hub.broadcast_subscribers)])
+                samples = []
+    finally:
+        await hub.stop()
+    return rows
+
+
+async def main():
+    quiet_logging()
+    headers = ["requests_done", "mean_ms", "p50_ms", "p99_ms", "broadcast_subs"]
+    print(f"Legacy send_request ({LEGACY_REQUESTS} requests)")
+    print_table(headers, await run(LegacyRequestHub, LEGACY_REQUESTS))
+    print()
+    print(f"Correlation registry ({TOTAL_REQUESTS} requests)")
+    print_table(headers, await run(CommunicationHub, TOTAL_REQUESTS))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
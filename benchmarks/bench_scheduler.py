@@ -0,0 +1,100 @@
+"""URGENT latency under a LOW-priority flood: FIFO queue vs PriorityScheduler.
+
+A consumer drains the queue while a producer keeps a LOW backlog of the given
+size queued and injects URGENT messages. Reports enqueue->dequeue latency of
+the URGENT messages. With the old FIFO ``asyncio.Queue`` latency grows with
+the backlog; with ``PriorityScheduler`` it should stay flat.
+
+    python -m benchmarks.bench_scheduler
+"""
+
+import asyncio
+import time
+
+from benchmarks._common import print_table, quiet_logging, summarize
+from codecollab.core.communication_hub import (
+    AgentRole, Message, MessagePriority, MessageType
+)
+from codecollab.core.scheduler import PriorityScheduler
+
+FLOOD_SIZES = [0, 1_000, 10_000, 50_000]
+URGENT_COUNT = 200
+LOW_PER_URGENT = 10
+
+
+class FifoAdapter:
+    """The hub's previous queue: FIFO asyncio.Queue of (priority, message)."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    def put_nowait(self, message, priority):
+        self.queue.put_nowait((priority, message))
+
+    async def get(self):
+        _, message = await self.queue.get()
+        return message
+
+
+def make_message(priority, content):
+    return Message(
+        sender=AgentRole.ORCHESTRATOR,
+        recipient=AgentRole.DEVELOPER,
+        message_type=MessageType.STATUS_UPDATE,
+        content=content,
+        priority=priority,
+    )
+
+
+async def run_case(queue, flood_size):
+    latencies = []
+    enqueued_at = {}
+    remaining = URGENT_COUNT
+
+    for i in range(flood_size):
+        queue.put_nowait(make_message(MessagePriority.LOW, "flood"), MessagePriority.LOW.value)
+
+    async def consumer():
+        nonlocal remaining
+        while remaining:
+            message = await queue.get()
+            if message.priority is MessagePriority.URGENT:
+                latencies.append(time.perf_counter() - enqueued_at[message.id])
+                remaining -= 1
+            await asyncio.sleep(0)  # simulated handler work
+
+    async def producer():
+        for i in range(URGENT_COUNT):
+            for _ in range(LOW_PER_URGENT):
+                queue.put_nowait(make_message(MessagePriority.LOW, "flood"), MessagePriority.LOW.value)
+            message = make_message(MessagePriority.URGENT, f"urgent-{i}")
+            enqueued_at[message.id] = time.perf_counter()
+            queue.put_nowait(message, MessagePriority.URGENT.value)
+            for _ in range(LOW_PER_URGENT):
+                await asyncio.sleep(0)
+
+    await asyncio.gather(consumer(), producer())
+    return summarize(latencies)
+
+
+async def main():
+    quiet_logging()
+    rows = []
+    for flood_size in FLOOD_SIZES:
+        fifo = await run_case(FifoAdapter(), flood_size)
+        scheduler = PriorityScheduler(levels=[p.value for p in MessagePriority])
+        prio = await run_case(scheduler, flood_size)
+        rows.append([
+            flood_size,
+            fifo['p50_ms'], fifo['p99_ms'],
+            prio['p50_ms'], prio['p99_ms'],
+        ])
+    print(f"URGENT enqueue->dequeue latency ({URGENT_COUNT} urgent messages)")
+    print_table(
+        ["low_backlog", "fifo_p50_ms", "fifo_p99_ms", "sched_p50_ms", "sched_p99_ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""Aggregate throughput of ShardedHub from 1 shard up to one per core.
+
+The parent process sends ``MESSAGES`` messages round-robin to every agent
+role. Each handler burns ``WORK_ITERATIONS`` of pure-Python CPU work, the
+stand-in for an agent doing real work, so a single shard is CPU bound and
+throughput should scale with the number of shards until the cores (or the
+number of roles) run out. Shard counts beyond ``os.cpu_count()`` are still
+run but cannot scale.
+
+    python -m benchmarks.bench_sharding
+"""
+
+import asyncio
+import os
+import time
+
+from benchmarks._common import print_table, quiet_logging
+from codecollab.core.communication_hub import AgentRole, Message, MessageType
+from codecollab.core.sharding import ShardedHub
+
+MESSAGES = 20_000
+WORK_ITERATIONS = 2_000
+ROLES = list(AgentRole)
+
+
+def busy_handler(message):
+    total = 0
+    for i in range(WORK_ITERATIONS):
+        total += i * i
+    return None
+
+
+async def run(shards):
+    hub = ShardedHub(shards=shards, history_limit=1000)
+    for role in ROLES:
+        hub.subscribe(role, busy_handler)
+    await hub.start()
+    try:
+        start = time.perf_counter()
+        for i in range(MESSAGES):
+            await hub.send_message(Message(
+                sender=AgentRole.ORCHESTRATOR,
+                recipient=ROLES[i % len(ROLES)],
+                message_type=MessageType.STATUS_UPDATE,
+                content=f"work item {i}",
+                conversation_id="bench"
+            ))
+        while (await hub.get_stats())['total_delivered'] < MESSAGES:
+            await asyncio.sleep(0.01)
+        return time.perf_counter() - start
+    finally:
+        await hub.stop()
+
+
+async def main():
+    quiet_logging()
+    cores = os.cpu_count() or 1
+    max_shards = len(ROLES)
+    rows = []
+    baseline = None
+    for shards in range(1, max_shards + 1):
+        elapsed = await run(shards)
+        rate = MESSAGES / elapsed
+        if baseline is None:
+            baseline = rate
+        rows.append([shards, min(shards, cores), elapsed * 1000, rate, rate / baseline])
+    print(f"cpu cores: {cores}")
+    print_table(["shards", "usable_cores", "total_ms", "msgs/s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,333 @@
+"""Load generator and benchmark harness for CommunicationHub.
+
+Every ``AgentRole`` is played by a synthetic agent whose handler takes a
+time drawn from a configurable distribution and answers requests.
+Producer tasks send a ``LoadProfile``'s message mix through one hub:
+
+- ``message_mix`` / ``priority_mix``: weights per MessageType / priority
+- ``fanout``: recipients per message (> 1 sends a multicast)
+- ``request_ratio``: share of messages sent with ``send_request``; the
+  producer waits for the reply (closed loop), the rest is fire-and-forget
+- ``handler_latency``: ``const:S``, ``uniform:A:B``, ``exp:MEAN`` or
+  ``lognormal:MEDIAN:SIGMA`` (seconds), or ``0`` for none
+- ``rate``: total messages per second to aim for (None = flat out)
+
+Each run reports msgs/s and deliveries/s. It gives p50/p99/p999 latency
+from send to handler completion, per delivery, and for request round trips
+separately. It also reports RSS before and after. ``--output`` writes the
+results and the git commit to JSON; ``--compare`` diffs a run against an
+earlier file::
+
+    python -m benchmarks.loadgen --output before.json
+    python -m benchmarks.loadgen --output after.json --compare before.json
+    python -m benchmarks.loadgen --scenario fanout --messages 50000
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import math
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from benchmarks._common import print_table, quiet_logging, summarize
+from codecollab.core.communication_hub import (
+    AgentRole, CommunicationHub, Message, MessagePriority, MessageType
+)
+from codecollab.core.metrics import STAGES, HubMetrics
+
+ROLES = list(AgentRole)
+
+
+@dataclass
+class LoadProfile:
+    """One load scenario (see the module docstring for the fields)."""
+    name: str
+    messages: int = 20_000
+    producers: int = 4
+    rate: Optional[float] = None
+    message_mix: Dict[MessageType, float] = field(
+        default_factory=lambda: {MessageType.STATUS_UPDATE: 1.0}
+    )
+    priority_mix: Dict[MessagePriority, float] = field(
+        default_factory=lambda: {MessagePriority.MEDIUM: 1.0}
+    )
+    fanout: int = 1
+    request_ratio: float = 0.0
+    handler_latency: str = "0"
+    content_bytes: int = 64
+    instrument: bool = False
+    seed: int = 1
+    hub_options: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        data = dataclasses.asdict(self)
+        data['message_mix'] = {k.value: v for k, v in self.message_mix.items()}
+        data['priority_mix'] = {k.name: v for k, v in self.priority_mix.items()}
+        return data
+
+
+SCENARIOS: Dict[str, LoadProfile] = {
+    profile.name: profile for profile in [
+        LoadProfile("baseline"),
+        LoadProfile(
+            "mixed",
+            message_mix={
+                MessageType.STATUS_UPDATE: 0.6, MessageType.TASK_REQUEST: 0.2,
+                MessageType.COLLABORATION_REQUEST: 0.1, MessageType.ERROR_REPORT: 0.1,
+            },
+            priority_mix={
+                MessagePriority.LOW: 0.3, MessagePriority.MEDIUM: 0.5,
+                MessagePriority.HIGH: 0.15, MessagePriority.URGENT: 0.05,
+            },
+            instrument=True,
+        ),
+        LoadProfile("fanout", messages=10_000, fanout=4),
+        LoadProfile("requests", messages=5_000, producers=16, request_ratio=0.5),
+        LoadProfile(
+            "slow_handlers", messages=5_000, producers=16, request_ratio=0.2,
+            handler_latency="lognormal:0.0005:1.0",
+        ),
+    ]
+}
+
+
+def latency_sampler(spec: str, rng: random.Random) -> Callable[[], float]:
+    """Build a handler-latency sampler from ``spec`` (seconds)."""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(":")] if args else []
+    if kind in ("0", "none"):
+        return lambda: 0.0
+    if kind == "const":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "exp":
+        return lambda: rng.expovariate(1.0 / values[0])
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _weighted(mix: Dict, rng: random.Random, count: int) -> List:
+    return rng.choices(list(mix), weights=list(mix.values()), k=count)
+
+
+async def run_profile(profile: LoadProfile) -> Dict:
+    """Drive one hub with ``profile``; returns the result record."""
+    rng = random.Random(profile.seed)
+    metrics = HubMetrics() if profile.instrument else None
+    hub = CommunicationHub(metrics=metrics, **profile.hub_options)
+    handler_delay = latency_sampler(profile.handler_latency, rng)
+
+    # message id -> (send time, deliveries outstanding)
+    outstanding: Dict[str, List] = {}
+    delivery_samples: List[float] = []
+    request_samples: List[float] = []
+    all_delivered = asyncio.Event()
+    producers_done = False
+
+    def make_agent(role: AgentRole):
+        async def handle(message: Message):
+            if message.get_meta('response_to') is not None:
+                return
+            delay = handler_delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if message.requires_response:
+                await hub.send_message(Message(
+                    sender=role,
+                    recipient=message.sender,
+                    message_type=MessageType.TASK_RESPONSE,
+                    content="ok",
+                    metadata={'response_to': message.id}
+                ))
+            entry = outstanding.get(message.id)
+            if entry is None:
+                return
+            delivery_samples.append(time.perf_counter() - entry[0])
+            entry[1] -= 1
+            if entry[1] == 0:
+                del outstanding[message.id]
+                if producers_done and not outstanding:
+                    all_delivered.set()
+        return handle
+
+    for role in ROLES:
+        hub.subscribe(role, make_agent(role))
+
+    # Pre-draw the whole workload so sampling stays out of the timed loop
+    count = profile.messages
+    types = _weighted(profile.message_mix, rng, count)
+    priorities = _weighted(profile.priority_mix, rng, count)
+    senders = [rng.choice(ROLES) for _ in range(count)]
+    is_request = [rng.random() < profile.request_ratio for _ in range(count)]
+    fanout = max(1, min(profile.fanout, len(ROLES) - 1))
+    targets = [
+        rng.sample([r for r in ROLES if r is not sender], fanout) for sender in senders
+    ]
+    content = "x" * profile.content_bytes
+
+    async def producer(index: int, start: float):
+        loop = asyncio.get_running_loop()
+        for i in range(index, count, profile.producers):
+            if profile.rate:
+                delay = start + i / profile.rate - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            sender = senders[i]
+            if is_request[i]:
+                began = time.perf_counter()
+                response = await hub.send_request(sender, targets[i][0], content, timeout=30.0)
+                if response is not None:
+                    request_samples.append(time.perf_counter() - began)
+                continue
+            message = Message(
+                sender=sender,
+                recipient=sender if fanout > 1 else targets[i][0],
+                message_type=types[i],
+                content=content,
+                priority=priorities[i],
+                recipients=targets[i] if fanout > 1 else None
+            )
+            outstanding[message.id] = [time.perf_counter(), fanout]
+            await hub.send_message(message)
+            if i % 64 == 0:
+                # Let the hub make progress between bursts
+                await asyncio.sleep(0)
+
+    rss_before = rss_bytes()
+    await hub.start()
+    try:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        await asyncio.gather(*(producer(index, loop.time()) for index in range(profile.producers)))
+        producers_done = True
+        if outstanding:
+            await asyncio.wait_for(all_delivered.wait(), timeout=300.0)
+        elapsed = time.perf_counter() - started
+        rss_after = rss_bytes()
+        stats = hub.get_stats()
+    finally:
+        await hub.stop()
+
+    deliveries = len(delivery_samples) + len(request_samples)
+    result = {
+        'scenario': profile.name,
+        'profile': profile.to_dict(),
+        'elapsed_s': elapsed,
+        'messages': count,
+        'deliveries': deliveries,
+        'msgs_per_s': count / elapsed,
+        'deliveries_per_s': deliveries / elapsed,
+        'delivery_latency': summarize(delivery_samples),
+        'request_latency': summarize(request_samples) if request_samples else None,
+        'rss_before_mb': rss_before / 2 ** 20,
+        'rss_after_mb': rss_after / 2 ** 20,
+        'rss_growth_mb': (rss_after - rss_before) / 2 ** 20,
+        'failed': stats['delivery_stats']['total_failed'],
+    }
+    if metrics is not None:
+        snapshot = metrics.snapshot()
+        result['stages'] = {stage: snapshot[stage]['all'] for stage in STAGES}
+    return result
+
+
+def environment() -> Dict:
+    """Commit and machine details stored with each result file."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(previous: Dict, current: Dict) -> List[List]:
+    """Per-scenario change (percent) between two result files."""
+    before = {result['scenario']: result for result in previous['results']}
+    rows = []
+    for result in current['results']:
+        old = before.get(result['scenario'])
+        if old is None:
+            continue
+        row = [result['scenario']]
+        for value, baseline in (
+            (result['msgs_per_s'], old['msgs_per_s']),
+            (result['delivery_latency']['p99_ms'], old['delivery_latency']['p99_ms']),
+            (result['rss_growth_mb'], old['rss_growth_mb']),
+        ):
+            row.append((value / baseline - 1) * 100 if baseline else 0.0)
+        rows.append(row)
+    return rows
+
+
+async def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--messages", type=int, help="Override the message count")
+    parser.add_argument("--rate", type=float, help="Override the target msgs/s")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Earlier JSON results to diff against")
+    args = parser.parse_args(argv)
+
+    quiet_logging()
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        profile = dataclasses.replace(SCENARIOS[name])
+        if args.messages:
+            profile.messages = args.messages
+        if args.rate:
+            profile.rate = args.rate
+        results.append(await run_profile(profile))
+
+    print_table(
+        ["scenario", "msgs/s", "deliveries/s", "p50_ms", "p99_ms", "p999_ms", "req_p99_ms", "rss_growth_mb"],
+        [[
+            r['scenario'], r['msgs_per_s'], r['deliveries_per_s'],
+            r['delivery_latency']['p50_ms'], r['delivery_latency']['p99_ms'],
+            r['delivery_latency']['p999_ms'],
+            r['request_latency']['p99_ms'] if r['request_latency'] else "-",
+            r['rss_growth_mb'],
+        ] for r in results]
+    )
+    document = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(document, handle, indent=2)
+        print(f"\nresults written to {args.output}")
+    if args.compare:
+        with open(args.compare) as handle:
+            previous = json.load(handle)
+        print(f"\nchange vs {args.compare} (commit {previous['environment'].get('commit')}), %:")
+        print_table(["scenario", "msgs/s", "p99_ms", "rss_growth"], compare(previous, document))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -16,9 +16,11 @@ import logging
 from codecollab.core.communication_hub import (
     CommunicationHub, Message, AgentRole, MessageType, MessagePriority
 )
+from codecollab.core.logging_utils import EventLogger
 
 # Set up logging
 logger = logging.getLogger(__name__)
+events = EventLogger(logger)
 
 
 class AgentState(Enum):
@@ -56,6 +58,11 @@ class AgentConfig:
     enable_learning: bool = True
     tools: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    cancel_abandoned_requests: bool = True
+
+
+class RequestAbandoned(Exception):
+    """A handler was cancelled because its request's deadline passed or its sender gave up."""
 
 
 @dataclass
@@ -65,6 +72,7 @@ class AgentMetrics:
     messages_received: int = 0
     tasks_completed: int = 0
     tasks_failed: int = 0
+    tasks_cancelled: int = 0
     average_response_time: float = 0.0
     uptime: float = 0.0
     last_activity: Optional[float] = None
@@ -121,6 +129,8 @@ class BaseAgent(ABC):
         # Tool and capability management
         self.available_tools: Dict[str, Callable] = {}
         self.active_tasks: Dict[str, Dict[str, Any]] = {}
+        # Request id -> task running its handler (requests and deadlined messages)
+        self.inflight_requests: Dict[str, asyncio.Task] = {}
         
         # Event handlers
         self.message_handlers: Dict[MessageType, Callable] = {}
@@ -137,6 +147,8 @@ class BaseAgent(ABC):
         try:
             # Subscribe to communication hub
             self.communication_hub.subscribe(self.config.role, self._handle_message)
+            if self.config.cancel_abandoned_requests:
+                self.communication_hub.on_request_abandoned(self.config.role, self._cancel_request)
             
             # Initialize tools
             await self._initialize_tools()
@@ -197,12 +209,7 @@ class BaseAgent(ABC):
             await self._change_state(AgentState.PROCESSING)
             
             try:
-                # Route to specific handler based on message type
-                if message.message_type in self.message_handlers:
-                    response = await self.message_handlers[message.message_type](message)
-                else:
-                    # Default handling - delegate to agent implementation
-                    response = await self.handle_message(message)
+                response = await self._run_handler(message)
                 
                 # Send response if required
                 if message.requires_response and response:
@@ -213,6 +220,11 @@ class BaseAgent(ABC):
                 self.metrics.update_response_time(response_time)
                 self.metrics.tasks_completed += 1
                 
+            except RequestAbandoned:
+                # Nobody is waiting for the result; don't answer
+                self.metrics.tasks_cancelled += 1
+                logger.info(f"🚫 {self.config.name} dropped abandoned request: {message.id}")
+                
             except Exception as e:
                 self.metrics.tasks_failed += 1
                 await self._handle_error(e, f"Error processing message: {message.id}")
@@ -230,11 +242,54 @@ class BaseAgent(ABC):
         except Exception as e:
             await self._handle_error(e, "Critical error in message handling")
     
+    async def _run_handler(self, message: Message) -> Optional[str]:
+        """
+        Run the handler for ``message``.
+        
+        Requests and messages with a deadline run in their own task, which is
+        cancelled when the deadline passes or the sender abandons the request.
+        
+        Raises:
+            RequestAbandoned: The handler was cancelled
+        """
+        # Route to specific handler based on message type, or the agent default
+        handler = self.message_handlers.get(message.message_type, self.handle_message)
+        deadline = message.deadline
+        if not self.config.cancel_abandoned_requests or (
+                deadline is None and not message.requires_response):
+            return await handler(message)
+        
+        task = asyncio.ensure_future(handler(message))
+        self.inflight_requests[message.id] = task
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.time())
+                done, _ = await asyncio.wait((task,), timeout=timeout)
+                if done:
+                    break
+                # The sender may have extended the deadline (coalesced requests)
+                deadline = message.deadline
+                if deadline is not None and deadline <= time.time():
+                    break
+        finally:
+            self.inflight_requests.pop(message.id, None)
+            if not task.done():
+                # Deadline passed (or we are being cancelled ourselves)
+                task.cancel()
+        if task.done() and not task.cancelled():
+            return task.result()
+        raise RequestAbandoned(message.id)
+    
+    def _cancel_request(self, request: Message):
+        """Abandon listener: cancel the handler still working on ``request``."""
+        task = self.inflight_requests.get(request.id)
+        if task is not None and not task.done():
+            task.cancel()
+    
     async def _send_response(self, original_message: Message, response_content: str, 
                            message_type: MessageType = MessageType.TASK_RESPONSE):
         """Send a response to a message."""
         response = Message(
-            id=str(uuid.uuid4()),
             sender=self.config.role,
             recipient=original_message.sender,
             message_type=message_type,
@@ -255,7 +310,8 @@ class BaseAgent(ABC):
             old_state = self.state
             self.state = new_state
             
-            logger.debug(f"🔄 {self.config.name} state: {old_state.value} → {new_state.value}")
+            events.debug("state_change", "🔄 %s state: %s → %s",
+                         self.config.name, old_state.value, new_state.value)
             
             # Notify state change callbacks
             for callback in self.state_change_callbacks:
@@ -313,12 +369,14 @@ class BaseAgent(ABC):
                 'messages_received': self.metrics.messages_received,
                 'tasks_completed': self.metrics.tasks_completed,
                 'tasks_failed': self.metrics.tasks_failed,
+                'tasks_cancelled': self.metrics.tasks_cancelled,
                 'average_response_time': self.metrics.average_response_time,
                 'last_activity': self.metrics.last_activity
             },
             'memory_usage': {
                 'conversation_history': len(self.conversation_history),
                 'short_term_memory': len(self.short_term_memory),
+                'inflight_requests': len(self.inflight_requests),
                 'context_cache': len(self.context_cache)
             },
             'error_info': {
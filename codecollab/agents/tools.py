@@ -14,7 +14,10 @@ from enum import Enum
 from abc import ABC, abstractmethod
 import logging
 
+from codecollab.core.logging_utils import EventLogger
+
 logger = logging.getLogger(__name__)
+events = EventLogger(logger)
 
 
 class ToolCategory(Enum):
@@ -451,7 +454,7 @@ class ToolManager:
         if len(self.execution_history) > 1000:
             self.execution_history = self.execution_history[-1000:]
         
-        logger.info(f"🔧 Executed tool {tool_name}: {result.status.value}")
+        events.info("tool_executed", "🔧 Executed tool %s: %s", tool_name, result.status.value)
         return result
     
     def get_available_tools(self, category: Optional[ToolCategory] = None) -> List[Dict[str, Any]]:
@@ -0,0 +1,317 @@
+"""Admission control and backpressure for the Communication Hub.
+
+``AdmissionController`` bounds the number of *pending* messages - accepted
+by ``send_message`` but not yet handed to every handler - per priority class
+and per sender. When a limit is reached the configured ``OverflowPolicy``
+decides what happens to the new message:
+
+- ``BLOCK``: ``send_message`` waits until capacity frees up
+  (optionally with a timeout, after which the message is rejected)
+- ``DROP_OLDEST``: the oldest pending message in the full group is dropped
+- ``DROP_LOWEST_PRIORITY``: the oldest message of the lowest pending
+  priority in the full group is dropped, provided it is strictly lower than
+  the new message; otherwise the new message is rejected. Only meaningful
+  for per-sender limits: a priority class holds a single priority, so it
+  cannot be combined with ``priority_capacity``
+- ``REJECT``: the new message is refused with ``HubOverloadedError``
+
+Dropped messages are not removed from the queues; they are tombstoned and
+skipped when the dispatcher or a delivery lane reaches them, so dropping is
+O(1) regardless of where the message is waiting.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Union
+
+from codecollab.core.message import AgentRole, Message, MessagePriority
+
+# Lowest priority first
+_LEVELS = sorted(MessagePriority, key=lambda p: p.value)
+
+
+class OverflowPolicy(Enum):
+    """What to do with a new message when a limit is reached."""
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_LOWEST_PRIORITY = "drop_lowest_priority"
+    REJECT = "reject"
+
+
+class HubOverloadedError(Exception):
+    """Raised when a message cannot be admitted under the overflow policy."""
+
+
+class _Group:
+    """Pending messages sharing one limit, bucketed by priority (oldest first)."""
+
+    __slots__ = ('name', 'limit', 'policy', 'size', 'buckets')
+
+    def __init__(self, name: str, limit: int, policy: OverflowPolicy):
+        self.name = name
+        self.limit = limit
+        self.policy = policy
+        self.size = 0
+        self.buckets: Dict[MessagePriority, "OrderedDict[str, Message]"] = {
+            level: OrderedDict() for level in _LEVELS
+        }
+
+    def add(self, message: Message):
+        self.buckets[message.priority][message.id] = message
+        self.size += 1
+
+    def remove(self, message: Message):
+        if self.buckets[message.priority].pop(message.id, None) is not None:
+            self.size -= 1
+
+    def oldest(self) -> Optional[Message]:
+        best = None
+        for bucket in self.buckets.values():
+            if bucket:
+                candidate = next(iter(bucket.values()))
+                if best is None or candidate.timestamp < best.timestamp:
+                    best = candidate
+        return best
+
+    def lowest(self) -> Optional[Message]:
+        for bucket in self.buckets.values():
+            if bucket:
+                return next(iter(bucket.values()))
+        return None
+
+
+class _Pending:
+    """Book-keeping for one admitted message."""
+
+    __slots__ = ('message', 'groups', 'remaining', 'dropped')
+
+    def __init__(self, message: Message, groups: List[_Group]):
+        self.message = message
+        self.groups = groups
+        self.remaining: Optional[int] = None  # deliveries left once dispatched
+        self.dropped = False
+
+
+class AdmissionController:
+    """Bounds pending hub messages per priority class and per sender."""
+
+    def __init__(self,
+                 priority_capacity: Optional[Dict[MessagePriority, int]] = None,
+                 priority_policy: OverflowPolicy = OverflowPolicy.REJECT,
+                 sender_capacity: Optional[Union[int, Dict[AgentRole, int]]] = None,
+                 sender_policy: OverflowPolicy = OverflowPolicy.REJECT,
+                 block_timeout: Optional[float] = None,
+                 on_drop: Optional[Callable[[Message], None]] = None):
+        """
+        Args:
+            priority_capacity: Max pending messages per priority class
+            priority_policy: Policy applied when a priority class is full
+            sender_capacity: Max pending messages per sender (one limit for
+                every sender, or a per-role mapping)
+            sender_policy: Policy applied when a sender is at its limit
+            block_timeout: Seconds a BLOCK policy waits before rejecting
+                (None = wait indefinitely)
+            on_drop: Called with each message dropped to make room
+
+        Raises:
+            ValueError: If ``priority_policy`` is DROP_LOWEST_PRIORITY
+        """
+        if priority_policy is OverflowPolicy.DROP_LOWEST_PRIORITY:
+            raise ValueError(
+                "DROP_LOWEST_PRIORITY needs messages of several priorities in one group; "
+                "use it as sender_policy"
+            )
+        self.priority_policy = priority_policy
+        self.sender_policy = sender_policy
+        self.block_timeout = block_timeout
+        self.on_drop = on_drop
+        self._priority_groups: Dict[MessagePriority, _Group] = {
+            priority: _Group(f"priority:{priority.name}", limit, priority_policy)
+            for priority, limit in (priority_capacity or {}).items()
+        }
+        self._sender_capacity = sender_capacity
+        self._sender_groups: Dict[AgentRole, _Group] = {}
+        self._pending: Dict[str, _Pending] = {}
+        self._waiters: List[asyncio.Future] = []
+        self.stats = {'admitted': 0, 'dropped': 0, 'rejected': 0, 'blocked': 0}
+
+    # -- admission --------------------------------------------------------
+
+    async def admit(self, message: Message):
+        """
+        Admit ``message`` or raise ``HubOverloadedError``.
+
+        May drop older pending messages or wait, depending on the policies.
+        """
+        if message.id in self._pending:
+            return
+        groups = self._groups_for(message)
+        deadline = None
+        while True:
+            # Decide for every group before dropping anything, so a later
+            # group rejecting the message cannot cost an earlier victim
+            blocked = False
+            victims: List[Message] = []
+            freed: Dict[str, int] = {}
+            for group in groups:
+                if group.size - freed.get(group.name, 0) < group.limit:
+                    continue
+                if group.policy is OverflowPolicy.BLOCK:
+                    blocked = True
+                elif group.policy is OverflowPolicy.REJECT:
+                    self._reject(group)
+                else:
+                    victim = self._pick_victim(group, message)
+                    if victim is None:
+                        self._reject(group)
+                    victims.append(victim)
+                    # One victim may make room in several of our groups
+                    for shared in self._pending[victim.id].groups:
+                        freed[shared.name] = freed.get(shared.name, 0) + 1
+            if not blocked:
+                for victim in victims:
+                    self.drop(victim)
+                break
+            if deadline is None:
+                self.stats['blocked'] += 1
+                if self.block_timeout is not None:
+                    deadline = time.monotonic() + self.block_timeout
+                else:
+                    deadline = float('inf')
+            await self._wait_for_capacity(deadline)
+
+        entry = _Pending(message, groups)
+        self._pending[message.id] = entry
+        for group in groups:
+            group.add(message)
+        self.stats['admitted'] += 1
+
+    def drop(self, message: Message):
+        """Drop a pending message: free its capacity and tombstone it."""
+        entry = self._pending.get(message.id)
+        if entry is None or entry.dropped:
+            return
+        entry.dropped = True
+        self._free(entry)
+        self.stats['dropped'] += 1
+        if self.on_drop is not None:
+            self.on_drop(message)
+
+    def release(self, message: Message):
+        """Forget an admitted message that never made it into the queue."""
+        entry = self._pending.pop(message.id, None)
+        if entry is not None and not entry.dropped:
+            self._free(entry)
+
+    # -- lifecycle hooks --------------------------------------------------
+
+    def is_dropped(self, message: Message) -> bool:
+        """True if ``message`` was dropped and must not be delivered."""
+        entry = self._pending.get(message.id)
+        return entry is not None and entry.dropped
+
+    def dispatched(self, message: Message, deliveries: int):
+        """Record that ``message`` left the ingress queue for ``deliveries`` lanes."""
+        entry = self._pending.get(message.id)
+        if entry is None:
+            return
+        if deliveries <= 0:
+            # Nothing to deliver (no subscriber, or dropped while queued)
+            del self._pending[message.id]
+            if not entry.dropped:
+                self._free(entry)
+            return
+        entry.remaining = deliveries
+
+    def completed(self, message: Message):
+        """Record that one lane finished (or skipped) ``message``."""
+        entry = self._pending.get(message.id)
+        if entry is None or entry.remaining is None:
+            return
+        entry.remaining -= 1
+        if entry.remaining <= 0:
+            del self._pending[message.id]
+            if not entry.dropped:
+                self._free(entry)
+
+    # -- reporting --------------------------------------------------------
+
+    def pending_count(self) -> int:
+        """Messages admitted and not yet fully delivered or dropped."""
+        return sum(1 for entry in self._pending.values() if not entry.dropped)
+
+    def get_stats(self) -> Dict:
+        """Counters and current pending depth per limited group."""
+        return {
+            **self.stats,
+            'pending': self.pending_count(),
+            'pending_by_priority': {
+                priority.name: group.size for priority, group in self._priority_groups.items()
+            },
+            'pending_by_sender': {
+                sender.value: group.size for sender, group in self._sender_groups.items()
+            }
+        }
+
+    # -- internals --------------------------------------------------------
+
+    def _groups_for(self, message: Message) -> List[_Group]:
+        groups = []
+        group = self._priority_groups.get(message.priority)
+        if group is not None:
+            groups.append(group)
+        group = self._sender_group(message.sender)
+        if group is not None:
+            groups.append(group)
+        return groups
+
+    def _sender_group(self, sender: AgentRole) -> Optional[_Group]:
+        group = self._sender_groups.get(sender)
+        if group is None and self._sender_capacity is not None:
+            if isinstance(self._sender_capacity, dict):
+                limit = self._sender_capacity.get(sender)
+            else:
+                limit = self._sender_capacity
+            if limit is None:
+                return None
+            group = _Group(f"sender:{sender.value}", limit, self.sender_policy)
+            self._sender_groups[sender] = group
+        return group
+
+    def _pick_victim(self, group: _Group, incoming: Message) -> Optional[Message]:
+        if group.policy is OverflowPolicy.DROP_OLDEST:
+            return group.oldest()
+        victim = group.lowest()
+        if victim is not None and victim.priority.value < incoming.priority.value:
+            return victim
+        return None
+
+    def _reject(self, group: _Group):
+        self.stats['rejected'] += 1
+        raise HubOverloadedError(f"Hub overloaded: {group.name} at capacity ({group.limit})")
+
+    def _free(self, entry: _Pending):
+        for group in entry.groups:
+            group.remove(entry.message)
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _wait_for_capacity(self, deadline: float):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self.stats['rejected'] += 1
+            raise HubOverloadedError("Hub overloaded: timed out waiting for capacity")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=None if remaining == float('inf') else remaining)
+        except asyncio.TimeoutError:
+            self.stats['rejected'] += 1
+            raise HubOverloadedError("Hub overloaded: timed out waiting for capacity") from None
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
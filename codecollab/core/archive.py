@@ -0,0 +1,384 @@
+"""Memory-mapped message archive.
+
+Messages that age out of the hub's in-memory history can be appended to a
+``MessageArchive`` instead of being discarded. Appended messages are
+buffered until ``segment_messages`` of them have accumulated (or ``flush``
+is called) and are then sealed into an immutable segment made of two files:
+
+``arc-00000001.dat``
+    The codec-encoded messages, back to back.
+
+``arc-00000001.idx``
+    A fixed-width header followed by three sorted index sections (by
+    message id, by conversation id and by agent pair). Every entry is::
+
+        key hash (u64) | archive sequence (u64) | offset (u64) | length (u32)
+
+    sorted by ``(key hash, sequence)``.
+
+Sealing (two file writes, two fsyncs and the renames) runs on the
+archive's own single-worker executor when ``append`` fills a segment
+inside a running event loop, so it never stalls the loop and segments are
+still written in order. Batches being sealed stay queryable from memory.
+``await seal()`` waits for everything to be on disk; the synchronous
+``flush``/``close`` block until it is.
+
+Both files are opened with ``mmap``; nothing is loaded up front. A lookup
+binary-searches the index section of each segment (O(log n) per segment),
+then decodes only the payloads it returns. Key hashes are 64-bit BLAKE2b
+digests; the decoded message is compared with the requested key, so hash
+collisions never return the wrong message.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import logging
+import mmap
+import os
+import struct
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Iterator, List, Optional, Tuple
+
+from codecollab.core.codec import MessageCodec, get_codec
+from codecollab.core.message import AgentRole, Message
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('!4sB3xIIIQQ')
+_MAGIC = b'CCAR'
+_VERSION = 1
+_ENTRY = struct.Struct('!QQQI')
+_KEY = struct.Struct('!QQ')
+
+_SEGMENT_PREFIX = "arc-"
+
+# Index sections, in file order
+_BY_ID = 0
+_BY_CONVERSATION = 1
+_BY_PAIR = 2
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def _pair_key(agent1: AgentRole, agent2: AgentRole) -> str:
+    first, second = sorted((agent1.value, agent2.value))
+    return f"{first}|{second}"
+
+
+def _pair_keys(message: Message) -> List[str]:
+    return list(dict.fromkeys(_pair_key(message.sender, target) for target in message.targets()))
+
+
+@dataclass
+class ArchivePage:
+    """One page of archived messages, oldest first."""
+    messages: List[Message]
+    # Pass back as ``before`` to fetch the next (older) page; None when exhausted
+    cursor: Optional[int]
+
+
+class _Segment:
+    """A sealed, memory-mapped archive segment."""
+
+    def __init__(self, segment_id: int, index_path: str, data_path: str):
+        self.id = segment_id
+        self._index_file = open(index_path, "rb")
+        self._data_file = open(data_path, "rb")
+        self.index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if os.path.getsize(data_path):
+            self.data = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = b""
+        magic, version, *counts, first_seq, last_seq = _HEADER.unpack_from(self.index, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"Not a message archive index: {index_path}")
+        self.first_seq = first_seq
+        self.last_seq = last_seq
+        self.sections: List[Tuple[int, int]] = []
+        base = _HEADER.size
+        for count in counts:
+            self.sections.append((base, count))
+            base += count * _ENTRY.size
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.index.close()
+        self._index_file.close()
+        self._data_file.close()
+
+    def entry(self, section: int, position: int) -> Tuple[int, int, int, int]:
+        base, _ = self.sections[section]
+        return _ENTRY.unpack_from(self.index, base + position * _ENTRY.size)
+
+    def lower_bound(self, section: int, key_hash: int, seq: int = 0) -> int:
+        """First position whose (hash, seq) is >= (key_hash, seq)."""
+        base, count = self.sections[section]
+        target = (key_hash, seq)
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY.unpack_from(self.index, base + middle * _ENTRY.size) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def payload(self, offset: int, length: int) -> bytes:
+        return self.data[offset:offset + length]
+
+
+class MessageArchive:
+    """Append-only, memory-mapped store of old messages."""
+
+    def __init__(self, directory: str, segment_messages: int = 4096,
+                 codec: Optional[MessageCodec] = None):
+        """
+        Args:
+            directory: Directory holding the segment files (created if missing)
+            segment_messages: Messages buffered before a segment is sealed
+            codec: Message codec for payloads (default: binary)
+        """
+        if segment_messages <= 0:
+            raise ValueError("segment_messages must be positive")
+        self.directory = directory
+        self.segment_messages = segment_messages
+        self.codec = codec or get_codec("binary")
+        os.makedirs(directory, exist_ok=True)
+        self._segments: List[_Segment] = []
+        self._buffer: List[Tuple[int, Message]] = []
+        # Batches handed to the executor, oldest first: (segment id, batch, future)
+        self._sealing: Deque[Tuple[int, List[Tuple[int, Message]], Future]] = deque()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._next_seq = 1
+        self._next_segment_id = 1
+        self.is_open = False
+        self.open()
+
+    def __len__(self) -> int:
+        return (sum(segment.sections[_BY_ID][1] for segment in self._segments)
+                + sum(len(batch) for _, batch, _ in self._sealing) + len(self._buffer))
+
+    def open(self):
+        """Map the segments on disk (no-op while open; reopens after ``close``)."""
+        if self.is_open:
+            return
+        for segment_id in self._existing_segments():
+            segment = _Segment(segment_id, *self._paths(segment_id))
+            self._segments.append(segment)
+            self._next_seq = max(self._next_seq, segment.last_seq + 1)
+            self._next_segment_id = max(self._next_segment_id, segment_id + 1)
+        self.is_open = True
+
+    # -- writing ----------------------------------------------------------
+
+    def append(self, message: Message):
+        """Archive ``message`` (sealed into a segment once the buffer is full)."""
+        self._buffer.append((self._next_seq, message))
+        self._next_seq += 1
+        if len(self._buffer) >= self.segment_messages:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+            else:
+                self._seal_buffer(loop)
+
+    async def seal(self):
+        """Seal buffered messages off the event loop and wait until all are on disk."""
+        loop = asyncio.get_running_loop()
+        self._seal_buffer(loop)
+        while self._sealing:
+            await asyncio.wrap_future(self._sealing[-1][2])
+            self._collect()
+
+    def flush(self):
+        """Seal buffered messages into a new segment (blocks until written)."""
+        for _, _, future in list(self._sealing):
+            future.exception()  # wait; failures are handled by _collect
+        self._collect()
+        if not self._buffer:
+            return
+        buffer, self._buffer = self._buffer, []
+        segment_id = self._next_segment_id
+        self._next_segment_id += 1
+        self._segments.append(self._write_segment(segment_id, buffer))
+
+    def close(self):
+        """Seal buffered messages and unmap every segment (``open`` maps them again)."""
+        self.flush()
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.is_open = False
+
+    def _seal_buffer(self, loop: asyncio.AbstractEventLoop):
+        """Hand the buffer to the executor; ``_collect`` adopts the segment."""
+        if not self._buffer:
+            return
+        buffer, self._buffer = self._buffer, []
+        segment_id = self._next_segment_id
+        self._next_segment_id += 1
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+        future = self._executor.submit(self._write_segment, segment_id, buffer)
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._collect))
+        self._sealing.append((segment_id, buffer, future))
+
+    def _collect(self):
+        """Adopt segments the executor has finished, in order."""
+        while self._sealing and self._sealing[0][2].done():
+            segment_id, batch, future = self._sealing.popleft()
+            error = future.exception()
+            if error is None:
+                self._segments.append(future.result())
+                continue
+            # Keep the messages; they are sealed again with the next segment.
+            # Merge by sequence: an earlier failed batch may already be back
+            logger.error(f"❌ Archive segment {segment_id} could not be written: {error}")
+            self._buffer = list(heapq.merge(batch, self._buffer, key=lambda entry: entry[0]))
+
+    def _write_segment(self, segment_id: int, buffer: List[Tuple[int, Message]]) -> _Segment:
+        """Write ``buffer`` as segment ``segment_id`` and map it."""
+        index_path, data_path = self._paths(segment_id)
+
+        sections: List[List[Tuple[int, int, int, int]]] = [[], [], []]
+        encode = self.codec.encode
+        offset = 0
+        with open(data_path + ".tmp", "wb") as data_file:
+            for seq, message in buffer:
+                payload = encode(message)
+                data_file.write(payload)
+                location = (offset, len(payload))
+                offset += len(payload)
+                sections[_BY_ID].append((_hash(message.id), seq, *location))
+                if message.conversation_id is not None:
+                    sections[_BY_CONVERSATION].append((_hash(message.conversation_id), seq, *location))
+                for pair in _pair_keys(message):
+                    sections[_BY_PAIR].append((_hash(pair), seq, *location))
+            data_file.flush()
+            os.fsync(data_file.fileno())
+
+        with open(index_path + ".tmp", "wb") as index_file:
+            index_file.write(_HEADER.pack(
+                _MAGIC, _VERSION, *(len(section) for section in sections),
+                buffer[0][0], buffer[-1][0]
+            ))
+            for section in sections:
+                section.sort()
+                index_file.write(b"".join(_ENTRY.pack(*entry) for entry in section))
+            index_file.flush()
+            os.fsync(index_file.fileno())
+
+        # The index is renamed last: a segment exists only once both files do
+        os.replace(data_path + ".tmp", data_path)
+        os.replace(index_path + ".tmp", index_path)
+        return _Segment(segment_id, index_path, data_path)
+
+    # -- queries ----------------------------------------------------------
+
+    def get(self, message_id: str) -> Optional[Message]:
+        """Archived message with ``message_id``, or None."""
+        for _, message in self._unsealed():
+            if message.id == message_id:
+                return message
+        key_hash = _hash(message_id)
+        for segment in reversed(self._segments):
+            position = segment.lower_bound(_BY_ID, key_hash)
+            _, count = segment.sections[_BY_ID]
+            while position < count:
+                entry_hash, _, offset, length = segment.entry(_BY_ID, position)
+                if entry_hash != key_hash:
+                    break
+                message = self.codec.decode(segment.payload(offset, length))
+                if message.id == message_id:
+                    return message
+                position += 1
+        return None
+
+    def by_conversation(self, conversation_id: str, limit: int = 50,
+                        before: Optional[int] = None) -> ArchivePage:
+        """Newest ``limit`` archived messages of a conversation older than ``before``."""
+        return self._page(
+            _BY_CONVERSATION, conversation_id,
+            lambda message: message.conversation_id == conversation_id,
+            limit, before
+        )
+
+    def between(self, agent1: AgentRole, agent2: AgentRole, limit: int = 50,
+                before: Optional[int] = None) -> ArchivePage:
+        """Newest ``limit`` archived messages between two agents older than ``before``."""
+        key = _pair_key(agent1, agent2)
+        return self._page(
+            _BY_PAIR, key, lambda message: key in _pair_keys(message), limit, before
+        )
+
+    def get_stats(self):
+        """Segment and message counts plus bytes on disk."""
+        return {
+            'segments': len(self._segments),
+            'messages': len(self),
+            'buffered': len(self._buffer) + sum(len(batch) for _, batch, _ in self._sealing),
+            'data_bytes': sum(len(segment.data) for segment in self._segments),
+            'index_bytes': sum(len(segment.index) for segment in self._segments)
+        }
+
+    # -- internals --------------------------------------------------------
+
+    def _page(self, section: int, key: str, matches, limit: int,
+              before: Optional[int]) -> ArchivePage:
+        upper = before if before is not None else self._next_seq
+        found: List[Tuple[int, Message]] = []
+        for seq, message in self._scan(section, key, upper):
+            if matches(message):
+                found.append((seq, message))
+                if len(found) == limit:
+                    break
+        found.reverse()
+        cursor = found[0][0] if len(found) == limit else None
+        return ArchivePage([message for _, message in found], cursor)
+
+    def _scan(self, section: int, key: str, upper: int) -> Iterator[Tuple[int, Message]]:
+        """Candidates for ``key`` with sequence < ``upper``, newest first."""
+        for seq, message in self._unsealed():
+            if seq < upper:
+                yield seq, message
+        key_hash = _hash(key)
+        for segment in reversed(self._segments):
+            if segment.first_seq >= upper:
+                continue
+            start = segment.lower_bound(section, key_hash)
+            position = segment.lower_bound(section, key_hash, upper)
+            while position > start:
+                position -= 1
+                _, seq, offset, length = segment.entry(section, position)
+                yield seq, self.codec.decode(segment.payload(offset, length))
+
+    def _unsealed(self) -> Iterator[Tuple[int, Message]]:
+        """Buffered and sealing messages, newest first."""
+        yield from reversed(self._buffer)
+        for _, batch, _ in reversed(self._sealing):
+            yield from reversed(batch)
+
+    def _paths(self, segment_id: int) -> Tuple[str, str]:
+        stem = os.path.join(self.directory, f"{_SEGMENT_PREFIX}{segment_id:08d}")
+        return stem + ".idx", stem + ".dat"
+
+    def _existing_segments(self) -> List[int]:
+        segment_ids = []
+        for name in os.listdir(self.directory):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(".idx"):
+                try:
+                    segment_ids.append(int(name[len(_SEGMENT_PREFIX):-len(".idx")]))
+                except ValueError:
+                    continue
+        return sorted(segment_ids)
@@ -0,0 +1,151 @@
+"""Response cache for idempotent requests through the Communication Hub.
+
+``send_request`` looks the request up by ``request_key`` (recipient,
+message type and content digest) before sending it. A hit returns a copy
+of the stored response, addressed to the caller, without a round trip.
+
+Request types listed in ``message_types`` are cached, each with its own
+TTL. A single request opts in or out with ``metadata['cache_response']``
+(True caches a type that is not listed, with the default TTL; False
+bypasses the cache). A responder can override the TTL for one response
+with ``metadata['cache_ttl']``; 0, or anything but a number, keeps it out
+of the cache. Error reports are never cached.
+
+Entries are evicted least recently used first beyond ``max_entries``, and
+expired entries are dropped when they are looked up.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+from codecollab.core.coalescing import readdress, request_key
+from codecollab.core.message import AgentRole, Message, MessageType
+
+# Request metadata key: True/False opts this request in to/out of the cache
+CACHE_RESPONSE = 'cache_response'
+# Response metadata key: seconds to cache this response (0 = do not cache)
+CACHE_TTL = 'cache_ttl'
+
+
+class ResponseCache:
+    """LRU + TTL cache of response messages keyed by ``request_key``."""
+
+    def __init__(self, message_types: Union[Iterable[MessageType], Dict[MessageType, float]] = (
+                     MessageType.TASK_REQUEST,),
+                 ttl: float = 60.0,
+                 max_entries: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            message_types: Request types whose responses are cached; a dict
+                maps each type to its own TTL in seconds
+            ttl: Seconds a response stays valid (types given without a TTL,
+                and requests that opt in through metadata)
+            max_entries: Responses kept before the least recently used go
+            clock: Monotonic time source (injectable for tests)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if isinstance(message_types, dict):
+            self.ttls = dict(message_types)
+        else:
+            self.ttls = {message_type: ttl for message_type in message_types}
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Message, float]]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            'hits': 0, 'misses': 0, 'stored': 0, 'expired': 0, 'evicted': 0, 'invalidated': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def caches(self, message_type: MessageType, metadata: Optional[Dict] = None) -> bool:
+        """True if a request of ``message_type`` with ``metadata`` goes through the cache."""
+        if metadata:
+            opted = metadata.get(CACHE_RESPONSE)
+            if opted is not None:
+                return bool(opted)
+        return message_type in self.ttls
+
+    def get(self, key: Hashable, requester: AgentRole) -> Optional[Message]:
+        """
+        The cached response for ``key``, or None (counted as a miss).
+
+        Returns:
+            A copy addressed to ``requester``, with a fresh id and no
+            ``response_to`` (no request was sent for it)
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > self._clock():
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return readdress(entry[0], requester)
+            del self._entries[key]
+            self.stats['expired'] += 1
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: Hashable, message_type: MessageType, response: Message) -> bool:
+        """
+        Store ``response`` to a request of ``message_type``.
+
+        Returns:
+            bool: True if it was cached
+        """
+        ttl = response.get_meta(CACHE_TTL, self.ttls.get(message_type, self.ttl))
+        # A non-numeric cache_ttl (e.g. "30") is ignored like a 0: not cached
+        if (isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0
+                or response.message_type == MessageType.ERROR_REPORT):
+            return False
+        self._entries[key] = (response, self._clock() + ttl)
+        self._entries.move_to_end(key)
+        self.stats['stored'] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evicted'] += 1
+        return True
+
+    def invalidate(self, recipient: Optional[AgentRole] = None,
+                   message_type: Optional[MessageType] = None,
+                   content: Optional[str] = None) -> int:
+        """
+        Drop cached responses matching every filter given.
+
+        With all three filters this is a single lookup; otherwise it scans
+        the cache. Without filters the cache is cleared.
+
+        Returns:
+            int: Number of responses dropped
+        """
+        if recipient is not None and message_type is not None and content is not None:
+            removed = int(self._entries.pop(request_key(recipient, message_type, content), None)
+                          is not None)
+        elif recipient is None and message_type is None and content is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            digest = request_key(recipient, message_type, content)[2] if content is not None else None
+            doomed = [
+                key for key in self._entries
+                if (recipient is None or key[0] == recipient)
+                and (message_type is None or key[1] == message_type)
+                and (digest is None or key[2] == digest)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            removed = len(doomed)
+        self.stats['invalidated'] += removed
+        return removed
+
+    def get_stats(self) -> Dict:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'entries': len(self._entries),
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            **self.stats
+        }
+
@@ -0,0 +1,148 @@
+"""Single-flight coalescing of identical requests for the Communication Hub.
+
+Requests are identified by ``request_key``: recipient, message type and a
+digest of the content. While a request with a given key is in flight, an
+identical ``send_request`` joins it instead of sending a second delivery.
+It waits on the same ``Flight``. The caller that started the flight gets
+the response message itself. Every other caller gets a copy from
+``readdress``, addressed to its own sender.
+
+A flight belongs to all of its waiters, not to the caller that started
+it. Its deadline is the latest of their deadlines, and it is only
+abandoned once the last waiter has given up. A flight can only be joined
+for ``window`` seconds after it was sent, so a long-running request does
+not absorb later traffic indefinitely.
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from codecollab.core.message import DEADLINE, AgentRole, Message, MessageType
+
+
+def request_key(recipient: AgentRole, message_type: MessageType, content: str) -> Tuple:
+    """
+    Key under which identical requests are coalesced (and cached).
+
+    The content is reduced to a 128-bit BLAKE2 digest, so keys stay small
+    and collisions are not a practical concern.
+    """
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+    return (recipient, message_type, digest)
+
+
+def readdress(response: Message, requester: AgentRole,
+              response_to: Optional[str] = None) -> Message:
+    """
+    Copy of a shared ``response`` for another caller.
+
+    Args:
+        response: Response received for someone else's request
+        requester: Role the copy is addressed to
+        response_to: Request id the copy answers (None = no request was sent)
+    """
+    metadata = dict(response.metadata) if response.has_metadata else {}
+    if response_to is not None:
+        metadata['response_to'] = response_to
+    else:
+        metadata.pop('response_to', None)
+    return Message(
+        sender=response.sender,
+        recipient=requester,
+        message_type=response.message_type,
+        content=response.content,
+        priority=response.priority,
+        metadata=metadata or None,
+        conversation_id=response.conversation_id
+    )
+
+
+class Flight:
+    """One in-flight request shared by every caller waiting for its response."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.request: Optional[Message] = None
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self._latest = 0.0
+        self._unbounded = False
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Latest waiter deadline (``time.time()`` seconds; None = a waiter has no timeout)."""
+        return None if self._unbounded else self._latest
+
+    def add_waiter(self, deadline: Optional[float]):
+        """Count a waiter and extend the flight (and its request) to its deadline."""
+        self.waiters += 1
+        if deadline is None:
+            self._unbounded = True
+        elif deadline > self._latest:
+            self._latest = deadline
+        if self.request is not None:
+            if self._unbounded:
+                self.request.metadata.pop(DEADLINE, None)
+            else:
+                self.request.metadata[DEADLINE] = self._latest
+
+    def remove_waiter(self) -> bool:
+        """Drop a waiter; True if none is left."""
+        self.waiters -= 1
+        return self.waiters <= 0
+
+
+class RequestCoalescer:
+    """In-flight requests keyed by ``request_key``, each with a shared result future."""
+
+    def __init__(self, window: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            window: Seconds after a request was sent during which identical
+                requests join it
+            clock: Monotonic time source (injectable for tests)
+        """
+        if window < 0:
+            raise ValueError("window must not be negative")
+        self.window = window
+        self._clock = clock
+        self._flights: Dict[Hashable, Flight] = {}
+        self.led = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def join(self, key: Hashable) -> Optional[Flight]:
+        """
+        The joinable in-flight request for ``key``, if any.
+
+        Returns:
+            The flight to wait on, or None if the caller should start one
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            return None
+        if flight.future.done() or self._clock() - flight.started > self.window:
+            return None
+        self.coalesced += 1
+        return flight
+
+    def lead(self, key: Hashable) -> Flight:
+        """Register a new flight for ``key``."""
+        flight = self._flights[key] = Flight(self._clock())
+        self.led += 1
+        return flight
+
+    def land(self, key: Hashable, flight: Flight, response: Optional[Message]):
+        """Publish the flight's outcome to its waiters and retire it."""
+        if not flight.future.done():
+            flight.future.set_result(response)
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def get_stats(self) -> Dict:
+        return {'in_flight': len(self._flights), 'led': self.led, 'coalesced': self.coalesced}
@@ -0,0 +1,216 @@
+"""Wire codecs for ``Message``.
+
+Two interchangeable encodings are provided behind the ``MessageCodec``
+interface:
+
+- ``JsonCodec``: the ``to_dict`` layout as compact JSON, built directly
+  from the message fields (no ``dataclasses.asdict`` deep copy) and decoded
+  without the per-field validation of ``Message.from_dict``.
+- ``BinaryCodec``: a compact binary frame. Enum fields are encoded as
+  one-byte codes taken from their declaration order, strings are
+  length-prefixed UTF-8, metadata is only written when present and a
+  multicast recipient set is appended as a role bitmask.
+
+Codecs are looked up by name via ``get_codec`` so storage and transports can
+make the encoding configurable.
+"""
+
+import json
+import struct
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from codecollab.core.message import AgentRole, MessageType, MessagePriority, Message
+
+# Interned enum tables: value <-> member for JSON, member <-> code for binary
+_ROLES = tuple(AgentRole)
+_TYPES = tuple(MessageType)
+_PRIORITIES = tuple(MessagePriority)
+_ROLE_CODES = {role: code for code, role in enumerate(_ROLES)}
+_TYPE_CODES = {mtype: code for code, mtype in enumerate(_TYPES)}
+_PRIORITY_CODES = {priority: code for code, priority in enumerate(_PRIORITIES)}
+_ROLE_BY_VALUE = {role.value: role for role in _ROLES}
+_TYPE_BY_VALUE = {mtype.value: mtype for mtype in _TYPES}
+_PRIORITY_BY_VALUE = {priority.value: priority for priority in _PRIORITIES}
+
+_json_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+_json_decoder = json.JSONDecoder()
+
+
+class CodecError(ValueError):
+    """Raised when a payload cannot be decoded."""
+
+
+class MessageCodec(ABC):
+    """Interface for message encoders/decoders."""
+
+    name: str = ""
+
+    @abstractmethod
+    def encode(self, message: Message) -> bytes:
+        """Serialize a message to bytes."""
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Message:
+        """Deserialize a message from bytes."""
+        pass
+
+
+class JsonCodec(MessageCodec):
+    """UTF-8 JSON in the ``Message.to_dict`` layout."""
+
+    name = "json"
+
+    def encode(self, message: Message) -> bytes:
+        data = {
+            'sender': message.sender.value,
+            'recipient': message.recipient.value,
+            'message_type': message.message_type.value,
+            'content': message.content,
+            'id': message.id,
+            'priority': message.priority.value,
+            'timestamp': message.timestamp,
+            'metadata': message._metadata or {},
+            'requires_response': message.requires_response,
+            'conversation_id': message.conversation_id
+        }
+        if message.recipients is not None:
+            data['recipients'] = sorted(role.value for role in message.recipients)
+        return _json_encoder.encode(data).encode('utf-8')
+
+    def decode(self, data: bytes) -> Message:
+        try:
+            d = _json_decoder.decode(str(data, 'utf-8'))
+            meta = d.get('metadata')
+            recipients = d.get('recipients')
+            return Message(
+                _ROLE_BY_VALUE[d['sender']],
+                _ROLE_BY_VALUE[d['recipient']],
+                _TYPE_BY_VALUE[d['message_type']],
+                d['content'],
+                d['id'],
+                _PRIORITY_BY_VALUE[d['priority']],
+                d['timestamp'],
+                meta or None,
+                d.get('requires_response', False),
+                d.get('conversation_id'),
+                [_ROLE_BY_VALUE[r] for r in recipients] if recipients is not None else None
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise CodecError(f"Invalid JSON message: {e}") from e
+
+
+# version, sender, recipient, type, priority, flags, timestamp,
+# id length, conversation id length, content length, metadata length
+_HEADER = struct.Struct('!BBBBBBdHHII')
+_VERSION = 1
+_FLAG_REQUIRES_RESPONSE = 0x01
+_FLAG_MULTICAST = 0x02
+_RECIPIENT_MASK = struct.Struct('!H')
+
+
+class BinaryCodec(MessageCodec):
+    """Compact binary frame with one-byte enum codes."""
+
+    name = "binary"
+
+    def encode(self, message: Message) -> bytes:
+        id_bytes = message.id.encode('utf-8')
+        conversation_bytes = message.conversation_id.encode('utf-8')
+        content_bytes = message.content.encode('utf-8')
+        meta = message._metadata
+        meta_bytes = _json_encoder.encode(meta).encode('utf-8') if meta else b''
+        flags = _FLAG_REQUIRES_RESPONSE if message.requires_response else 0
+        if message.recipients is not None:
+            flags |= _FLAG_MULTICAST
+        header = _HEADER.pack(
+            _VERSION,
+            _ROLE_CODES[message.sender],
+            _ROLE_CODES[message.recipient],
+            _TYPE_CODES[message.message_type],
+            _PRIORITY_CODES[message.priority],
+            flags,
+            message.timestamp,
+            len(id_bytes),
+            len(conversation_bytes),
+            len(content_bytes),
+            len(meta_bytes)
+        )
+        parts = [header, id_bytes, conversation_bytes, content_bytes, meta_bytes]
+        if message.recipients is not None:
+            mask = 0
+            for role in message.recipients:
+                mask |= 1 << _ROLE_CODES[role]
+            parts.append(_RECIPIENT_MASK.pack(mask))
+        return b''.join(parts)
+
+    def decode(self, data: bytes) -> Message:
+        try:
+            (version, sender, recipient, mtype, priority, flags, timestamp,
+             id_len, conversation_len, content_len, meta_len) = _HEADER.unpack_from(data)
+        except struct.error as e:
+            raise CodecError(f"Truncated binary message header: {e}") from e
+        if version != _VERSION:
+            raise CodecError(f"Unsupported binary message version: {version}")
+        offset = _HEADER.size
+        end = offset + id_len + conversation_len + content_len + meta_len
+        if flags & _FLAG_MULTICAST:
+            end += _RECIPIENT_MASK.size
+        if len(data) < end:
+            raise CodecError("Truncated binary message body")
+        view = memoryview(data)
+        try:
+            message_id = str(view[offset:offset + id_len], 'utf-8')
+            offset += id_len
+            conversation_id = str(view[offset:offset + conversation_len], 'utf-8')
+            offset += conversation_len
+            content = str(view[offset:offset + content_len], 'utf-8')
+            offset += content_len
+            meta = (_json_decoder.decode(str(view[offset:offset + meta_len], 'utf-8'))
+                    if meta_len else None)
+            offset += meta_len
+            recipients = None
+            if flags & _FLAG_MULTICAST:
+                mask, = _RECIPIENT_MASK.unpack_from(data, offset)
+                recipients = [role for code, role in enumerate(_ROLES) if mask & (1 << code)]
+            return Message(
+                _ROLES[sender],
+                _ROLES[recipient],
+                _TYPES[mtype],
+                content,
+                message_id,
+                _PRIORITIES[priority],
+                timestamp,
+                meta,
+                bool(flags & _FLAG_REQUIRES_RESPONSE),
+                conversation_id,
+                recipients
+            )
+        except (IndexError, UnicodeDecodeError, ValueError) as e:
+            raise CodecError(f"Invalid binary message: {e}") from e
+
+
+_CODECS: Dict[str, MessageCodec] = {}
+
+
+def register_codec(codec: MessageCodec):
+    """Make a codec available to ``get_codec`` under ``codec.name``."""
+    _CODECS[codec.name] = codec
+
+
+def get_codec(name: str = "binary") -> MessageCodec:
+    """Look up a registered codec by name."""
+    try:
+        return _CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown message codec: {name}") from None
+
+
+def available_codecs() -> List[str]:
+    """Names of registered codecs."""
+    return list(_CODECS)
+
+
+register_codec(JsonCodec())
+register_codec(BinaryCodec())
@@ -1,125 +1,39 @@
 """Communication Hub - Main implementation for CodeCollab AI (Phase 1)
 
-This file will contain the CommunicationHub, Message, AgentRole, and MessageType classes.
+This file contains the CommunicationHub. Message, AgentRole, MessageType and
+MessagePriority live in codecollab.core.message, ConversationThread in
+codecollab.core.conversations; all are re-exported here.
 """
 
 import asyncio
-import json
+import inspect
 import time
 import uuid
-from typing import Dict, List, Optional, Callable, Any, cast
-from dataclasses import dataclass, asdict, field
-from enum import Enum
-from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Callable
 import logging
-import typing
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-
-class AgentRole(Enum):
-    """Defines the roles agents can take in the system."""
-    PRODUCT_MANAGER = "pm"
-    DEVELOPER = "dev" 
-    REVIEWER = "reviewer"
-    TESTER = "tester"
-    ORCHESTRATOR = "orchestrator"
-
-
-class MessageType(Enum):
-    """Types of messages that can be sent between agents."""
-    TASK_REQUEST = "task_request"
-    TASK_RESPONSE = "task_response"
-    COLLABORATION_REQUEST = "collaboration_request"
-    STATUS_UPDATE = "status_update"
-    ERROR_REPORT = "error_report"
-    NEGOTIATION = "negotiation"
-    CONSENSUS = "consensus"
-
-
-class MessagePriority(Enum):
-    """Message priority levels."""
-    LOW = 1
-    MEDIUM = 2
-    HIGH = 3
-    URGENT = 4
+from codecollab.core.message import (
+    DEADLINE, AgentRole, MessageType, MessagePriority, Message
+)
+from codecollab.core.scheduler import PriorityScheduler, SchedulerClosed
+from codecollab.core.delivery import DeliveryEngine, BROADCAST_LANE
+from codecollab.core.correlation import CorrelationRegistry
+from codecollab.core.coalescing import Flight, RequestCoalescer, readdress, request_key
+from codecollab.core.cache import ResponseCache
+from codecollab.core.history import MessageHistory
+from codecollab.core.router import SubscriptionRouter, Subscription
+from codecollab.core.admission import AdmissionController, HubOverloadedError
+from codecollab.core.logging_utils import EventLogger
+from codecollab.core.wal import WriteAheadLog
+from codecollab.core.archive import ArchivePage, MessageArchive
+from codecollab.core.retry import DeadLetter, DeadLetterQueue, RetryPolicy, TimerWheel
+from codecollab.core.metrics import HubMetrics
+from codecollab.core.conversations import ACTIVE, ConversationStore, ConversationThread
+from codecollab.core.negotiation import Negotiation, NegotiationEngine, NegotiationOutcome, Proposal
 
-
-@dataclass
-class Message:
-    """Core message structure for agent communication."""
-    sender: AgentRole
-    recipient: AgentRole
-    message_type: MessageType
-    content: str
-    id: Optional[str] = None
-    priority: MessagePriority = MessagePriority.MEDIUM
-    timestamp: Optional[float] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)  # Always dict, never None
-    requires_response: bool = False
-    conversation_id: Optional[str] = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = time.time()
-        if self.id is None:
-            self.id = str(uuid.uuid4())
-        if self.conversation_id is None:
-            self.conversation_id = str(uuid.uuid4())
-        # No metadata check needed - it's always a dict
-    
-    def to_dict(self) -> Dict:
-        """Convert message to dictionary for serialization."""
-        return {
-            **asdict(self),
-            'sender': self.sender.value,
-            'recipient': self.recipient.value, 
-            'message_type': self.message_type.value,
-            'priority': self.priority.value
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'Message':
-        """Create message from dictionary."""
-        # Bulletproof metadata handling with assert + cast
-        raw_metadata = data.get('metadata')
-        meta = raw_metadata if isinstance(raw_metadata, dict) else {}
-        assert meta is not None and isinstance(meta, dict), "metadata must be a dict"
-        meta = cast(Dict[str, Any], meta)  # Tell type checker: this is definitely Dict[str, Any]
-        if meta is None:
-            meta = {}
-        return cls(
-            id=data['id'],
-            sender=AgentRole(data['sender']),
-            recipient=AgentRole(data['recipient']),
-            message_type=MessageType(data['message_type']),
-            content=data['content'],
-            priority=MessagePriority(data['priority']),
-            timestamp=data['timestamp'],
-            metadata=meta,  # Type checker now 100% convinced this is Dict[str, Any]
-            requires_response=data.get('requires_response', False),
-            conversation_id=data.get('conversation_id')
-        )
-
-@dataclass
-class ConversationThread:
-    """Tracks a conversation between agents."""
-    id: str
-    participants: List[AgentRole]
-    messages: List[Message]
-    created_at: float
-    status: str = "active"  # active, completed, archived
-    
-    def add_message(self, message: Message):
-        """Add a message to the conversation."""
-        message.conversation_id = self.id
-        self.messages.append(message)
-    
-    def get_context(self, limit: int = 10) -> List[Message]:
-        """Get recent messages for context."""
-        return self.messages[-limit:]
+# Logging is configured by the application (see logging_utils.configure_logging)
+logger = logging.getLogger(__name__)
+events = EventLogger(logger)
 
 
 class CommunicationHub:
@@ -135,22 +49,140 @@ class CommunicationHub:
     - Performance monitoring
     """
     
-    def __init__(self):
+    # Messages the dispatcher hands to lanes before yielding to other tasks
+    DISPATCH_BATCH_SIZE = 256
+    
+    def __init__(self, aging_threshold: Optional[float] = 5.0,
+                 max_concurrent_deliveries: Optional[int] = None,
+                 history_limit: Optional[int] = 10000,
+                 history_max_age: Optional[float] = None,
+                 admission: Optional[AdmissionController] = None,
+                 wal: Optional[WriteAheadLog] = None,
+                 archive: Optional[MessageArchive] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 dead_letter_limit: int = 1000,
+                 metrics: Optional[HubMetrics] = None,
+                 conversation_ttl: Optional[float] = None,
+                 max_conversations: Optional[int] = 10000,
+                 conversation_window: Optional[int] = 1000,
+                 conversation_summarizer: Optional[Callable] = None,
+                 negotiation_round_timeout: Optional[float] = None,
+                 max_finished_negotiations: Optional[int] = 1000,
+                 coalesce_window: Optional[float] = None,
+                 response_cache: Optional[ResponseCache] = None):
+        """
+        Initialize the communication hub.
+        
+        Args:
+            aging_threshold: Seconds a lower-priority message may wait before
+                it is served ahead of higher priorities (None disables aging)
+            max_concurrent_deliveries: Cap on handlers running at once across
+                all recipients (None = one ordered worker per recipient)
+            history_limit: Messages kept in message_history (None = unbounded)
+            history_max_age: Seconds a message is kept in message_history
+                (None = no age limit)
+            admission: Bounds pending messages per priority class/sender
+                (None = unbounded)
+            wal: Write-ahead log making accepted messages durable; messages
+                not yet delivered are replayed by start() (None = memory only)
+            archive: Receives messages evicted from message_history so they
+                stay queryable on disk (None = evicted messages are discarded)
+            retry_policy: Retry failed deliveries with backoff (at-least-once);
+                None = a failed delivery is dead-lettered at once
+            dead_letter_limit: Failed deliveries kept for inspection/replay
+            metrics: Records per-stage delivery latency histograms
+                (None = no timing instrumentation)
+            conversation_ttl: Archive conversations idle for this many
+                seconds (None = no idle expiry)
+            max_conversations: Live conversation threads kept before the
+                least recently active are archived (None = no limit)
+            conversation_window: Messages each conversation thread keeps for
+                context (None = unbounded)
+            conversation_summarizer: ``summarizer(digest, evicted)`` folding
+                messages that leave a thread's window into a digest entry
+            negotiation_round_timeout: Default seconds before an undecided
+                negotiation round moves on (None = rounds end by voting)
+            max_finished_negotiations: Outcomes of finished negotiations
+                kept (None = unbounded)
+            coalesce_window: Seconds after a request was sent during which
+                an identical send_request (same recipient, type and content)
+                shares its delivery and response (None = no coalescing)
+            response_cache: Serves repeated send_request calls of the
+                cached request types without a round trip (None = no cache)
+        """
         # Message routing
-        self.message_queue: asyncio.Queue = asyncio.Queue()
+        self.message_queue = PriorityScheduler(
+            levels=[p.value for p in MessagePriority],
+            aging_threshold=aging_threshold
+        )
         self.subscribers: Dict[AgentRole, Callable] = {}
-        self.broadcast_subscribers: List[Callable] = []
+        self.router = SubscriptionRouter()
+        self.delivery = DeliveryEngine(
+            deliver=self._deliver,
+            levels=[p.value for p in MessagePriority],
+            on_error=self._on_delivery_error,
+            aging_threshold=aging_threshold,
+            max_concurrency=max_concurrent_deliveries,
+            deliver_batch=self._deliver_batch
+        )
+        
+        self.pending_requests = CorrelationRegistry()
+        # Recipient role -> callback told about requests whose sender gave up
+        self._abandon_listeners: Dict[AgentRole, Callable[[Message], None]] = {}
+        self.coalescer = RequestCoalescer(coalesce_window) if coalesce_window is not None else None
+        self.response_cache = response_cache
+        
+        # Delivery guarantees: (lane key, message id) -> failed attempts so far
+        self.retry_policy = retry_policy
+        self.retry_timers = TimerWheel()
+        self.dead_letters = DeadLetterQueue(dead_letter_limit)
+        self._attempts: Dict[tuple, int] = {}
+        
+        # Latency instrumentation (stage timestamps ride on message._trace)
+        self.metrics = metrics
+        self.admission = admission
+        if admission is not None and admission.on_drop is None:
+            admission.on_drop = self._on_message_dropped
+        
+        # Persistence: message id -> lane deliveries left before the WAL ack
+        self.wal = wal
+        self._unacked: Dict[str, int] = {}
+        if wal is not None:
+            wal.open()
         
         # Conversation management
-        self.conversations: Dict[str, ConversationThread] = {}
-        self.active_negotiations: Dict[str, Dict] = {}
+        self.conversations = ConversationStore(
+            idle_ttl=conversation_ttl,
+            max_live=max_conversations,
+            window=conversation_window,
+            summarizer=conversation_summarizer
+        )
+        self.negotiations = NegotiationEngine(
+            round_timeout=negotiation_round_timeout,
+            max_finished=max_finished_negotiations,
+            on_update=self._on_negotiation_update
+        )
+        self.active_negotiations: Dict[str, Negotiation] = self.negotiations.active
+        self._notification_tasks = set()
         
         # Message history and analytics
-        self.message_history: List[Message] = []
+        self.archive = archive
+        self.message_history = MessageHistory(
+            max_messages=history_limit,
+            max_age=history_max_age,
+            on_evict=archive.append if archive is not None else None
+        )
+        self.first_message_at: Optional[float] = None
         self.delivery_stats: Dict[str, int] = {
             'total_sent': 0,
             'total_delivered': 0,
-            'total_failed': 0
+            'total_failed': 0,
+            'total_rejected': 0,
+            'total_dropped': 0,
+            'total_retried': 0,
+            'total_dead_lettered': 0,
+            'total_expired': 0,
+            'total_abandoned': 0
         }
         
         # System state
@@ -165,92 +197,457 @@ class CommunicationHub:
             return
             
         self.is_running = True
+        if self.wal is not None:
+            self.wal.open()
+            self._replay_wal()
+        if self.archive is not None:
+            self.archive.open()
+        self.message_queue.reopen()
+        self.negotiations.resume()
+        self.delivery.start()
         self.processing_task = asyncio.create_task(self._process_messages())
         logger.info("📡 Communication Hub started")
     
-    async def stop(self):
-        """Stop the communication hub."""
+    async def stop(self, drain: bool = False, timeout: Optional[float] = 30.0):
+        """
+        Stop the communication hub.
+
+        Args:
+            drain: Deliver everything already queued (including messages
+                handlers send while the hub drains and pending retries)
+                before stopping
+            timeout: Deadline in seconds for the drain (None = no limit);
+                when it passes, queued messages stay queued and running
+                handlers are cancelled, as with a plain stop
+        """
+        if drain and self.processing_task is not None:
+            try:
+                await asyncio.wait_for(self._drain(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"⚠️ Drain deadline of {timeout}s passed with "
+                    f"{self.message_queue.qsize() + self.delivery.pending()} messages undelivered"
+                )
         self.is_running = False
+        # Round timers must not advance negotiations (and queue notices) while stopped
+        self.negotiations.close()
+        # Wakes the dispatcher, which returns instead of taking more messages
+        self.message_queue.close()
         if self.processing_task:
-            self.processing_task.cancel()
-            try:
-                await self.processing_task
-            except asyncio.CancelledError:
-                pass
+            await self.processing_task
+            self.processing_task = None
+        # Pending retries go back to their lanes, like other undelivered messages
+        for callback, args in self.retry_timers.drain():
+            callback(*args)
+        await self.delivery.stop()
+        if self.wal is not None:
+            # Releases the segment file; start() (or the next send) reopens the log
+            await self.wal.close()
+        if self.archive is not None:
+            # Sealed off the loop; close() then only unmaps (start() maps again)
+            await self.archive.seal()
+            self.archive.close()
         logger.info("📡 Communication Hub stopped")
     
-    def subscribe(self, role: AgentRole, callback: Callable):
-        """Subscribe an agent to receive messages."""
+    def _replay_wal(self):
+        """Re-queue messages a previous run logged but never delivered."""
+        recovered = self.wal.take_recovered()
+        if not recovered:
+            return
+        self.message_queue.put_many(
+            (message, message.priority.value) for message in recovered
+        )
+        if self.first_message_at is None:
+            self.first_message_at = recovered[0].timestamp
+        self.message_history.extend(recovered)
+        for message in recovered:
+            self._track_conversation(message)
+        logger.info(f"♻️ Replayed {len(recovered)} undelivered messages from the write-ahead log")
+    
+    def subscribe(self, role: AgentRole, callback: Callable,
+                  batch_size: Optional[int] = None):
+        """
+        Subscribe an agent to receive messages.
+        
+        Args:
+            role: Role whose messages the callback receives
+            callback: Called with each message, or with a list of messages
+                when ``batch_size`` is set
+            batch_size: Hand over up to this many queued messages per call
+                (None = one message per call)
+        """
+        self.delivery.configure_lane(role, batch_size)
         self.subscribers[role] = callback
         logger.info(f"📝 Agent {role.value} subscribed to communication hub")
     
-    def subscribe_to_all(self, callback: Callable):
+    def subscribe_to_all(self, callback: Callable) -> Subscription:
         """Subscribe to all messages (for monitoring/logging)."""
-        self.broadcast_subscribers.append(callback)
+        subscription = self.router.add(callback)
         logger.info("📝 Broadcast subscriber added")
+        return subscription
+    
+    def add_subscription(self, callback: Callable,
+                         recipients: Optional[List[AgentRole]] = None,
+                         message_types: Optional[List[MessageType]] = None,
+                         priorities: Optional[List[MessagePriority]] = None,
+                         metadata_keys: Optional[List[str]] = None) -> Subscription:
+        """
+        Subscribe an observer to the messages matching the given filters.
+        
+        Any number of observers may watch the same role. Observers run on
+        the hub's observer lane, in addition to the recipient's own handler.
+        
+        Args:
+            callback: Called with each matching message
+            recipients: Only messages addressed to one of these roles
+            message_types: Only messages of these types
+            priorities: Only messages with these priorities
+            metadata_keys: Only messages whose metadata contains all these keys
+            
+        Returns:
+            Subscription handle (pass its id to unsubscribe)
+        """
+        subscription = self.router.add(
+            callback,
+            recipients=recipients,
+            message_types=message_types,
+            priorities=priorities,
+            metadata_keys=metadata_keys
+        )
+        logger.info(f"📝 Subscription {subscription.id} added")
+        return subscription
+    
+    def unsubscribe(self, subscription_id: str) -> bool:
+        """Remove an observer subscription by id."""
+        return self.router.remove(subscription_id)
+    
+    @property
+    def broadcast_subscribers(self) -> List[Callable]:
+        """Callbacks of all observer subscriptions."""
+        return [subscription.callback for subscription in self.router.subscriptions]
 
     async def _process_messages(self):
-        """Main message processing loop."""
+        """Main message processing loop; runs until ``stop()`` closes the queue."""
         logger.info("🔄 Message processing started")
+        queue = self.message_queue
+        batch_size = self.DISPATCH_BATCH_SIZE
         
-        while self.is_running:
+        while True:
             try:
-                # Get message with priority (higher number = higher priority)
-                priority, message = await asyncio.wait_for(
-                    self.message_queue.get(), timeout=1.0
-                )
-                
-                # Deliver to specific recipient
-                if message.recipient in self.subscribers:
-                    try:
-                        await self.subscribers[message.recipient](message)
-                        self.delivery_stats['total_delivered'] += 1
-                        logger.debug(f"✅ Message delivered: {message.id}")
-                    except Exception as e:
-                        logger.error(f"❌ Delivery failed: {e}")
-                        self.delivery_stats['total_failed'] += 1
-                
-                # Send to broadcast subscribers
-                for subscriber in self.broadcast_subscribers:
-                    try:
-                        await subscriber(message)
-                    except Exception as e:
-                        logger.warning(f"⚠️ Broadcast subscriber error: {e}")
-                
-                # Mark task as done
-                self.message_queue.task_done()
-                
-            except asyncio.TimeoutError:
-                # Normal timeout, continue loop
+                # Next messages (highest priority first, FIFO within a level)
+                batch = await queue.get_batch(batch_size)
+            except SchedulerClosed:
+                break
+            
+            for message in batch:
+                try:
+                    self._dispatch(message)
+                except Exception as e:
+                    logger.error(f"❌ Message processing error: {e}")
+                finally:
+                    # Mark task as done
+                    queue.task_done()
+            if len(batch) == batch_size:
+                # More is queued and get() would not suspend; let lanes run first
+                await asyncio.sleep(0)
+        
+        logger.info("🔄 Message processing stopped")
+
+    async def _drain(self):
+        """Wait until notices, the ingress queue, the lanes and the retry timers are empty."""
+        while True:
+            if self._notification_tasks:
+                await asyncio.gather(*self._notification_tasks)
+            await self.message_queue.join()
+            await self.delivery.join()
+            if self.message_queue.qsize() or self.delivery.pending():
+                # Handlers queued more while we waited
                 continue
-            except Exception as e:
-                logger.error(f"❌ Message processing error: {e}")
+            if not len(self.retry_timers):
+                return
+            await asyncio.sleep(self.retry_timers.tick)
+    
+    def _dispatch(self, message: Message):
+        """Hand one message from the ingress queue to its delivery lanes."""
+        if self.metrics is not None:
+            trace = getattr(message, '_trace', None)
+            if trace is not None:
+                trace[1] = time.perf_counter()
+        
+        # Resolve a waiting send_request() before normal delivery
+        if self.pending_requests:
+            self.pending_requests.resolve(message)
+        
+        # Hand off to per-recipient lanes; delivery runs concurrently
+        # (a multicast message is queued once and fanned out here)
+        admission = self.admission
+        if admission is not None and admission.is_dropped(message):
+            admission.dispatched(message, 0)
+            if self.wal is not None:
+                self.wal.ack(message.id)
+            return
+        priority = message.priority.value
+        deliveries = 0
+        for recipient in message.targets():
+            if recipient in self.subscribers:
+                self.delivery.submit(recipient, message, priority)
+                deliveries += 1
+        if self.router.match(message):
+            self.delivery.submit(BROADCAST_LANE, message, priority)
+            deliveries += 1
+        if admission is not None:
+            admission.dispatched(message, deliveries)
+        if self.wal is not None:
+            if deliveries:
+                self._unacked[message.id] = deliveries
+            else:
+                self.wal.ack(message.id)
+
+    async def _deliver(self, key, message: Message):
+        """Deliver a message to the subscriber(s) behind a delivery lane."""
+        admission = self.admission
+        if admission is None and self.wal is None and not self._attempts:
+            await self._deliver_to(key, message)
+            return
+        # A failure that will be retried keeps the message pending
+        finished = True
+        try:
+            if admission is None or not admission.is_dropped(message):
+                await self._deliver_to(key, message)
+            if self._attempts:
+                self._attempts.pop((key, message.id), None)
+        except Exception:
+            finished = self.retry_policy is None
+            raise
+        finally:
+            if finished:
+                self._lane_finished(message)
+    
+    async def _deliver_to(self, key, message: Message):
+        if message.has_metadata and self._expired(message):
+            return
+        if key == BROADCAST_LANE:
+            for subscription in self.router.match(message):
+                try:
+                    result = subscription.callback(message)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.warning(f"⚠️ Broadcast subscriber error: {e}")
+            return
+        
+        subscriber = self.subscribers.get(key)
+        if subscriber is None:
+            return
+        started = time.perf_counter() if self.metrics is not None else 0.0
+        result = subscriber(message)
+        if inspect.isawaitable(result):
+            await result
+        if self.metrics is not None:
+            self._record_latency(key, (message,), started)
+        self.delivery_stats['total_delivered'] += 1
+        events.debug("message_delivered", "✅ Message delivered: %s", message.id)
+    
+    async def _deliver_batch(self, key, messages: List[Message]):
+        """Deliver a batch of messages to a batch-mode subscriber."""
+        admission = self.admission
+        live = messages
+        if admission is not None:
+            live = [message for message in messages if not admission.is_dropped(message)]
+        live = [message for message in live if not (message.has_metadata and self._expired(message))]
+        finished = True
+        try:
+            subscriber = self.subscribers.get(key)
+            if subscriber is None or not live:
+                return
+            started = time.perf_counter() if self.metrics is not None else 0.0
+            result = subscriber(live)
+            if inspect.isawaitable(result):
+                await result
+            if self.metrics is not None:
+                self._record_latency(key, live, started)
+            self.delivery_stats['total_delivered'] += len(live)
+            events.debug("batch_delivered", "✅ Batch delivered: %d messages to %s",
+                         len(live), key.value)
+            if self._attempts:
+                for message in live:
+                    self._attempts.pop((key, message.id), None)
+        except Exception:
+            finished = self.retry_policy is None
+            raise
+        finally:
+            if finished and (admission is not None or self.wal is not None):
+                for message in messages:
+                    self._lane_finished(message)
+    
+    def _expired(self, message: Message) -> bool:
+        """Count and skip a delivery whose deadline has passed."""
+        if not message.is_expired():
+            return False
+        self.delivery_stats['total_expired'] += 1
+        events.debug("message_expired", "⌛ Expired message dropped: %s", message.id)
+        return True
+    
+    def _record_latency(self, key, messages: Iterable[Message], started: float):
+        """Record stage timings for messages whose handler just returned."""
+        finished = time.perf_counter()
+        for message in messages:
+            trace = getattr(message, '_trace', None)
+            if trace is not None and trace[1] is not None:
+                self.metrics.record_delivery(key, message, trace[0], trace[1], started, finished)
+    
+    def _lane_finished(self, message: Message):
+        """One lane is done with ``message`` (delivered, failed or skipped)."""
+        if self.admission is not None:
+            self.admission.completed(message)
+        if self.wal is not None:
+            remaining = self._unacked.get(message.id)
+            if remaining is None:
+                return
+            if remaining <= 1:
+                del self._unacked[message.id]
+                self.wal.ack(message.id)
+            else:
+                self._unacked[message.id] = remaining - 1
+    
+    def _on_message_dropped(self, message: Message):
+        """Record a pending message dropped by admission control."""
+        logger.warning(f"🗑️ Message dropped under load: {message.id}")
+        self.delivery_stats['total_dropped'] += 1
+    
+    def _on_delivery_error(self, key, message: Message, error: Exception):
+        """Retry or dead-letter a failed delivery reported by the delivery engine."""
+        self.delivery_stats['total_failed'] += 1
+        policy = self.retry_policy
+        attempts = self._attempts.pop((key, message.id), 0) + 1
+        if policy is not None and attempts < policy.max_attempts:
+            self._attempts[(key, message.id)] = attempts
+            delay = policy.delay_for(attempts)
+            self.retry_timers.schedule(delay, self._retry, key, message)
+            self.delivery_stats['total_retried'] += 1
+            logger.warning(f"🔁 Delivery of {message.id} to {getattr(key, 'value', key)} failed "
+                           f"(attempt {attempts}), retrying in {delay:.2f}s: {error}")
+            return
+        logger.error(f"❌ Delivery failed: {error}")
+        self.dead_letters.append(DeadLetter(message, key, repr(error), attempts))
+        self.delivery_stats['total_dead_lettered'] += 1
+        if policy is not None:
+            self._lane_finished(message)
+    
+    def _retry(self, key, message: Message):
+        """Put a message whose backoff expired back on its lane."""
+        self.delivery.submit(key, message, message.priority.value)
+    
+    def get_dead_letters(self) -> List[DeadLetter]:
+        """Failed deliveries that were given up on, oldest first."""
+        return list(self.dead_letters)
+    
+    def replay_dead_letters(self, message_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Deliver dead-lettered messages again, with a fresh attempt count.
+        
+        Each message only goes back to the destination that failed, so
+        recipients that already handled a multicast message don't see it twice.
+        
+        Args:
+            message_ids: Only replay these messages (None = all dead letters)
+            
+        Returns:
+            int: Number of deliveries re-queued
+        """
+        letters = self.dead_letters.take(message_ids)
+        for letter in letters:
+            self.delivery.submit(letter.destination, letter.message, letter.message.priority.value)
+        if letters:
+            logger.info(f"🔁 Replaying {len(letters)} dead-lettered deliveries")
+        return len(letters)
 
     def get_conversation_history(self, agent1: AgentRole, agent2: AgentRole, 
-                                limit: int = 50) -> List[Message]:
-        """Get conversation history between two agents."""
-        history = []
-        for message in self.message_history:
-            if ((message.sender == agent1 and message.recipient == agent2) or
-                (message.sender == agent2 and message.recipient == agent1)):
-                history.append(message)
+                                limit: int = 50, include_archived: bool = True) -> List[Message]:
+        """
+        Get conversation history between two agents, oldest first.
         
-        return history[-limit:]
+        When fewer than ``limit`` messages are still in memory, the result is
+        topped up with the newest archived ones (older pages are available
+        through ``get_archived_history``).
+        """
+        messages = self.message_history.between(agent1, agent2, limit)
+        if include_archived and self.archive is not None and len(messages) < limit:
+            older = self.archive.between(agent1, agent2, limit - len(messages))
+            messages = older.messages + messages
+        return messages
+    
+    def get_archived_history(self, agent1: AgentRole, agent2: AgentRole,
+                             limit: int = 50, before: Optional[int] = None) -> ArchivePage:
+        """
+        Page backwards through archived messages between two agents.
+        
+        Args:
+            agent1: First agent role
+            agent2: Second agent role
+            limit: Page size
+            before: Cursor from the previous page (None = newest archived)
+            
+        Returns:
+            ArchivePage with the messages (oldest first) and the next cursor
+        """
+        if self.archive is None:
+            return ArchivePage([], None)
+        return self.archive.between(agent1, agent2, limit, before)
+    
+    def get_archived_message(self, message_id: str) -> Optional[Message]:
+        """Look up an archived message by id."""
+        if self.archive is None:
+            return None
+        return self.archive.get(message_id)
+    
+    def get_conversation_messages(self, conversation_id: str,
+                                  limit: Optional[int] = None) -> List[Message]:
+        """Get retained messages for a conversation id, oldest first."""
+        return self.message_history.by_conversation(conversation_id, limit)
+    
+    def get_messages_by_type(self, message_type: MessageType,
+                             limit: Optional[int] = None) -> List[Message]:
+        """Get retained messages of a given type, oldest first."""
+        return self.message_history.by_type(message_type, limit)
     
     def get_stats(self) -> Dict:
         """Get communication hub statistics."""
-        if self.message_history and self.message_history[0].timestamp is not None:
-            uptime = time.time() - self.message_history[0].timestamp
+        if self.first_message_at is not None:
+            uptime = time.time() - self.first_message_at
         else:
             uptime = 0.0
+        self.conversations.expire()
         return {
             'total_messages': len(self.message_history),
-            'active_conversations': len([c for c in self.conversations.values() 
-                                       if c.status == 'active']),
+            'history': self.message_history.get_stats(),
+            'active_conversations': self.conversations.count(ACTIVE),
+            'conversations': self.conversations.get_stats(),
             'active_negotiations': len(self.active_negotiations),
+            'negotiations': self.negotiations.get_stats(),
+            'pending_requests': len(self.pending_requests),
+            'coalescing': self.coalescer.get_stats() if self.coalescer is not None else None,
+            'response_cache': (
+                self.response_cache.get_stats() if self.response_cache is not None else None
+            ),
             'delivery_stats': self.delivery_stats.copy(),
             'queue_size': self.message_queue.qsize(),
+            'pending_deliveries': self.delivery.pending(),
+            'in_flight': self.delivery.in_flight(),
+            'lanes': self.delivery.get_stats(),
+            'queue_depths': {
+                MessagePriority(level).name: depth
+                for level, depth in self.message_queue.depths().items()
+            },
+            'priority_promotions': self.message_queue.promotions,
+            'admission': self.admission.get_stats() if self.admission is not None else None,
+            'wal': self.wal.get_stats() if self.wal is not None else None,
+            'archive': self.archive.get_stats() if self.archive is not None else None,
+            'retries_pending': len(self.retry_timers),
+            'dead_letters': self.dead_letters.get_stats(),
+            'latency': self.metrics.snapshot() if self.metrics is not None else None,
             'subscriber_count': len(self.subscribers),
+            'observer_count': len(self.router),
             'uptime': uptime
         }
 
@@ -262,87 +659,260 @@ class CommunicationHub:
             message: Message to send
             
         Returns:
-            bool: True if message was queued successfully
+            bool: True if message was queued successfully (False if it was
+            rejected by admission control or could not be queued)
         """
         try:
-            # Add to queue with priority handling
-            await self.message_queue.put((message.priority.value, message))
+            # Backpressure: may wait, drop older messages or reject this one
+            if self.admission is not None:
+                await self.admission.admit(message)
+            
+            try:
+                # Durable before it is queued (group-committed with concurrent sends)
+                if self.wal is not None:
+                    self.wal.open()  # no-op unless stop() closed it
+                    await self.wal.append(message)
+
+                # Add to queue with priority handling
+                if self.metrics is not None:
+                    message._trace = [time.perf_counter(), None]
+                await self.message_queue.put(message, message.priority.value)
+            except BaseException:
+                # Admitted but never queued: give its capacity back
+                if self.admission is not None:
+                    self.admission.release(message)
+                raise
             
             # Track in history
+            if self.first_message_at is None:
+                self.first_message_at = message.timestamp
             self.message_history.append(message)
             self.delivery_stats['total_sent'] += 1
             
             # Add to conversation if needed
             self._track_conversation(message)
             
-            logger.info(f"📤 Message queued: {message.sender.value} → {message.recipient.value}")
+            events.info("message_queued", "📤 Message queued: %s → %s",
+                        message.sender.value, message.recipient.value)
             return True
             
+        except HubOverloadedError as e:
+            logger.warning(f"🚫 Message rejected: {e}")
+            self.delivery_stats['total_rejected'] += 1
+            return False
         except Exception as e:
             logger.error(f"❌ Failed to send message: {e}")
             self.delivery_stats['total_failed'] += 1
             return False
     
-    def _track_conversation(self, message: Message):
-        """Track message in conversation threads."""
-        conversation_id = message.conversation_id or str(uuid.uuid4())
-        created_at = message.timestamp if message.timestamp is not None else time.time()
-        
-        if conversation_id not in self.conversations:
-            # Create new conversation
-            self.conversations[conversation_id] = ConversationThread(
-                id=conversation_id,
-                participants=[message.sender, message.recipient],
-                messages=[],
-                created_at=created_at
+    async def send_messages(self, messages: Iterable[Message]) -> int:
+        """
+        Send several messages through the communication hub at once.
+        
+        Equivalent to calling ``send_message`` for each message in order,
+        but the batch is queued with a single scheduler wake-up, recorded in
+        history with one retention pass and logged with one line.
+        
+        Args:
+            messages: Messages to send
+            
+        Returns:
+            int: Number of messages queued (rejected messages are skipped)
+        """
+        accepted = list(messages)
+        if not accepted:
+            return 0
+        
+        # Backpressure: may wait, drop older messages or reject some of the batch
+        if self.admission is not None:
+            admitted = []
+            for message in accepted:
+                try:
+                    await self.admission.admit(message)
+                except HubOverloadedError as e:
+                    logger.warning(f"🚫 Message rejected: {e}")
+                    self.delivery_stats['total_rejected'] += 1
+                    continue
+                admitted.append(message)
+            accepted = admitted
+            if not accepted:
+                return 0
+        
+        try:
+            if self.wal is not None:
+                self.wal.open()  # no-op unless stop() closed it
+                await self.wal.append_many(accepted)
+            if self.metrics is not None:
+                now = time.perf_counter()
+                for message in accepted:
+                    message._trace = [now, None]
+            self.message_queue.put_many(
+                (message, message.priority.value) for message in accepted
             )
+        except Exception as e:
+            logger.error(f"❌ Failed to send messages: {e}")
+            self.delivery_stats['total_failed'] += len(accepted)
+            if self.admission is not None:
+                for message in accepted:
+                    self.admission.release(message)
+            return 0
         
-        # Add message to conversation
-        self.conversations[conversation_id].add_message(message)
+        # Track in history and conversations
+        if self.first_message_at is None:
+            self.first_message_at = accepted[0].timestamp
+        self.message_history.extend(accepted)
+        self.delivery_stats['total_sent'] += len(accepted)
+        for message in accepted:
+            self._track_conversation(message)
+        
+        events.info("batch_queued", "📤 %d messages queued", len(accepted))
+        return len(accepted)
+    
+    def _track_conversation(self, message: Message):
+        """Track message in conversation threads."""
+        self.conversations.track(message)
 
     async def send_request(self, sender: AgentRole, recipient: AgentRole, 
                           content: str, message_type: MessageType = MessageType.TASK_REQUEST,
-                          timeout: float = 30.0) -> Optional[Message]:
+                          timeout: float = 30.0,
+                          coalesce: Optional[bool] = None,
+                          metadata: Optional[Dict] = None) -> Optional[Message]:
         """
         Send a request and wait for response.
         
+        The request carries its deadline (now + ``timeout``) in
+        ``metadata[DEADLINE]``. If no response arrives in time, or the
+        caller is cancelled, the request is abandoned (see
+        ``abandon_request``).
+        
+        With coalescing on, a request identical to one sent less than
+        ``coalesce_window`` seconds ago and still in flight is not sent
+        again. The caller waits for that request's response instead, and
+        gets a copy addressed to ``sender`` that answers the shared request.
+        The shared request stays alive until the latest
+        caller's deadline. It is only abandoned once every caller has given
+        up, so a caller with a short timeout does not cut off the others.
+        
+        With a ``response_cache``, a request of a cached type is answered
+        from the cache when it can be, with a copy of the stored response
+        addressed to ``sender``. ``metadata['cache_response']`` opts this
+        request in to or out of the cache, whatever its type.
+        
         Args:
             sender: Sending agent role
             recipient: Receiving agent role  
             content: Message content
             message_type: Type of message
             timeout: Timeout in seconds
+            coalesce: Share identical in-flight requests (None = on if the
+                hub has a ``coalesce_window``; True without one raises
+                ValueError)
+            metadata: Extra request metadata (a coalesced request carries
+                the first caller's)
             
         Returns:
             Response message or None if timeout
         """
+        if coalesce and self.coalescer is None:
+            raise ValueError("coalesce=True needs a hub created with coalesce_window")
+        coalescer = self.coalescer if coalesce is not False else None
+        cache = self.response_cache
+        if cache is not None and not cache.caches(message_type, metadata):
+            cache = None
+        if coalescer is None and cache is None:
+            return await self._send_request(sender, recipient, content, message_type, timeout,
+                                            metadata)
+        
+        key = request_key(recipient, message_type, content)
+        if cache is not None:
+            cached = cache.get(key, sender)
+            if cached is not None:
+                return cached
+        if coalescer is None:
+            response = await self._send_request(sender, recipient, content, message_type, timeout,
+                                                metadata)
+            if response is not None:
+                cache.put(key, message_type, response)
+            return response
+        
+        flight = coalescer.join(key)
+        leader = flight is None
+        if leader:
+            flight = coalescer.lead(key)
+            flight.task = asyncio.create_task(
+                self._fly(key, flight, sender, recipient, content, message_type, metadata, cache)
+            )
+        flight.add_waiter(time.time() + timeout if timeout is not None else None)
+        try:
+            # Shielded: one caller giving up must not cancel the others' result
+            response = await asyncio.wait_for(asyncio.shield(flight.future), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏰ Request timeout: {sender.value} → {recipient.value}")
+            return None
+        finally:
+            if flight.remove_waiter() and not flight.future.done():
+                # Last waiter gone: nobody wants the response any more
+                flight.task.cancel()
+        if response is None or leader:
+            return response
+        return readdress(response, sender, flight.request.id)
+
+    async def _fly(self, key, flight: Flight, sender: AgentRole, recipient: AgentRole,
+                   content: str, message_type: MessageType, metadata: Optional[Dict],
+                   cache: Optional[ResponseCache]):
+        """Send a coalesced request and publish its response to the flight's waiters."""
+        deadline = flight.deadline
+        request_msg = flight.request = Message(
+            sender=sender,
+            recipient=recipient,
+            message_type=message_type,
+            content=content,
+            requires_response=True,
+            metadata=self._request_metadata(metadata, deadline)
+        )
+        response_future = self.pending_requests.register(request_msg.id, recipient)
+        response = None
+        sent = False
+        try:
+            if not await self.send_message(request_msg):
+                return
+            sent = True
+            # No timeout here: the waiters' timeouts decide when to give up
+            response = await response_future
+            if cache is not None:
+                cache.put(key, message_type, response)
+        finally:
+            self.pending_requests.discard(request_msg.id)
+            if sent and response is None:
+                self.abandon_request(request_msg)
+            self.coalescer.land(key, flight, response)
+
+    async def _send_request(self, sender: AgentRole, recipient: AgentRole, content: str,
+                            message_type: MessageType, timeout: float,
+                            metadata: Optional[Dict] = None) -> Optional[Message]:
+        """Send one request and wait for its response (no coalescing)."""
         # Create request message
         request_msg = Message(
-            id=str(uuid.uuid4()),
             sender=sender,
             recipient=recipient,
             message_type=message_type,
             content=content,
-            requires_response=True
+            requires_response=True,
+            metadata=self._request_metadata(
+                metadata, time.time() + timeout if timeout is not None else None
+            )
         )
         
-        # Set up response waiting
-        response_future = asyncio.Future()
-        
-        def response_handler(message: Message):
-            # Ensure message.metadata is not None
-            metadata = message.metadata or {}
-            if (message.sender == recipient and 
-                metadata.get('response_to') == request_msg.id):
-                if not response_future.done():
-                    response_future.set_result(message)
-        
-        # Temporarily subscribe to responses
-        self.subscribe_to_all(response_handler)
+        # Register for the reply; resolved by _process_messages via response_to
+        response_future = self.pending_requests.register(request_msg.id, recipient)
+        response = None
+        sent = False
         
         try:
-            # Send request
-            await self.send_message(request_msg)
+            # Send request (give up at once if the hub refused it)
+            if not await self.send_message(request_msg):
+                return None
+            sent = True
             
             # Wait for response
             response = await asyncio.wait_for(response_future, timeout=timeout)
@@ -354,53 +924,135 @@ class CommunicationHub:
         except Exception as e:
             logger.error(f"❌ Request failed: {e}")
             return None
+        finally:
+            # Drop the entry on timeout/cancellation (no-op once resolved)
+            self.pending_requests.discard(request_msg.id)
+            if sent and response is None:
+                self.abandon_request(request_msg)
+
+    @staticmethod
+    def _request_metadata(metadata: Optional[Dict], deadline: Optional[float]) -> Optional[Dict]:
+        """Request metadata: the caller's plus the hub deadline (None if empty)."""
+        if deadline is None:
+            return dict(metadata) if metadata else None
+        return {**metadata, DEADLINE: deadline} if metadata else {DEADLINE: deadline}
+
+    def invalidate_responses(self, recipient: Optional[AgentRole] = None,
+                             message_type: Optional[MessageType] = None,
+                             content: Optional[str] = None) -> int:
+        """
+        Drop cached responses matching every filter given (all of them if none).
+        
+        Returns:
+            int: Number of responses dropped (0 without a response cache)
+        """
+        if self.response_cache is None:
+            return 0
+        return self.response_cache.invalidate(recipient, message_type, content)
+
+    def on_request_abandoned(self, role: AgentRole,
+                             callback: Optional[Callable[[Message], None]]):
+        """
+        Register the callback told about abandoned requests sent to ``role``.
+        
+        Agents use it to cancel a handler still working on the request.
+        
+        Args:
+            role: Recipient role
+            callback: ``callback(request)``, or None to remove it
+        """
+        if callback is None:
+            self._abandon_listeners.pop(role, None)
+        else:
+            self._abandon_listeners[role] = callback
+
+    def abandon_request(self, request: Message):
+        """
+        Mark a request nobody is waiting for any more.
+        
+        Its deadline is moved to now, so it is dropped if it is still queued,
+        and the recipient's abandon listener can cancel a running handler.
+        """
+        now = time.time()
+        deadline = request.deadline
+        if deadline is None or deadline > now:
+            request.metadata[DEADLINE] = now
+        self.delivery_stats['total_abandoned'] += 1
+        listener = self._abandon_listeners.get(request.recipient)
+        if listener is not None:
+            try:
+                listener(request)
+            except Exception as e:
+                logger.warning(f"⚠️ Abandon listener error: {e}")
 
     async def broadcast_message(self, sender: AgentRole, content: str, 
-                               message_type: MessageType = MessageType.STATUS_UPDATE):
-        """Broadcast a message to all subscribed agents."""
-        for recipient_role in self.subscribers.keys():
-            if recipient_role != sender:  # Don't send to self
-                message = Message(
-                    id=str(uuid.uuid4()),
-                    sender=sender,
-                    recipient=recipient_role,
-                    message_type=message_type,
-                    content=content,
-                    metadata={'broadcast': True}
-                )
-                await self.send_message(message)
+                               message_type: MessageType = MessageType.STATUS_UPDATE,
+                               recipients: Optional[List[AgentRole]] = None,
+                               priority: MessagePriority = MessagePriority.MEDIUM) -> Optional[Message]:
+        """
+        Broadcast a message to all subscribed agents (or a chosen subset).
+        
+        A single multicast message is queued and recorded once; the hub
+        delivers the same instance to every recipient concurrently.
+        
+        Args:
+            sender: Sending agent role (never included in the audience)
+            content: Message content
+            message_type: Type of message
+            recipients: Roles to address (defaults to every subscribed role)
+            priority: Message priority
+            
+        Returns:
+            The multicast message, or None if there was nobody to send to
+        """
+        audience = self.subscribers.keys() if recipients is None else recipients
+        targets = frozenset(role for role in audience if role != sender)  # Don't send to self
+        if not targets:
+            return None
+        
+        message = Message(
+            sender=sender,
+            recipient=sender,
+            message_type=message_type,
+            content=content,
+            priority=priority,
+            metadata={'broadcast': True},
+            recipients=targets
+        )
+        await self.send_message(message)
         
-        logger.info(f"📢 Broadcast sent from {sender.value}")
+        events.info("broadcast_sent", "📢 Broadcast sent from %s to %d agents",
+                    sender.value, len(targets))
+        return message
 
     async def start_negotiation(self, participants: List[AgentRole], 
-                               topic: str, initial_data: Dict = None) -> str:
+                               topic: str, initial_data: Dict = None, **options) -> str:
         """
         Start a negotiation session between multiple agents.
         
+        Participants then take part with ``submit_proposal`` and ``cast_vote``
+        and are sent a NEGOTIATION message for every proposal, new round
+        and the final outcome.
+        
         Args:
             participants: List of agent roles to include
             topic: Negotiation topic
             initial_data: Initial negotiation data
+            **options: Consensus options (mode, threshold, quorum, weights,
+                max_rounds, round_timeout); see ``Negotiation``
             
         Returns:
             Negotiation ID
         """
         negotiation_id = str(uuid.uuid4())
-        data = initial_data if initial_data is not None else {}
-        self.active_negotiations[negotiation_id] = {
-            'id': negotiation_id,
-            'participants': participants,
-            'topic': topic,
-            'data': data,
-            'proposals': [],
-            'status': 'active',
-            'created_at': time.time()
-        }
+        negotiation = self.negotiations.start(
+            negotiation_id, participants or [], topic, initial_data, **options
+        )
         
         # Notify participants
-        for participant in participants or []:
-            message = Message(
-                id=str(uuid.uuid4()),
+        participant_values = [p.value for p in negotiation.participants]
+        await self.send_messages(
+            Message(
                 sender=AgentRole.ORCHESTRATOR,
                 recipient=participant,
                 message_type=MessageType.NEGOTIATION,
@@ -408,14 +1060,85 @@ class CommunicationHub:
                 metadata={
                     'negotiation_id': negotiation_id,
                     'action': 'start',
-                    'participants': [p.value for p in (participants or [])]
+                    'participants': list(participant_values),
+                    'mode': negotiation.mode,
+                    'round': negotiation.round
                 }
             )
-            await self.send_message(message)
+            for participant in negotiation.participants
+        )
         
         logger.info(f"🤝 Negotiation started: {negotiation_id}")
         return negotiation_id
 
+    async def submit_proposal(self, negotiation_id: str, proposer: AgentRole,
+                        content: str, data: Optional[Dict] = None) -> Proposal:
+        """
+        Submit a proposal to the current round of a negotiation.
+        
+        Raises:
+            NegotiationError: Unknown or finished negotiation, or the
+                proposer is not a participant
+        """
+        return self.negotiations.propose(negotiation_id, proposer, content, data)
+
+    async def cast_vote(self, negotiation_id: str, voter: AgentRole, proposal_id: str) -> str:
+        """
+        Vote for a proposal of the negotiation's current round.
+        
+        Returns:
+            str: Negotiation status after the vote ('active', 'agreed' or 'failed')
+            
+        Raises:
+            NegotiationError: Unknown or finished negotiation, unknown
+                proposal, or the voter is not a participant
+        """
+        return self.negotiations.vote(negotiation_id, voter, proposal_id).status
+
+    async def cancel_negotiation(self, negotiation_id: str) -> Optional[NegotiationOutcome]:
+        """Abandon an active negotiation (None if it is not active)."""
+        return self.negotiations.cancel(negotiation_id)
+
+    def get_negotiation_outcome(self, negotiation_id: str) -> Optional[NegotiationOutcome]:
+        """Outcome of a finished negotiation, if it is still kept."""
+        return self.negotiations.get_outcome(negotiation_id)
+
+    def _on_negotiation_update(self, negotiation: Negotiation, event: str):
+        """Tell the participants about a proposal, a new round or the outcome."""
+        if event == 'started':
+            return  # start_negotiation sends the start notices itself
+        metadata = {'negotiation_id': negotiation.id, 'action': event, 'round': negotiation.round}
+        if event == 'proposal':
+            proposal = next(reversed(negotiation.proposals.values()))
+            metadata['proposal_id'] = proposal.id
+            metadata['proposer'] = proposal.proposer.value
+            content = f"Proposal from {proposal.proposer.value}: {proposal.content}"
+        elif event == 'round':
+            content = f"Negotiation round {negotiation.round} started: {negotiation.topic}"
+        elif event == 'agreed':
+            metadata['proposal_id'] = negotiation.winner.id
+            content = f"Negotiation agreed: {negotiation.winner.content}"
+            logger.info(f"🤝 Negotiation agreed: {negotiation.id}")
+        else:
+            content = f"Negotiation {event}: {negotiation.topic}"
+            logger.info(f"🤝 Negotiation {event}: {negotiation.id}")
+        
+        messages = [
+            Message(
+                sender=AgentRole.ORCHESTRATOR,
+                recipient=participant,
+                message_type=MessageType.NEGOTIATION,
+                content=content,
+                metadata=dict(metadata)
+            )
+            for participant in negotiation.participants
+        ]
+        # Called synchronously from the async negotiation methods and from round
+        # timers, so a loop is always running; queue the notices in order
+        task = asyncio.get_running_loop().create_task(self.send_messages(messages))
+        self._notification_tasks.add(task)
+        task.add_done_callback(self._notification_tasks.discard)
+
 # Example usage and test
 async def demo_communication_hub():
     """Demonstrate the communication hub functionality."""
@@ -513,4 +1236,5 @@ async def demo_communication_hub():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(demo_communication_hub()) 
\ No newline at end of file
@@ -0,0 +1,445 @@
+"""Conversation tracking for the Communication Hub.
+
+``ConversationStore`` holds the hub's ``ConversationThread``s. Live threads
+are kept in order of last activity. Threads idle for longer than
+``idle_ttl``, or the least recently active ones beyond ``max_live``, are
+archived. Archiving replaces the thread, with its message list, by a small
+``ArchivedConversation`` summary. Expiry only looks at the head of the
+activity order, so it costs O(threads archived), never a full scan.
+
+Per-status counts are kept incrementally: assigning ``thread.status``
+notifies the store, so ``count('active')`` is O(1). A message for an
+archived conversation revives it as a new, empty thread; its earlier
+messages stay reachable through the hub's history and message archive.
+
+Each thread keeps its messages in a ``MessageWindow``, a fixed-capacity
+ring buffer, so per-thread memory is capped. ``get_context`` returns a
+``ContextView`` over the newest messages without copying them. When the
+window is full, the oldest messages are evicted in batches. An optional
+``summarizer`` folds each evicted batch into a rolling digest entry, which
+the context view puts first.
+"""
+
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from codecollab.core.message import AgentRole, Message
+
+ACTIVE = "active"
+COMPLETED = "completed"
+ARCHIVED = "archived"
+
+
+class MessageWindow(Sequence):
+    """
+    Ring buffer holding the newest messages of a thread, oldest first.
+
+    Messages get consecutive absolute sequence numbers; the window holds
+    ``[start, end)`` and indexing it is O(1). With ``capacity`` None it
+    never evicts.
+    """
+
+    def __init__(self, capacity: Optional[int] = None,
+                 on_evict: Optional[Callable[[List[Message]], None]] = None,
+                 evict_batch: int = 1):
+        """
+        Args:
+            capacity: Messages held before the oldest are evicted
+                (None = unbounded)
+            on_evict: Called with each batch of evicted messages
+            evict_batch: Messages evicted at once when the window is full
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.on_evict = on_evict
+        self.evict_batch = max(1, min(evict_batch, capacity or evict_batch))
+        # Grows to ``capacity`` as messages arrive, then wraps in place
+        self._slots: List[Optional[Message]] = []
+        self.start = 0
+        self.end = 0
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.at(self.start + i) for i in range(*index.indices(len(self)))]
+        size = self.end - self.start
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("message window index out of range")
+        return self.at(self.start + index)
+
+    def at(self, sequence: int) -> Message:
+        """Message with absolute sequence number ``sequence``."""
+        if not self.start <= sequence < self.end:
+            raise IndexError(f"message {sequence} is not in the window")
+        if self.capacity is None:
+            return self._slots[sequence]
+        return self._slots[sequence % self.capacity]
+
+    @property
+    def total(self) -> int:
+        """Messages ever appended, including evicted ones."""
+        return self.end
+
+    def append(self, message: Message):
+        """Add ``message``, evicting the oldest batch first if full."""
+        capacity = self.capacity
+        if capacity is None or len(self._slots) < capacity:
+            # Nothing is evicted before the ring is full, so ``end`` is the next slot
+            self._slots.append(message)
+        else:
+            if self.end - self.start == capacity:
+                self._evict()
+            self._slots[self.end % capacity] = message
+        self.end += 1
+
+    def extend(self, messages: Iterable[Message]):
+        """Append several messages in order."""
+        for message in messages:
+            self.append(message)
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def view(self, limit: int, digest: Optional[Message] = None) -> "ContextView":
+        """Zero-copy view of the newest ``limit`` messages."""
+        return ContextView(self, max(self.start, self.end - max(0, limit)), self.end, digest)
+
+    def _evict(self):
+        capacity = self.capacity
+        count = self.evict_batch
+        first = self.start
+        evicted = []
+        for sequence in range(first, first + count):
+            slot = sequence % capacity
+            evicted.append(self._slots[slot])
+            self._slots[slot] = None
+        self.start = first + count
+        if self.on_evict is not None:
+            self.on_evict(evicted)
+
+
+class ContextView(Sequence):
+    """
+    Read-only view of a contiguous run of a thread's messages.
+
+    Created in O(1) without copying. It stays valid while the thread
+    grows, and always shows the same messages, unless they are evicted
+    from the window (reading them then raises IndexError).
+    """
+
+    __slots__ = ('_window', '_start', '_end', 'digest')
+
+    def __init__(self, window: MessageWindow, start: int, end: int,
+                 digest: Optional[Message] = None):
+        self._window = window
+        self._start = start
+        self._end = end
+        self.digest = digest
+
+    def __len__(self) -> int:
+        return self._end - self._start + (self.digest is not None)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("context index out of range")
+        if self.digest is not None:
+            if index == 0:
+                return self.digest
+            index -= 1
+        return self._window.at(self._start + index)
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ContextView({list(self)!r})"
+
+
+@dataclass
+class ConversationThread:
+    """Tracks a conversation between agents."""
+    id: str
+    participants: List[AgentRole]
+    messages: List[Message]  # initial messages; kept as a MessageWindow
+    created_at: float
+    status: str = ACTIVE  # active, completed, archived
+    last_active: Optional[float] = None
+    # Messages kept in the window (None = unbounded)
+    max_messages: Optional[int] = 1000
+    # summarizer(digest, evicted) -> new digest entry (a Message)
+    summarizer: Optional[Callable[[Optional[Message], List[Message]], Message]] = field(
+        default=None, repr=False, compare=False
+    )
+    # Messages evicted (and summarized) at once when the window is full
+    summary_batch: int = 32
+    digest: Optional[Message] = None
+    # Set by ConversationStore to keep its status counters current
+    _on_status: Optional[Callable] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        initial = self.messages
+        self.messages = MessageWindow(
+            capacity=self.max_messages,
+            on_evict=self._summarize if self.summarizer is not None else None,
+            evict_batch=self.summary_batch if self.summarizer is not None else 1
+        )
+        for message in initial:
+            self.add_message(message)
+
+    def __setattr__(self, name, value):
+        if name == 'status':
+            listener = self.__dict__.get('_on_status')
+            previous = self.__dict__.get('status')
+            object.__setattr__(self, name, value)
+            if listener is not None and previous != value:
+                listener(self, previous)
+            return
+        object.__setattr__(self, name, value)
+
+    def add_message(self, message: Message):
+        """Add a message to the conversation."""
+        message.conversation_id = self.id
+        self.messages.append(message)
+
+    def get_context(self, limit: int = 10, include_digest: bool = True) -> ContextView:
+        """
+        Get recent messages for context.
+
+        Args:
+            limit: Newest messages to include
+            include_digest: Put the rolling digest of evicted messages (if
+                any) first; it does not count towards ``limit``
+
+        Returns:
+            Zero-copy, read-only sequence of messages, oldest first
+        """
+        return self.messages.view(limit, self.digest if include_digest else None)
+
+    @property
+    def message_count(self) -> int:
+        """Messages ever added, including those evicted from the window."""
+        return self.messages.total
+
+    def _summarize(self, evicted: List[Message]):
+        self.digest = self.summarizer(self.digest, evicted)
+
+
+@dataclass(frozen=True)
+class ArchivedConversation:
+    """What is kept of a conversation once its thread is archived."""
+    id: str
+    participants: Tuple[AgentRole, ...]
+    created_at: float
+    last_active: float
+    message_count: int
+    final_status: str
+
+
+class ConversationStore:
+    """Live conversation threads plus compact summaries of archived ones."""
+
+    def __init__(self, idle_ttl: Optional[float] = None,
+                 max_live: Optional[int] = 10000,
+                 max_archived: Optional[int] = 10000,
+                 on_archive: Optional[Callable[[ConversationThread], None]] = None,
+                 window: Optional[int] = 1000,
+                 summarizer: Optional[Callable[[Optional[Message], List[Message]], Message]] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            idle_ttl: Archive threads with no message for this many seconds
+                (None = no idle expiry)
+            max_live: Archive the least recently active threads beyond this
+                many (None = no limit)
+            max_archived: Archived summaries kept; the oldest are forgotten
+                beyond this many (None = no limit)
+            on_archive: Called with each thread just before it is archived
+                (e.g. to persist its messages)
+            window: Messages each thread keeps (None = unbounded); slots are
+                allocated as messages arrive, so ``max_live`` x ``window``
+                is a ceiling, not a reservation
+            summarizer: Rolling digest hook for messages leaving a thread's
+                window (see ConversationThread)
+            clock: Time source for activity tracking
+        """
+        if max_live is not None and max_live <= 0:
+            raise ValueError("max_live must be positive")
+        self.idle_ttl = idle_ttl
+        self.max_live = max_live
+        self.max_archived = max_archived
+        self.on_archive = on_archive
+        self.window = window
+        self.summarizer = summarizer
+        self._clock = clock
+        self._live: "OrderedDict[str, ConversationThread]" = OrderedDict()
+        self._archived: "OrderedDict[str, ArchivedConversation]" = OrderedDict()
+        self._counts: Counter = Counter()
+        self.archived_total = 0
+        self.forgotten = 0
+
+    # -- mapping protocol (live threads) ----------------------------------
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, conversation_id: str) -> bool:
+        return conversation_id in self._live or conversation_id in self._archived
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._live)
+
+    def __getitem__(self, conversation_id: str) -> ConversationThread:
+        return self._live[conversation_id]
+
+    def get(self, conversation_id: str) -> Optional[ConversationThread]:
+        """Live thread for ``conversation_id``, or None."""
+        return self._live.get(conversation_id)
+
+    def values(self):
+        """Live threads, least recently active first."""
+        return self._live.values()
+
+    def items(self):
+        """(id, thread) pairs of live threads, least recently active first."""
+        return self._live.items()
+
+    # -- writes -----------------------------------------------------------
+
+    def track(self, message: Message) -> ConversationThread:
+        """Add ``message`` to its conversation, creating or reviving the thread."""
+        now = self._clock()
+        conversation_id = message.conversation_id
+        thread = self._live.get(conversation_id)
+        if thread is None:
+            archived = self._archived.pop(conversation_id, None)
+            thread = ConversationThread(
+                id=conversation_id,
+                participants=(list(archived.participants) if archived is not None
+                              else [message.sender, *message.targets()]),
+                messages=[],
+                created_at=(archived.created_at if archived is not None
+                            else message.timestamp if message.timestamp is not None else now),
+                max_messages=self.window,
+                summarizer=self.summarizer
+            )
+            thread._on_status = self._status_changed
+            self._live[conversation_id] = thread
+            self._counts[thread.status] += 1
+        else:
+            self._live.move_to_end(conversation_id)
+        thread.last_active = now
+        thread.add_message(message)
+        self._enforce_limits(now)
+        return thread
+
+    def set_status(self, conversation_id: str, status: str) -> bool:
+        """Change a live thread's status; returns False if it is not live."""
+        thread = self._live.get(conversation_id)
+        if thread is None:
+            return False
+        thread.status = status
+        return True
+
+    def archive(self, conversation_id: str) -> Optional[ArchivedConversation]:
+        """Archive a live thread now; returns its summary (None if not live)."""
+        thread = self._live.get(conversation_id)
+        if thread is None:
+            return None
+        return self._archive(thread, thread.status)
+
+    def expire(self):
+        """Archive threads that have been idle for longer than ``idle_ttl``."""
+        self._enforce_limits(self._clock())
+
+    # -- queries ----------------------------------------------------------
+
+    def count(self, status: str) -> int:
+        """Number of conversations with ``status`` (O(1))."""
+        if status == ARCHIVED:
+            return len(self._archived)
+        return self._counts[status]
+
+    def get_archived(self, conversation_id: str) -> Optional[ArchivedConversation]:
+        """Summary of an archived conversation, or None."""
+        return self._archived.get(conversation_id)
+
+    def get_stats(self) -> Dict:
+        """Counts per status plus retention settings and counters."""
+        return {
+            'live': len(self._live),
+            'active': self._counts[ACTIVE],
+            'completed': self._counts[COMPLETED],
+            'archived': len(self._archived),
+            'archived_total': self.archived_total,
+            'forgotten': self.forgotten,
+            'idle_ttl': self.idle_ttl,
+            'max_live': self.max_live
+        }
+
+    # -- internals --------------------------------------------------------
+
+    def _status_changed(self, thread: ConversationThread, previous: str):
+        if self._live.get(thread.id) is not thread:
+            return
+        self._counts[previous] -= 1
+        if thread.status == ARCHIVED:
+            self._archive(thread, previous, counted=False)
+        else:
+            self._counts[thread.status] += 1
+
+    def _archive(self, thread: ConversationThread, final_status: str,
+                 counted: bool = True) -> ArchivedConversation:
+        if self.on_archive is not None:
+            self.on_archive(thread)
+        del self._live[thread.id]
+        if counted:
+            self._counts[thread.status] -= 1
+        summary = ArchivedConversation(
+            id=thread.id,
+            participants=tuple(thread.participants),
+            created_at=thread.created_at,
+            last_active=thread.last_active if thread.last_active is not None else thread.created_at,
+            message_count=thread.message_count,
+            final_status=final_status
+        )
+        thread._on_status = None
+        if thread.status != ARCHIVED:
+            thread.status = ARCHIVED
+        self._archived[thread.id] = summary
+        self.archived_total += 1
+        if self.max_archived is not None:
+            while len(self._archived) > self.max_archived:
+                self._archived.popitem(last=False)
+                self.forgotten += 1
+        return summary
+
+    def _enforce_limits(self, now: float):
+        live = self._live
+        if self.idle_ttl is not None:
+            cutoff = now - self.idle_ttl
+            while live:
+                thread = next(iter(live.values()))
+                if thread.last_active is None or thread.last_active > cutoff:
+                    break
+                self._archive(thread, thread.status)
+        if self.max_live is not None:
+            while len(live) > self.max_live:
+                thread = next(iter(live.values()))
+                self._archive(thread, thread.status)
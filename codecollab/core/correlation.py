@@ -0,0 +1,64 @@
+"""Request/response correlation for the Communication Hub.
+
+``send_request`` registers a future under the request's message id; when a
+message carrying ``metadata['response_to']`` flows through the hub the
+matching future is resolved with a single dict lookup. Entries are removed
+as soon as they resolve, time out or are cancelled, so the table only ever
+holds requests that are actually waiting.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+
+class CorrelationRegistry:
+    """Pending request futures keyed by request message id."""
+
+    def __init__(self):
+        self._pending: Dict[str, Tuple[asyncio.Future, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, request_id: str) -> bool:
+        return request_id in self._pending
+
+    def register(self, request_id: str, responder: Any) -> asyncio.Future:
+        """
+        Create the future a reply to ``request_id`` will resolve.
+
+        Args:
+            request_id: Id of the outgoing request message
+            responder: Role expected to send the reply
+
+        Returns:
+            Future resolved with the reply message
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (future, responder)
+        return future
+
+    def resolve(self, message: Any) -> bool:
+        """
+        Resolve the pending request ``message`` replies to, if any.
+
+        Returns:
+            True if a waiting request was resolved
+        """
+        request_id = message.get_meta('response_to')
+        if request_id is None:
+            return False
+        entry = self._pending.get(request_id)
+        if entry is None or entry[1] != message.sender:
+            return False
+        del self._pending[request_id]
+        future = entry[0]
+        if future.done():
+            return False
+        future.set_result(message)
+        return True
+
+    def discard(self, request_id: str) -> Optional[asyncio.Future]:
+        """Forget ``request_id`` (on timeout/cancellation); returns its future."""
+        entry = self._pending.pop(request_id, None)
+        return entry[0] if entry else None
@@ -0,0 +1,222 @@
+"""Delivery engine for the Communication Hub.
+
+Messages leaving the hub's ingress queue are handed to a ``DeliveryLane``
+per destination (one per ``AgentRole`` plus one for broadcast monitors).
+Each lane owns a single worker, so deliveries to the same destination stay
+in order while different destinations run concurrently and a slow handler
+only backs up its own lane. An optional ``max_concurrency`` caps the number
+of handlers running at once across all lanes, turning the per-lane workers
+into a bounded pool.
+
+A lane can also be switched to batch mode (``configure_lane``): its worker
+then takes everything queued for the destination, up to ``batch_size``
+messages, and hands it over in a single ``deliver_batch`` call.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+from codecollab.core.scheduler import PriorityScheduler
+
+logger = logging.getLogger(__name__)
+
+# Lane key used for subscribe_to_all() monitors
+BROADCAST_LANE = "broadcast"
+
+
+class DeliveryLane:
+    """Ordered delivery queue and worker for a single destination."""
+
+    def __init__(self, key: Hashable, queue: PriorityScheduler):
+        self.key = key
+        self.queue = queue
+        self.task: Optional[asyncio.Task] = None
+        self.batch_size: Optional[int] = None
+        self.in_flight = 0
+        self.delivered = 0
+        self.failed = 0
+
+    @property
+    def name(self) -> str:
+        """Human-readable lane name (role value for agent lanes)."""
+        return getattr(self.key, 'value', str(self.key))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Pending/in-flight/delivered/failed counters for this lane."""
+        return {
+            'pending': self.queue.qsize(),
+            'in_flight': self.in_flight,
+            'delivered': self.delivered,
+            'failed': self.failed
+        }
+
+
+class DeliveryEngine:
+    """
+    Runs one ordered worker per destination lane.
+
+    The engine is transport-agnostic: ``deliver(key, message)`` performs the
+    actual hand-off (looking up the subscriber for ``key``) and
+    ``on_error(key, message, error)`` is told about handler failures.
+    Lanes in batch mode use ``deliver_batch(key, messages)`` instead.
+    """
+
+    def __init__(self, deliver: Callable[[Hashable, Any], Awaitable[None]],
+                 levels: Iterable[int],
+                 on_error: Optional[Callable[[Hashable, Any, Exception], None]] = None,
+                 aging_threshold: Optional[float] = 5.0,
+                 max_concurrency: Optional[int] = None,
+                 deliver_batch: Optional[Callable[[Hashable, List[Any]], Awaitable[None]]] = None):
+        """
+        Args:
+            deliver: Coroutine function delivering a message to a lane key
+            levels: Priority levels used by the per-lane schedulers
+            on_error: Called when ``deliver`` raises
+            aging_threshold: Starvation guard passed to each lane scheduler
+            max_concurrency: Cap on concurrent deliveries across all lanes
+                (None = one per lane, unbounded)
+            deliver_batch: Coroutine function delivering a list of messages
+                to a lane key (required for batch-mode lanes)
+        """
+        self._deliver = deliver
+        self._deliver_batch = deliver_batch
+        self._on_error = on_error
+        self._levels = tuple(levels)
+        self._aging_threshold = aging_threshold
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.lanes: Dict[Hashable, DeliveryLane] = {}
+        self.is_running = False
+
+    def start(self):
+        """Allow lane workers to run (workers are created lazily per lane)."""
+        if self.is_running:
+            return
+        self.is_running = True
+        for lane in self.lanes.values():
+            self._start_worker(lane)
+
+    async def stop(self):
+        """Cancel all lane workers. Undelivered messages stay queued."""
+        self.is_running = False
+        tasks = [lane.task for lane in self.lanes.values() if lane.task]
+        for task in tasks:
+            task.cancel()
+        for lane in self.lanes.values():
+            lane.task = None
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def submit(self, key: Hashable, message: Any, priority: int):
+        """Queue ``message`` on the lane for ``key``."""
+        lane = self.lanes.get(key)
+        if lane is None:
+            lane = self._create_lane(key)
+        lane.queue.put_nowait(message, priority)
+
+    def configure_lane(self, key: Hashable, batch_size: Optional[int] = None):
+        """
+        Set how the lane for ``key`` hands messages over.
+
+        Args:
+            key: Lane key
+            batch_size: Deliver up to this many queued messages per call
+                (None = one message per call)
+        """
+        if batch_size is not None:
+            if batch_size < 1:
+                raise ValueError("batch_size must be at least 1")
+            if self._deliver_batch is None:
+                raise ValueError("DeliveryEngine has no deliver_batch callback")
+        lane = self.lanes.get(key)
+        if lane is None:
+            if batch_size is None:
+                return
+            lane = self._create_lane(key)
+        lane.batch_size = batch_size
+
+    async def join(self):
+        """Wait until every message submitted so far has been handled."""
+        for lane in list(self.lanes.values()):
+            await lane.queue.join()
+
+    def pending(self) -> int:
+        """Messages waiting in lanes (not yet handed to a handler)."""
+        return sum(lane.queue.qsize() for lane in self.lanes.values())
+
+    def in_flight(self) -> Dict[str, int]:
+        """Handlers currently running, per lane."""
+        return {lane.name: lane.in_flight for lane in self.lanes.values()}
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-lane delivery counters, keyed by lane name."""
+        return {lane.name: lane.get_stats() for lane in self.lanes.values()}
+
+    def _create_lane(self, key: Hashable) -> DeliveryLane:
+        lane = DeliveryLane(key, PriorityScheduler(
+            levels=self._levels,
+            aging_threshold=self._aging_threshold
+        ))
+        self.lanes[key] = lane
+        if self.is_running:
+            self._start_worker(lane)
+        return lane
+
+    def _start_worker(self, lane: DeliveryLane):
+        if lane.task is None or lane.task.done():
+            lane.task = asyncio.create_task(self._run_lane(lane))
+
+    async def _run_lane(self, lane: DeliveryLane):
+        """Deliver messages for one lane, strictly in order."""
+        while True:
+            if lane.batch_size is not None:
+                messages = await lane.queue.get_batch(lane.batch_size)
+                await self._run_batch(lane, messages)
+            else:
+                message = await lane.queue.get()
+                await self._run_one(lane, message)
+
+    async def _run_one(self, lane: DeliveryLane, message: Any):
+        lane.in_flight += 1
+        try:
+            if self._semaphore is not None:
+                async with self._semaphore:
+                    await self._deliver(lane.key, message)
+            else:
+                await self._deliver(lane.key, message)
+            lane.delivered += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            lane.failed += 1
+            self._report_error(lane, message, e)
+        finally:
+            lane.in_flight -= 1
+            lane.queue.task_done()
+
+    async def _run_batch(self, lane: DeliveryLane, messages: List[Any]):
+        count = len(messages)
+        lane.in_flight += count
+        try:
+            if self._semaphore is not None:
+                async with self._semaphore:
+                    await self._deliver_batch(lane.key, messages)
+            else:
+                await self._deliver_batch(lane.key, messages)
+            lane.delivered += count
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            lane.failed += count
+            for message in messages:
+                self._report_error(lane, message, e)
+        finally:
+            lane.in_flight -= count
+            for _ in range(count):
+                lane.queue.task_done()
+
+    def _report_error(self, lane: DeliveryLane, message: Any, error: Exception):
+        if self._on_error is not None:
+            self._on_error(lane.key, message, error)
+        else:
+            logger.error(f"❌ Delivery to {lane.name} failed: {error}")
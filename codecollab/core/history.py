@@ -0,0 +1,186 @@
+"""Bounded, indexed message history for the Communication Hub.
+
+``MessageHistory`` keeps the most recent messages in a ring buffer bounded
+by count and/or age, with secondary indexes by (sender, recipient) pair,
+conversation id and message type. Because retention is strictly oldest
+first, an evicted message is always at the head of every index it appears
+in, so eviction is O(1) per index and queries only touch the entries they
+return. A multicast message is stored once and indexed under the pair for
+each of its recipients.
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# (sequence, appended_at, message, conversation_id)
+_Entry = Tuple[int, float, Any, Optional[str]]
+
+
+class MessageHistory:
+    """Ring-buffer message store with O(k) indexed lookups."""
+
+    def __init__(self, max_messages: Optional[int] = 10000,
+                 max_age: Optional[float] = None,
+                 on_evict: Optional[Callable[[Any], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            max_messages: Retain at most this many messages (None = no limit)
+            max_age: Drop messages recorded more than this many seconds ago
+                (None = no age limit)
+            on_evict: Called with each message as it leaves the buffer
+            clock: Time source used for age-based retention
+        """
+        if max_messages is not None and max_messages <= 0:
+            raise ValueError("max_messages must be positive")
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self.on_evict = on_evict
+        self._clock = clock
+        self._sequence = itertools.count()
+        self._entries: Deque[_Entry] = deque()
+        self._by_pair: Dict[Tuple[Hashable, Hashable], Deque[_Entry]] = {}
+        self._by_conversation: Dict[str, Deque[_Entry]] = {}
+        self._by_type: Dict[Hashable, Deque[_Entry]] = {}
+        self.evicted = 0
+
+    # -- sequence protocol ------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (entry[2] for entry in self._entries)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._entries[index][2]
+
+    # -- writes -----------------------------------------------------------
+
+    def append(self, message: Any):
+        """Record ``message``, evicting whatever falls outside retention."""
+        now = self._clock()
+        self._record(message, now)
+        self._enforce_retention(now)
+
+    def extend(self, messages: Iterable[Any]):
+        """Record several messages, applying retention once at the end."""
+        now = self._clock()
+        for message in messages:
+            self._record(message, now)
+        self._enforce_retention(now)
+
+    def expire(self):
+        """Apply age-based retention without recording a message."""
+        self._enforce_retention(self._clock())
+
+    def clear(self):
+        """Drop all history (without calling ``on_evict``)."""
+        self._entries.clear()
+        self._by_pair.clear()
+        self._by_conversation.clear()
+        self._by_type.clear()
+
+    # -- queries ----------------------------------------------------------
+
+    def between(self, agent1: Hashable, agent2: Hashable, limit: int = 50) -> List[Any]:
+        """Last ``limit`` messages exchanged between two agents, oldest first."""
+        forward = self._by_pair.get((agent1, agent2))
+        backward = self._by_pair.get((agent2, agent1)) if agent1 != agent2 else None
+        if not backward:
+            return self._tail(forward, limit)
+        if not forward:
+            return self._tail(backward, limit)
+        newest_first = heapq.merge(
+            reversed(forward), reversed(backward), key=lambda e: e[0], reverse=True
+        )
+        result = [entry[2] for entry in itertools.islice(newest_first, limit)]
+        result.reverse()
+        return result
+
+    def by_pair(self, sender: Hashable, recipient: Hashable,
+                limit: Optional[int] = None) -> List[Any]:
+        """Messages sent from ``sender`` to ``recipient``, oldest first."""
+        return self._tail(self._by_pair.get((sender, recipient)), limit)
+
+    def by_conversation(self, conversation_id: str, limit: Optional[int] = None) -> List[Any]:
+        """Messages in a conversation, oldest first."""
+        return self._tail(self._by_conversation.get(conversation_id), limit)
+
+    def by_type(self, message_type: Hashable, limit: Optional[int] = None) -> List[Any]:
+        """Messages of a given type, oldest first."""
+        return self._tail(self._by_type.get(message_type), limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retention settings and current size."""
+        return {
+            'size': len(self._entries),
+            'max_messages': self.max_messages,
+            'max_age': self.max_age,
+            'evicted': self.evicted,
+            'conversations_indexed': len(self._by_conversation)
+        }
+
+    # -- internals --------------------------------------------------------
+
+    def _record(self, message: Any, now: float):
+        entry = (next(self._sequence), now, message, message.conversation_id)
+        self._entries.append(entry)
+        for recipient in message.targets():
+            self._index(self._by_pair, (message.sender, recipient), entry)
+        if entry[3] is not None:
+            self._index(self._by_conversation, entry[3], entry)
+        self._index(self._by_type, message.message_type, entry)
+
+    @staticmethod
+    def _index(index: Dict[Hashable, Deque[_Entry]], key: Hashable, entry: _Entry):
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = deque()
+        bucket.append(entry)
+
+    @staticmethod
+    def _unindex(index: Dict[Hashable, Deque[_Entry]], key: Hashable):
+        bucket = index[key]
+        bucket.popleft()
+        if not bucket:
+            del index[key]
+
+    @staticmethod
+    def _tail(bucket: Optional[Deque[_Entry]], limit: Optional[int]) -> List[Any]:
+        if not bucket:
+            return []
+        if limit is None or limit >= len(bucket):
+            return [entry[2] for entry in bucket]
+        if limit <= 0:
+            return []
+        result = [entry[2] for entry in itertools.islice(reversed(bucket), limit)]
+        result.reverse()
+        return result
+
+    def _enforce_retention(self, now: float):
+        entries = self._entries
+        if self.max_messages is not None:
+            while len(entries) > self.max_messages:
+                self._evict_oldest()
+        if self.max_age is not None:
+            cutoff = now - self.max_age
+            while entries and entries[0][1] < cutoff:
+                self._evict_oldest()
+
+    def _evict_oldest(self):
+        _, _, message, conversation_id = self._entries.popleft()
+        for recipient in message.targets():
+            self._unindex(self._by_pair, (message.sender, recipient))
+        if conversation_id is not None:
+            self._unindex(self._by_conversation, conversation_id)
+        self._unindex(self._by_type, message.message_type)
+        self.evicted += 1
+        if self.on_evict is not None:
+            self.on_evict(message)
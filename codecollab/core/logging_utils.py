@@ -0,0 +1,262 @@
+"""Hot-path logging for the hub, agents and tools.
+
+Library modules never configure logging on import. Per-message events go
+through an ``EventLogger``, which:
+
+- checks ``isEnabledFor`` before doing anything else, so a disabled level
+  costs one call
+- passes %-style arguments to the stdlib logger, so the message string is
+  only built if a handler actually formats the record
+- samples each named event (keep 1 in N) through the shared ``sampler``
+
+``configure_logging`` is the opt-in setup for applications. It puts a
+``QueueHandler`` on the ``codecollab`` logger and starts a
+``BatchingLogListener`` thread that formats queued records (as text or JSON
+lines) and writes them in batches, so formatting and I/O happen off the
+event loop.
+"""
+
+import itertools
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler
+from typing import IO, Any, Dict, List, Optional
+
+ROOT_LOGGER = "codecollab"
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class LogSampler:
+    """Keeps 1 in N occurrences of each named event."""
+
+    def __init__(self, rate: float = 1.0, event_rates: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            rate: Default fraction of events kept (0.0-1.0)
+            event_rates: Per-event overrides of ``rate``
+        """
+        self._counters: Dict[str, itertools.count] = {}
+        self.configure(rate, event_rates)
+
+    def configure(self, rate: float = 1.0, event_rates: Optional[Dict[str, float]] = None):
+        """Replace the sampling rates and restart all counters."""
+        self._default = self._interval(rate)
+        self._intervals = {event: self._interval(r) for event, r in (event_rates or {}).items()}
+        self._counters.clear()
+
+    def sample(self, event: str) -> bool:
+        """True if this occurrence of ``event`` should be logged."""
+        interval = self._intervals.get(event, self._default)
+        if interval == 1:
+            return True
+        if interval == 0:
+            return False
+        counter = self._counters.get(event)
+        if counter is None:
+            counter = self._counters[event] = itertools.count()
+        return next(counter) % interval == 0
+
+    @staticmethod
+    def _interval(rate: float) -> int:
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sample rate must be between 0 and 1, got {rate}")
+        return 0 if rate == 0.0 else max(1, round(1.0 / rate))
+
+
+# Shared by every EventLogger; adjusted through configure_logging()
+sampler = LogSampler()
+
+
+class EventLogger:
+    """Lazy, sampled logging of named per-message events."""
+
+    __slots__ = ('logger',)
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def debug(self, event: str, msg: str, *args: Any, **fields: Any):
+        """Log ``event`` at DEBUG (see ``log``)."""
+        self.log(logging.DEBUG, event, msg, *args, **fields)
+
+    def info(self, event: str, msg: str, *args: Any, **fields: Any):
+        """Log ``event`` at INFO (see ``log``)."""
+        self.log(logging.INFO, event, msg, *args, **fields)
+
+    def log(self, level: int, event: str, msg: str, *args: Any, **fields: Any):
+        """
+        Log a sampled event.
+
+        Args:
+            level: Logging level
+            event: Event name used for sampling and structured output
+            msg: %-style format string, only rendered if the record is emitted
+            *args: Arguments for ``msg``
+            **fields: Extra structured fields (JSON output only)
+        """
+        if not self.logger.isEnabledFor(level) or not sampler.sample(event):
+            return
+        self.logger.log(level, msg, *args, extra={'event': event, 'fields': fields})
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including the event name and fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        event = getattr(record, 'event', None)
+        if event is not None:
+            entry['event'] = event
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stdlib version renders the message here, on the logging thread;
+        # only tracebacks need to be captured before the frames go away.
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class BatchingLogListener:
+    """Background thread that formats queued records and writes them in batches."""
+
+    _STOP = object()
+
+    def __init__(self, records: "queue.SimpleQueue", stream: IO[str],
+                 formatter: logging.Formatter, max_batch: int = 512):
+        """
+        Args:
+            records: Queue fed by the ``QueueHandler``
+            stream: Text stream the formatted lines are written to
+            formatter: Formats each record
+            max_batch: Records written per ``write``/``flush``
+        """
+        self.records = records
+        self.stream = stream
+        self.formatter = formatter
+        self.max_batch = max_batch
+        self.written = 0
+        self.batches = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the writer thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="codecollab-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Write everything already queued, then stop the thread."""
+        if self._thread is not None:
+            self.records.put(self._STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        records = self.records
+        while True:
+            batch: List[logging.LogRecord] = [records.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(records.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = False
+            lines = []
+            for record in batch:
+                if record is self._STOP:
+                    stopping = True
+                    continue
+                try:
+                    lines.append(self.formatter.format(record))
+                except Exception:
+                    lines.append(f"<unformattable log record from {record.name}>")
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except Exception:
+                    pass
+                self.written += len(lines)
+                self.batches += 1
+            if stopping:
+                return
+
+
+_listener: Optional[BatchingLogListener] = None
+_handler: Optional[logging.Handler] = None
+_previous_level = logging.NOTSET
+
+
+def configure_logging(level: int = logging.INFO, sample_rate: float = 1.0,
+                      event_rates: Optional[Dict[str, float]] = None,
+                      structured: bool = False, stream: Optional[IO[str]] = None,
+                      max_batch: int = 512) -> BatchingLogListener:
+    """
+    Route ``codecollab`` logs through a background writer thread.
+
+    Calling it again replaces the previous configuration.
+
+    Args:
+        level: Level of the ``codecollab`` logger
+        sample_rate: Fraction of per-message events kept
+        event_rates: Per-event overrides of ``sample_rate``
+        structured: Write JSON lines instead of text
+        stream: Destination (defaults to stderr)
+        max_batch: Records written per batch
+
+    Returns:
+        The running listener (stopped by ``shutdown_logging``)
+    """
+    global _listener, _handler, _previous_level
+    shutdown_logging()
+
+    sampler.configure(sample_rate, event_rates)
+    formatter = JsonFormatter() if structured else logging.Formatter(TEXT_FORMAT)
+    records: "queue.SimpleQueue" = queue.SimpleQueue()
+    _listener = BatchingLogListener(records, stream or sys.stderr, formatter, max_batch)
+    _handler = _DeferredQueueHandler(records)
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    _previous_level = logger.level
+    logger.setLevel(level)
+    logger.addHandler(_handler)
+    logger.propagate = False
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush and stop the writer thread started by ``configure_logging``."""
+    global _listener, _handler
+    if _handler is not None:
+        logger = logging.getLogger(ROOT_LOGGER)
+        logger.removeHandler(_handler)
+        logger.setLevel(_previous_level)
+        logger.propagate = True
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
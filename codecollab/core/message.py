@@ -0,0 +1,213 @@
+"""Message types for CodeCollab AI agent communication.
+
+Defines the roles, message types, priorities and the ``Message`` record
+exchanged through the Communication Hub. Kept separate from the hub so that
+codecs, storage and transports can depend on the message format without
+importing the hub itself.
+"""
+
+import copy
+import itertools
+import time
+import uuid
+from typing import Dict, FrozenSet, Iterable, Optional, Any
+from enum import Enum
+
+
+class AgentRole(Enum):
+    """Defines the roles agents can take in the system."""
+    PRODUCT_MANAGER = "pm"
+    DEVELOPER = "dev" 
+    REVIEWER = "reviewer"
+    TESTER = "tester"
+    ORCHESTRATOR = "orchestrator"
+
+
+class MessageType(Enum):
+    """Types of messages that can be sent between agents."""
+    TASK_REQUEST = "task_request"
+    TASK_RESPONSE = "task_response"
+    COLLABORATION_REQUEST = "collaboration_request"
+    STATUS_UPDATE = "status_update"
+    ERROR_REPORT = "error_report"
+    NEGOTIATION = "negotiation"
+    CONSENSUS = "consensus"
+
+
+class MessagePriority(Enum):
+    """Message priority levels."""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    URGENT = 4
+
+
+# Message ids: a random per-process prefix plus a monotonic counter. Unique
+# across processes like uuid4, but far cheaper to generate per message.
+_ID_PREFIX = uuid.uuid4().hex[:12]
+_id_counter = itertools.count(1)
+
+
+# Metadata key holding a message's absolute deadline (``time.time()`` seconds).
+# The hub drops a message whose deadline has passed instead of delivering it.
+# Hub-private so it cannot clash with application metadata such as 'deadline'.
+DEADLINE = '_hub_deadline'
+
+
+def generate_id() -> str:
+    """Return a new unique message/conversation id."""
+    return f"{_ID_PREFIX}-{next(_id_counter):x}"
+
+
+class Message:
+    """
+    Core message structure for agent communication.
+    
+    A slotted class rather than a dataclass: messages are the hub's hottest
+    allocation, so instances carry no ``__dict__`` and the metadata dict is
+    only allocated when something is stored in (or read through) ``metadata``.
+    Hot paths should use ``get_meta`` to read a key without allocating.
+    
+    A message with ``recipients`` set is a multicast: the hub delivers the
+    same instance to every role in the set (treat it as read-only in
+    handlers) and by convention its ``recipient`` is the sender.
+    """
+    __slots__ = (
+        'sender', 'recipient', 'message_type', 'content', 'id', 'priority',
+        'timestamp', '_metadata', 'requires_response', 'conversation_id',
+        'recipients', '_trace', '__weakref__'
+    )
+    # ``_trace`` is hub-internal (stage timestamps while HubMetrics is on);
+    # it is never initialised here, serialised or compared
+    
+    def __init__(self, sender: AgentRole, recipient: AgentRole,
+                 message_type: MessageType, content: str,
+                 id: Optional[str] = None,
+                 priority: MessagePriority = MessagePriority.MEDIUM,
+                 timestamp: Optional[float] = None,
+                 metadata: Optional[Dict[str, Any]] = None,
+                 requires_response: bool = False,
+                 conversation_id: Optional[str] = None,
+                 recipients: Optional[Iterable[AgentRole]] = None):
+        self.sender = sender
+        self.recipient = recipient
+        self.message_type = message_type
+        self.content = content
+        self.id = id if id is not None else generate_id()
+        self.priority = priority
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self._metadata = metadata
+        self.requires_response = requires_response
+        self.conversation_id = conversation_id if conversation_id is not None else generate_id()
+        self.recipients: Optional[FrozenSet[AgentRole]] = (
+            frozenset(recipients) if recipients is not None else None
+        )
+    
+    @property
+    def is_multicast(self) -> bool:
+        """True if this message is addressed to a set of recipients."""
+        return self.recipients is not None
+    
+    def targets(self) -> Iterable[AgentRole]:
+        """Roles this message should be delivered to."""
+        recipients = self.recipients
+        return recipients if recipients is not None else (self.recipient,)
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Message metadata; always a dict (allocated on first access)."""
+        meta = self._metadata
+        if meta is None:
+            meta = self._metadata = {}
+        return meta
+    
+    @metadata.setter
+    def metadata(self, value: Optional[Dict[str, Any]]):
+        self._metadata = value
+    
+    @property
+    def has_metadata(self) -> bool:
+        """True if any metadata is set (does not allocate)."""
+        return bool(self._metadata)
+    
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        """Read a metadata key without allocating an empty metadata dict."""
+        meta = self._metadata
+        if not meta:
+            return default
+        return meta.get(key, default)
+    
+    @property
+    def deadline(self) -> Optional[float]:
+        """Absolute deadline (``time.time()`` seconds) from the metadata, if any."""
+        deadline = self.get_meta(DEADLINE)
+        if isinstance(deadline, (int, float)) and not isinstance(deadline, bool):
+            return deadline
+        return None  # absent, or not a number (ignored)
+    
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """True if the message has a deadline and it has passed."""
+        deadline = self.deadline
+        if deadline is None:
+            return False
+        return (time.time() if now is None else now) >= deadline
+    
+    def _fields(self) -> tuple:
+        return (
+            self.sender, self.recipient, self.message_type, self.content,
+            self.id, self.priority, self.timestamp, self._metadata or {},
+            self.requires_response, self.conversation_id, self.recipients
+        )
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"Message(sender={self.sender!r}, recipient={self.recipient!r}, "
+            f"message_type={self.message_type!r}, content={self.content!r}, "
+            f"id={self.id!r}, priority={self.priority!r}, timestamp={self.timestamp!r}, "
+            f"metadata={self._metadata or {}!r}, requires_response={self.requires_response!r}, "
+            f"conversation_id={self.conversation_id!r}, recipients={self.recipients!r})"
+        )
+    
+    def to_dict(self) -> Dict:
+        """Convert message to dictionary for serialization."""
+        data = {
+            'sender': self.sender.value,
+            'recipient': self.recipient.value,
+            'message_type': self.message_type.value,
+            'content': self.content,
+            'id': self.id,
+            'priority': self.priority.value,
+            'timestamp': self.timestamp,
+            'metadata': copy.deepcopy(self._metadata) if self._metadata else {},
+            'requires_response': self.requires_response,
+            'conversation_id': self.conversation_id
+        }
+        if self.recipients is not None:
+            data['recipients'] = sorted(role.value for role in self.recipients)
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Message':
+        """Create message from dictionary."""
+        meta = data.get('metadata')
+        recipients = data.get('recipients')
+        return cls(
+            id=data['id'],
+            sender=AgentRole(data['sender']),
+            recipient=AgentRole(data['recipient']),
+            message_type=MessageType(data['message_type']),
+            content=data['content'],
+            priority=MessagePriority(data['priority']),
+            timestamp=data['timestamp'],
+            metadata=meta if isinstance(meta, dict) else None,
+            requires_response=data.get('requires_response', False),
+            conversation_id=data.get('conversation_id'),
+            recipients=[AgentRole(r) for r in recipients] if recipients is not None else None
+        )
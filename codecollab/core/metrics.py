@@ -0,0 +1,287 @@
+"""Latency instrumentation for the Communication Hub.
+
+``HubMetrics`` times every delivery through four stages::
+
+    queue_wait  send_message() -> dispatcher picks the message up
+    lane_wait   dispatcher -> the recipient's lane starts the handler
+    handler     handler running
+    total       send_message() -> handler finished
+
+Each stage is recorded into a ``LatencyHistogram`` per (recipient role,
+message type, priority). Per-dimension views are merged from these at
+snapshot time, so a delivery costs one dictionary lookup and one bucket
+increment per stage. The
+result can be exported as a JSON snapshot or in the Prometheus text format.
+
+Instrumentation is off unless a ``HubMetrics`` is passed to the hub. When
+off, the only cost is an ``is None`` check at each stage.
+"""
+
+import json
+import math
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from codecollab.core.message import AgentRole, Message, MessagePriority, MessageType
+
+STAGES = ('queue_wait', 'lane_wait', 'handler', 'total')
+
+# Dimensions of a histogram key, in key order
+DIMENSIONS = ('recipient', 'message_type', 'priority')
+
+# Upper bounds (seconds) of the buckets exported to Prometheus
+PROMETHEUS_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+class LatencyHistogram:
+    """
+    Log-linear (HDR-style) histogram of durations.
+
+    Values are counted in whole microseconds. Below ``2 ** precision_bits``
+    each microsecond has its own bucket. Above that, every power of two is
+    split into ``2 ** (precision_bits - 1)`` equal buckets, which bounds the
+    relative error at ``2 ** -(precision_bits - 1)`` (1.6% for the default).
+    Recording is a few integer operations and one list increment, and memory
+    stays fixed whatever the number of samples.
+    """
+
+    def __init__(self, precision_bits: int = 7, max_seconds: float = 3600.0):
+        """
+        Args:
+            precision_bits: Sub-bucket resolution (see class docstring)
+            max_seconds: Largest trackable value; longer durations are
+                clamped to it
+        """
+        if precision_bits < 2:
+            raise ValueError("precision_bits must be at least 2")
+        self.precision_bits = precision_bits
+        self._sub_count = 1 << precision_bits
+        self._half_count = self._sub_count >> 1
+        self._max_value = int(max_seconds * 1_000_000)
+        self._counts = [0] * (self._index(self._max_value) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, seconds: float):
+        """Record one duration."""
+        value = int(seconds * 1_000_000)
+        if value < self._sub_count:
+            self._counts[value if value > 0 else 0] += 1
+        else:
+            if value > self._max_value:
+                value = self._max_value
+            exponent = value.bit_length() - self.precision_bits
+            self._counts[exponent * self._half_count + (value >> exponent)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add the samples of a histogram with the same configuration."""
+        if len(other._counts) != len(self._counts):
+            raise ValueError("Cannot merge histograms with different configurations")
+        counts = self._counts
+        for index, count in enumerate(other._counts):
+            if count:
+                counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """
+        Duration at or below which ``pct`` percent of samples fall.
+
+        Returns the upper edge of the bucket holding that rank (clamped to
+        the largest recorded value), in seconds; 0.0 when empty.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                upper = (self._lower_bound(index + 1) - 1) / 1_000_000
+                return min(upper, self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: Sequence[float]) -> List[int]:
+        """Samples at or below each bound (seconds, ascending), bucket-resolved."""
+        result = []
+        seen = 0
+        index = 0
+        last = len(self._counts)
+        for bound in bounds:
+            limit = int(bound * 1_000_000)
+            while index < last and self._lower_bound(index + 1) - 1 <= limit:
+                seen += self._counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def snapshot(self) -> Dict[str, float]:
+        """Count plus mean/percentiles/max in milliseconds."""
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000,
+            'min_ms': self.min * 1000,
+            'p50_ms': self.percentile(50) * 1000,
+            'p90_ms': self.percentile(90) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'p999_ms': self.percentile(99.9) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+    def _index(self, value: int) -> int:
+        # For value >= 2 ** p this equals 2 ** p + (exponent - 1) * half
+        # + (mantissa - half), since 2 ** p == 2 * half
+        exponent = max(0, value.bit_length() - self.precision_bits)
+        return exponent * self._half_count + (value >> exponent)
+
+    def _lower_bound(self, index: int) -> int:
+        if index < self._sub_count:
+            return index
+        exponent, offset = divmod(index - self._sub_count, self._half_count)
+        return (offset + self._half_count) << (exponent + 1)
+
+
+_HistogramKey = Tuple[AgentRole, MessageType, MessagePriority]
+
+
+class HubMetrics:
+    """Per-stage delivery latency histograms for a CommunicationHub."""
+
+    def __init__(self, precision_bits: int = 7):
+        """
+        Args:
+            precision_bits: Resolution of each LatencyHistogram
+        """
+        self.precision_bits = precision_bits
+        # Key -> one histogram per stage, in STAGES order
+        self._histograms: Dict[_HistogramKey, List[LatencyHistogram]] = {}
+
+    def record_delivery(self, recipient: AgentRole, message: Message,
+                        enqueued: float, dispatched: float, started: float, finished: float):
+        """
+        Record the stage timings of one delivery (``perf_counter`` seconds).
+
+        Args:
+            recipient: Role the message was delivered to
+            message: Delivered message
+            enqueued: When send_message queued it
+            dispatched: When the dispatcher handed it to the lane
+            started: When the handler was called
+            finished: When the handler returned
+        """
+        key = (recipient, message.message_type, message.priority)
+        row = self._histograms.get(key)
+        if row is None:
+            row = self._histograms[key] = [LatencyHistogram(self.precision_bits) for _ in STAGES]
+        queue_wait, lane_wait, handler, total = row
+        queue_wait.record(dispatched - enqueued)
+        lane_wait.record(started - dispatched)
+        handler.record(finished - started)
+        total.record(finished - enqueued)
+
+    def histogram(self, stage: str, recipient: Optional[AgentRole] = None,
+                  message_type: Optional[MessageType] = None,
+                  priority: Optional[MessagePriority] = None) -> LatencyHistogram:
+        """Merged histogram for ``stage``, optionally filtered by dimension."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        position = STAGES.index(stage)
+        merged = LatencyHistogram(self.precision_bits)
+        for (key_recipient, key_type, key_priority), row in self._histograms.items():
+            if recipient is not None and key_recipient != recipient:
+                continue
+            if message_type is not None and key_type != message_type:
+                continue
+            if priority is not None and key_priority != priority:
+                continue
+            merged.merge(row[position])
+        return merged
+
+    def reset(self):
+        """Drop every recorded sample."""
+        self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Percentile summaries per stage, overall and per dimension value.
+
+        Returns:
+            ``{stage: {'all': {...}, 'recipient': {role: {...}},
+            'message_type': {...}, 'priority': {...}}}``
+        """
+        result = {}
+        for position, stage in enumerate(STAGES):
+            overall = LatencyHistogram(self.precision_bits)
+            views = {dimension: {} for dimension in DIMENSIONS}
+            for key, row in self._histograms.items():
+                histogram = row[position]
+                overall.merge(histogram)
+                for dimension, value in zip(DIMENSIONS, key):
+                    label = _label(value)
+                    view = views[dimension].get(label)
+                    if view is None:
+                        view = views[dimension][label] = LatencyHistogram(self.precision_bits)
+                    view.merge(histogram)
+            result[stage] = {'all': overall.snapshot()}
+            for dimension, histograms in views.items():
+                result[stage][dimension] = {
+                    label: histogram.snapshot() for label, histogram in sorted(histograms.items())
+                }
+        return result
+
+    def to_json(self) -> str:
+        """The snapshot as a JSON document."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix: str = "codecollab_hub",
+                      buckets: Iterable[float] = PROMETHEUS_BUCKETS) -> str:
+        """
+        Render the histograms in the Prometheus text exposition format.
+
+        One histogram metric per stage (``<prefix>_<stage>_seconds``) with
+        ``recipient``, ``message_type`` and ``priority`` labels; aggregate
+        across labels in PromQL.
+        """
+        bounds = list(buckets)
+        lines = []
+        keys = sorted(self._histograms, key=lambda k: tuple(map(_label, k)))
+        for position, stage in enumerate(STAGES):
+            name = f"{prefix}_{stage}_seconds"
+            lines.append(f"# HELP {name} Hub delivery latency, {stage.replace('_', ' ')} stage")
+            lines.append(f"# TYPE {name} histogram")
+            for key in keys:
+                histogram = self._histograms[key][position]
+                labels = ",".join(
+                    f'{dimension}="{_label(value)}"' for dimension, value in zip(DIMENSIONS, key)
+                )
+                for bound, count in zip(bounds, histogram.cumulative_counts(bounds)):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{{labels}}} {histogram.total:.9g}')
+                lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: Hashable) -> str:
+    """Export label for an enum member (name for priorities, value otherwise)."""
+    if isinstance(value, MessagePriority):
+        return value.name
+    return getattr(value, 'value', str(value))
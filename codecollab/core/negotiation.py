@@ -0,0 +1,437 @@
+"""Negotiation engine for the Communication Hub.
+
+A negotiation runs in rounds. During a round participants submit
+proposals and vote for one of them. Each participant holds one vote per
+round and may move it. Tallies are kept incrementally: weight per
+proposal, weight cast and the current leader. So deciding a round after a
+vote is O(1), however many proposals and votes there are.
+
+Consensus modes:
+
+- ``majority``: a proposal wins with more than ``threshold`` (default half)
+  of all participants
+- ``weighted``: like majority, counting each participant's ``weights``
+  entry instead of one
+- ``quorum``: once at least ``quorum`` participants have voted, a proposal
+  wins with more than ``threshold`` of the weight cast
+
+A round that has every vote in without a winner, or whose
+``round_timeout`` passes, moves on to the next round with fresh proposals.
+After ``max_rounds`` the negotiation fails. Finished negotiations leave
+``active`` and are kept as small ``NegotiationOutcome`` records; the
+oldest are forgotten beyond ``max_finished``.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from codecollab.core.message import AgentRole
+
+MAJORITY = "majority"
+WEIGHTED = "weighted"
+QUORUM = "quorum"
+CONSENSUS_MODES = (MAJORITY, WEIGHTED, QUORUM)
+
+ACTIVE = "active"
+AGREED = "agreed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class NegotiationError(Exception):
+    """Raised for operations on unknown or finished negotiations, or by non-participants."""
+
+
+@dataclass
+class Proposal:
+    """A participant's proposal in one negotiation round."""
+    id: str
+    proposer: AgentRole
+    content: str
+    round: int
+    data: Dict = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class NegotiationOutcome:
+    """What is kept of a negotiation once it has finished."""
+    id: str
+    topic: str
+    participants: List[AgentRole]
+    status: str
+    rounds: int
+    winner: Optional[Proposal]
+    support: float
+    created_at: float
+    finished_at: float
+
+
+class Negotiation:
+    """State of one negotiation and the tallies of its current round."""
+
+    def __init__(self, negotiation_id: str, participants: Iterable[AgentRole], topic: str,
+                 data: Optional[Dict] = None, mode: str = MAJORITY, threshold: float = 0.5,
+                 quorum: Optional[int] = None, weights: Optional[Dict[AgentRole, float]] = None,
+                 max_rounds: int = 3, round_timeout: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            negotiation_id: Unique id
+            participants: Roles allowed to propose and vote
+            topic: Negotiation topic
+            data: Initial negotiation data
+            mode: One of ``CONSENSUS_MODES``
+            threshold: Share of the deciding weight a proposal must exceed
+                (0.5 <= threshold < 1)
+            quorum: Votes needed before a ``quorum`` round can be decided
+                (default: a majority of participants)
+            weights: Vote weight per participant (default 1; ``weighted`` mode)
+            max_rounds: Rounds before the negotiation fails
+            round_timeout: Seconds before an undecided round moves on
+                (None = rounds only end by voting)
+            clock: Wall-clock time source
+        """
+        self.participants = list(dict.fromkeys(participants))
+        if not self.participants:
+            raise ValueError("A negotiation needs at least one participant")
+        if mode not in CONSENSUS_MODES:
+            raise ValueError(f"Unknown consensus mode: {mode}")
+        if not 0.5 <= threshold < 1:
+            raise ValueError("threshold must be in [0.5, 1)")
+        if max_rounds < 1:
+            raise ValueError("max_rounds must be at least 1")
+        weights = weights or {}
+        if mode != WEIGHTED and weights:
+            raise ValueError("weights are only used in weighted mode")
+        self.weights = {role: float(weights.get(role, 1.0)) for role in self.participants}
+        if any(weight <= 0 for weight in self.weights.values()):
+            raise ValueError("weights must be positive")
+        self.id = negotiation_id
+        self.topic = topic
+        self.data = data if data is not None else {}
+        self.mode = mode
+        self.threshold = threshold
+        self.quorum = quorum if quorum is not None else len(self.participants) // 2 + 1
+        if not 1 <= self.quorum <= len(self.participants):
+            raise ValueError("quorum must be between 1 and the number of participants")
+        self.max_rounds = max_rounds
+        self.round_timeout = round_timeout
+        self.total_weight = sum(self.weights.values())
+        self.created_at = clock()
+        self.status = ACTIVE
+        self.winner: Optional[Proposal] = None
+        self.round = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self._proposal_ids = itertools.count(1)
+        self._new_round()
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == ACTIVE
+
+    def propose(self, proposer: AgentRole, content: str, data: Optional[Dict] = None) -> Proposal:
+        """Add a proposal to the current round."""
+        self._check_participant(proposer)
+        proposal = Proposal(
+            id=f"{self.id}:{self.round}:{next(self._proposal_ids)}",
+            proposer=proposer,
+            content=content,
+            round=self.round,
+            data=data if data is not None else {}
+        )
+        self.proposals[proposal.id] = proposal
+        self.tally[proposal.id] = 0.0
+        return proposal
+
+    def vote(self, voter: AgentRole, proposal_id: str) -> bool:
+        """
+        Cast (or move) ``voter``'s vote for this round.
+
+        Returns:
+            bool: True if the vote decided the negotiation
+        """
+        self._check_participant(voter)
+        tally = self.tally
+        if proposal_id not in tally:
+            raise NegotiationError(f"Unknown proposal for round {self.round}: {proposal_id}")
+        previous = self.votes.get(voter)
+        if previous == proposal_id:
+            return False
+        weight = self.weights[voter]
+        if previous is None:
+            self.cast += weight
+        else:
+            tally[previous] -= weight
+        self.votes[voter] = proposal_id
+        score = tally[proposal_id] = tally[proposal_id] + weight
+
+        # Only the proposal that just gained weight or the leader can have
+        # crossed the threshold: moving a vote keeps ``cast`` unchanged and
+        # a proposal holding more than half can never be overtaken
+        leader = self.leader
+        if leader is None or score > tally[leader]:
+            self.leader = leader = proposal_id
+        for candidate in (proposal_id, leader):
+            if self._wins(candidate):
+                self.status = AGREED
+                self.winner = self.proposals[candidate]
+                return True
+        return False
+
+    @property
+    def round_complete(self) -> bool:
+        """True once every participant has voted this round."""
+        return len(self.votes) == len(self.participants)
+
+    def next_round(self) -> bool:
+        """
+        Close an undecided round.
+
+        Returns:
+            bool: True if a new round started, False if the negotiation failed
+        """
+        if self.round >= self.max_rounds:
+            self.status = FAILED
+            return False
+        self._new_round()
+        return True
+
+    def support(self) -> float:
+        """Share of the deciding weight behind the winner (or the leader)."""
+        proposal_id = self.winner.id if self.winner is not None else self.leader
+        if proposal_id is None:
+            return 0.0
+        base = self.cast if self.mode == QUORUM else self.total_weight
+        return self.tally[proposal_id] / base if base else 0.0
+
+    def to_outcome(self, finished_at: float) -> NegotiationOutcome:
+        return NegotiationOutcome(
+            id=self.id,
+            topic=self.topic,
+            participants=self.participants,
+            status=self.status,
+            rounds=self.round,
+            winner=self.winner,
+            support=self.support(),
+            created_at=self.created_at,
+            finished_at=finished_at
+        )
+
+    def to_dict(self) -> Dict:
+        """Current state as a plain dict (current round only)."""
+        return {
+            'id': self.id,
+            'participants': self.participants,
+            'topic': self.topic,
+            'data': self.data,
+            'mode': self.mode,
+            'round': self.round,
+            'proposals': list(self.proposals.values()),
+            'votes': dict(self.votes),
+            'tally': dict(self.tally),
+            'status': self.status,
+            'winner': self.winner,
+            'created_at': self.created_at
+        }
+
+    def _new_round(self):
+        self.round += 1
+        self.proposals: Dict[str, Proposal] = {}
+        self.votes: Dict[AgentRole, str] = {}
+        self.tally: Dict[str, float] = {}
+        self.cast = 0.0
+        self.leader: Optional[str] = None
+
+    def _wins(self, proposal_id: str) -> bool:
+        score = self.tally[proposal_id]
+        if self.mode == QUORUM:
+            return len(self.votes) >= self.quorum and score > self.threshold * self.cast
+        return score > self.threshold * self.total_weight
+
+    def _check_participant(self, role: AgentRole):
+        if self.status != ACTIVE:
+            raise NegotiationError(f"Negotiation {self.id} is {self.status}")
+        if role not in self.weights:
+            raise NegotiationError(f"{role.value} is not a participant in negotiation {self.id}")
+
+
+class NegotiationEngine:
+    """
+    Runs negotiations and keeps the outcomes of finished ones.
+
+    ``on_update(negotiation, event)`` is told about every state change:
+    ``'started'``, ``'proposal'``, ``'round'`` (a new round began),
+    ``'agreed'``, ``'failed'`` and ``'cancelled'``.
+    """
+
+    def __init__(self, max_rounds: int = 3, round_timeout: Optional[float] = None,
+                 max_finished: Optional[int] = 1000,
+                 on_update: Optional[Callable[[Negotiation, str], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            max_rounds: Default rounds per negotiation
+            round_timeout: Default seconds per round (None = no deadline)
+            max_finished: Outcomes kept after negotiations finish
+                (None = unbounded)
+            on_update: Called with ``(negotiation, event)`` on state changes
+            clock: Wall-clock time source
+        """
+        self.max_rounds = max_rounds
+        self.round_timeout = round_timeout
+        self.max_finished = max_finished
+        self.on_update = on_update
+        self._clock = clock
+        self.active: Dict[str, Negotiation] = {}
+        self.finished: "OrderedDict[str, NegotiationOutcome]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            'started': 0, AGREED: 0, FAILED: 0, CANCELLED: 0, 'rounds_timed_out': 0, 'forgotten': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self.active)
+
+    def __contains__(self, negotiation_id: str) -> bool:
+        return negotiation_id in self.active
+
+    def get(self, negotiation_id: str) -> Optional[Negotiation]:
+        """The active negotiation with this id, if any."""
+        return self.active.get(negotiation_id)
+
+    def get_outcome(self, negotiation_id: str) -> Optional[NegotiationOutcome]:
+        """Outcome of a finished negotiation, if it is still kept."""
+        return self.finished.get(negotiation_id)
+
+    def start(self, negotiation_id: str, participants: Iterable[AgentRole], topic: str,
+              data: Optional[Dict] = None, **options) -> Negotiation:
+        """
+        Open a negotiation.
+
+        Args:
+            negotiation_id: Unique id
+            participants: Roles allowed to propose and vote
+            topic: Negotiation topic
+            data: Initial negotiation data
+            **options: ``Negotiation`` options (mode, threshold, quorum,
+                weights, max_rounds, round_timeout)
+
+        Returns:
+            The new negotiation
+        """
+        if negotiation_id in self.active or negotiation_id in self.finished:
+            raise NegotiationError(f"Negotiation {negotiation_id} already exists")
+        options.setdefault('max_rounds', self.max_rounds)
+        options.setdefault('round_timeout', self.round_timeout)
+        negotiation = Negotiation(negotiation_id, participants, topic, data,
+                                  clock=self._clock, **options)
+        self.active[negotiation_id] = negotiation
+        self.stats['started'] += 1
+        self._arm_timer(negotiation)
+        self._notify(negotiation, 'started')
+        return negotiation
+
+    def propose(self, negotiation_id: str, proposer: AgentRole, content: str,
+                data: Optional[Dict] = None) -> Proposal:
+        """Submit a proposal to the current round of a negotiation."""
+        negotiation = self._require(negotiation_id)
+        proposal = negotiation.propose(proposer, content, data)
+        self._notify(negotiation, 'proposal')
+        return proposal
+
+    def vote(self, negotiation_id: str, voter: AgentRole, proposal_id: str) -> Negotiation:
+        """
+        Vote for a proposal of the current round.
+
+        Finishes the negotiation if the vote decides it, and moves on to the
+        next round if it was the last vote of an undecided round.
+
+        Returns:
+            The negotiation (check ``status`` / ``round``)
+        """
+        negotiation = self._require(negotiation_id)
+        if negotiation.vote(voter, proposal_id):
+            self._finish(negotiation)
+        elif negotiation.round_complete:
+            self._advance(negotiation)
+        return negotiation
+
+    def cancel(self, negotiation_id: str) -> Optional[NegotiationOutcome]:
+        """Abandon an active negotiation."""
+        negotiation = self.active.get(negotiation_id)
+        if negotiation is None:
+            return None
+        negotiation.status = CANCELLED
+        return self._finish(negotiation)
+
+    def close(self):
+        """Cancel every round timer (negotiations stay active)."""
+        for negotiation in self.active.values():
+            if negotiation.timer is not None:
+                negotiation.timer.cancel()
+                negotiation.timer = None
+
+    def resume(self):
+        """Re-arm the round timers ``close()`` cancelled (each round gets a full timeout)."""
+        for negotiation in self.active.values():
+            if negotiation.timer is None:
+                self._arm_timer(negotiation)
+
+    def get_stats(self) -> Dict:
+        return {'active': len(self.active), 'finished': len(self.finished), **self.stats}
+
+    def _require(self, negotiation_id: str) -> Negotiation:
+        negotiation = self.active.get(negotiation_id)
+        if negotiation is None:
+            outcome = self.finished.get(negotiation_id)
+            if outcome is not None:
+                raise NegotiationError(f"Negotiation {negotiation_id} is {outcome.status}")
+            raise NegotiationError(f"Unknown negotiation: {negotiation_id}")
+        return negotiation
+
+    def _advance(self, negotiation: Negotiation):
+        if negotiation.next_round():
+            self._arm_timer(negotiation)
+            self._notify(negotiation, 'round')
+        else:
+            self._finish(negotiation)
+
+    def _round_expired(self, negotiation_id: str, round_number: int):
+        negotiation = self.active.get(negotiation_id)
+        if negotiation is None or negotiation.round != round_number:
+            return
+        negotiation.timer = None
+        self.stats['rounds_timed_out'] += 1
+        self._advance(negotiation)
+
+    def _arm_timer(self, negotiation: Negotiation):
+        if negotiation.timer is not None:
+            negotiation.timer.cancel()
+            negotiation.timer = None
+        if negotiation.round_timeout is not None:
+            negotiation.timer = asyncio.get_running_loop().call_later(
+                negotiation.round_timeout, self._round_expired, negotiation.id, negotiation.round
+            )
+
+    def _finish(self, negotiation: Negotiation) -> NegotiationOutcome:
+        if negotiation.timer is not None:
+            negotiation.timer.cancel()
+            negotiation.timer = None
+        del self.active[negotiation.id]
+        outcome = negotiation.to_outcome(self._clock())
+        self.finished[negotiation.id] = outcome
+        self.stats[negotiation.status] += 1
+        if self.max_finished is not None:
+            while len(self.finished) > self.max_finished:
+                self.finished.popitem(last=False)
+                self.stats['forgotten'] += 1
+        self._notify(negotiation, negotiation.status)
+        return outcome
+
+    def _notify(self, negotiation: Negotiation, event: str):
+        if self.on_update is not None:
+            self.on_update(negotiation, event)
@@ -0,0 +1,520 @@
+"""Networked transport for the Communication Hub.
+
+``HubServer`` exposes a ``CommunicationHub`` over TCP or a Unix domain
+socket; ``HubClient`` is a proxy with the hub's messaging API, so agents can
+run in other processes or on other machines.
+
+All traffic uses the length-prefixed frames from
+``codecollab.core.transport`` with binary-encoded messages:
+
+- ``MESSAGE`` (client -> server): ``send_message``, fire-and-forget
+- ``REQUEST``/``RESPONSE``: ``send_request``; the server correlates the
+  reply through the hub and answers with the request id
+- ``CONTROL``/``REPLY``: subscribe, observe and ping, with JSON bodies
+- ``DELIVERY`` (server -> client): a message for a subscription, prefixed
+  with the client's channel number
+
+The client keeps a small pool of connections. Messages are pinned to a
+connection by recipient, so everything for one recipient stays in order,
+and several requests can be outstanding on one connection (pipelining).
+Frames written during the same event-loop iteration are coalesced into one
+socket write (batching).
+"""
+
+import asyncio
+import inspect
+import itertools
+import logging
+import struct
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from codecollab.core.codec import get_codec
+from codecollab.core.communication_hub import CommunicationHub
+from codecollab.core.message import (
+    DEADLINE, AgentRole, Message, MessagePriority, MessageType
+)
+from codecollab.core.transport import (
+    CONTROL, DELIVERY, MESSAGE, REPLY, REQUEST, RESPONSE, FrameWriter,
+    decode_control, encode_control, encode_frame, read_frame
+)
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL = struct.Struct('!I')
+_REQUEST_HEADER = struct.Struct('!d')
+_ID_LENGTH = struct.Struct('!H')
+
+_ROLE_BY_VALUE = {role.value: role for role in AgentRole}
+
+
+def _enum_values(values) -> Optional[List[str]]:
+    return [value.value for value in values] if values is not None else None
+
+
+class _ServerConnection:
+    """Server side of one client connection."""
+
+    def __init__(self, server: "HubServer", reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.server = server
+        self.hub = server.hub
+        self.codec = server.codec
+        self.reader = reader
+        self.frames = FrameWriter(writer)
+        self.roles: Dict[AgentRole, Callable] = {}
+        self.observers: List[str] = []
+        self.requests: set = set()
+        self.task: Optional[asyncio.Task] = None
+
+    async def serve(self):
+        try:
+            while True:
+                frame = await read_frame(self.reader)
+                if frame is None:
+                    break
+                try:
+                    await self._handle(*frame)
+                except ConnectionError:
+                    raise
+                except Exception as e:
+                    # One bad frame (undecodable body, unknown role...) must
+                    # not cost the client its connection
+                    self.server.stats['bad_frames'] += 1
+                    logger.warning(f"⚠️ Skipped bad frame (kind {frame[0]}) from hub client: {e!r}")
+        except ConnectionError as e:
+            logger.warning(f"⚠️ Hub client connection lost: {e}")
+        finally:
+            self._release()
+            await asyncio.gather(*self.requests, return_exceptions=True)
+            await self.frames.close()
+
+    async def _handle(self, kind: int, body: bytes):
+        if kind == MESSAGE:
+            self.server.stats['messages_in'] += 1
+            await self.hub.send_message(self.codec.decode(body))
+        elif kind == REQUEST:
+            # Enqueue inline to keep order with plain messages; only
+            # the wait for the reply runs in its own task
+            task = asyncio.ensure_future(await self._request(body))
+            self.requests.add(task)
+            task.add_done_callback(self.requests.discard)
+        elif kind == CONTROL:
+            self._control(decode_control(body))
+
+    async def _request(self, body: bytes):
+        (timeout,) = _REQUEST_HEADER.unpack_from(body)
+        request = self.codec.decode(body[_REQUEST_HEADER.size:])
+        self.server.stats['requests'] += 1
+        future = self.hub.pending_requests.register(request.id, request.recipient)
+        accepted = await self.hub.send_message(request)
+        return self._respond(request, future if accepted else None, timeout)
+
+    async def _respond(self, request: Message, future: Optional[asyncio.Future], timeout: float):
+        request_id = request.id
+        response = None
+        try:
+            if future is not None:
+                response = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.hub.pending_requests.discard(request_id)
+            if future is not None and response is None:
+                self.hub.abandon_request(request)
+        encoded_id = request_id.encode('utf-8')
+        payload = self.codec.encode(response) if response is not None else b""
+        self.frames.write(encode_frame(
+            RESPONSE, _ID_LENGTH.pack(len(encoded_id)) + encoded_id + payload
+        ))
+
+    def _control(self, request: Dict):
+        op = request.get('op')
+        try:
+            if op == 'subscribe':
+                role = _ROLE_BY_VALUE[request['role']]
+                forward = self._forwarder(request['channel'])
+                self.roles[role] = forward
+                self.hub.subscribe(role, forward)
+            elif op == 'observe':
+                subscription = self.hub.add_subscription(
+                    self._forwarder(request['channel']),
+                    recipients=self._enums(AgentRole, request.get('recipients')),
+                    message_types=self._enums(MessageType, request.get('message_types')),
+                    priorities=self._enums(MessagePriority, request.get('priorities')),
+                    metadata_keys=request.get('metadata_keys')
+                )
+                self.observers.append(subscription.id)
+        except (KeyError, ValueError) as e:
+            # Tell the client instead of dropping the connection
+            self.server.stats['bad_frames'] += 1
+            logger.warning(f"⚠️ Rejected hub client {op!r} request: {e!r}")
+            self.frames.write(encode_control(REPLY, {'id': request.get('id'), 'error': repr(e)}))
+            return
+        self.frames.write(encode_control(REPLY, {'id': request.get('id')}))
+
+    @staticmethod
+    def _enums(enum, values):
+        return [enum(value) for value in values] if values is not None else None
+
+    def _forwarder(self, channel: int) -> Callable:
+        header = _CHANNEL.pack(channel)
+        encode = self.codec.encode
+        frames = self.frames
+        stats = self.server.stats
+
+        async def forward(message: Message):
+            # Waiting here backs up the hub lane when the client reads slowly
+            await frames.send(encode_frame(DELIVERY, header + encode(message)))
+            stats['deliveries_out'] += 1
+        return forward
+
+    def _release(self):
+        for role, forward in self.roles.items():
+            if self.hub.subscribers.get(role) is forward:
+                del self.hub.subscribers[role]
+        for subscription_id in self.observers:
+            self.hub.unsubscribe(subscription_id)
+        for task in list(self.requests):
+            task.cancel()
+
+
+class HubServer:
+    """Serves a CommunicationHub to remote HubClients."""
+
+    def __init__(self, hub: CommunicationHub, host: str = "127.0.0.1",
+                 port: int = 0, path: Optional[str] = None):
+        """
+        Args:
+            hub: Hub to expose
+            host: TCP interface to bind (ignored when ``path`` is given)
+            port: TCP port (0 = pick a free port)
+            path: Unix domain socket path instead of TCP
+        """
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.path = path
+        self.codec = get_codec("binary")
+        self.connections: set = set()
+        self.stats = {
+            'connections': 0, 'messages_in': 0, 'requests': 0, 'deliveries_out': 0, 'bad_frames': 0
+        }
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def address(self):
+        """``(host, port)`` actually bound, or the Unix socket path."""
+        if self.path is not None:
+            return self.path
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        """Start accepting connections (the hub itself is started separately)."""
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._accept, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._accept, self.host, self.port)
+        logger.info(f"🌐 Hub server listening on {self.address}")
+
+    async def stop(self):
+        """Stop accepting connections and close the open ones."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        connections = list(self.connections)
+        for connection in connections:
+            connection.frames.writer.close()
+            connection.task.cancel()
+        # Each connection releases its subscriptions and pending requests on the way out
+        await asyncio.gather(*(connection.task for connection in connections),
+                             return_exceptions=True)
+        logger.info("🌐 Hub server stopped")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Connection and frame counters."""
+        return {**self.stats, 'open_connections': len(self.connections)}
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = _ServerConnection(self, reader, writer)
+        connection.task = asyncio.current_task()
+        self.connections.add(connection)
+        self.stats['connections'] += 1
+        try:
+            await connection.serve()
+        except asyncio.CancelledError:
+            # Cancelled by stop(); asyncio would log a cancelled callback as an error
+            pass
+        finally:
+            self.connections.discard(connection)
+
+
+class _ClientConnection:
+    """Client side of one pooled connection."""
+
+    def __init__(self, client: "HubClient", reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.client = client
+        self.reader = reader
+        self.frames = FrameWriter(writer)
+        self.task = asyncio.ensure_future(self._read_loop())
+
+    async def _read_loop(self):
+        client = self.client
+        codec = client.codec
+        try:
+            while True:
+                frame = await read_frame(self.reader)
+                if frame is None:
+                    break
+                kind, body = frame
+                if kind == DELIVERY:
+                    (channel,) = _CHANNEL.unpack_from(body)
+                    client._dispatch(channel, codec.decode(body[_CHANNEL.size:]))
+                elif kind == RESPONSE:
+                    (length,) = _ID_LENGTH.unpack_from(body)
+                    start = _ID_LENGTH.size
+                    request_id = body[start:start + length].decode('utf-8')
+                    payload = body[start + length:]
+                    client._resolve(request_id, codec.decode(payload) if payload else None)
+                elif kind == REPLY:
+                    reply = decode_control(body)
+                    if 'error' in reply:
+                        logger.error(f"❌ Hub rejected control request: {reply['error']}")
+                    client._resolve(('control', reply.get('id')), 'error' not in reply)
+        except ConnectionError as e:
+            logger.warning(f"⚠️ Hub server connection lost: {e}")
+        finally:
+            client._connection_lost(self)
+
+
+class HubClient:
+    """Remote proxy for a CommunicationHub served by HubServer."""
+
+    def __init__(self, host: str = "127.0.0.1", port: Optional[int] = None,
+                 path: Optional[str] = None, pool_size: int = 2):
+        """
+        Args:
+            host: Server host
+            port: Server TCP port
+            path: Server Unix socket path (instead of host/port)
+            pool_size: Connections kept open to the server
+        """
+        if path is None and port is None:
+            raise ValueError("HubClient needs a port or a Unix socket path")
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.pool_size = pool_size
+        self.codec = get_codec("binary")
+        self._connections: List[_ClientConnection] = []
+        self._channels: Dict[int, Callable] = {}
+        # Per-channel delivery queues, drained in order by one task each so
+        # callbacks never block the connection's reader (and may themselves
+        # send requests over it)
+        self._inboxes: Dict[int, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+        self._channel_ids = itertools.count(1)
+        self._control_ids = itertools.count(1)
+        self._pending: Dict[object, asyncio.Future] = {}
+        # Subscriptions to (re)send once connected: (connection index, request)
+        self._subscriptions: List[Tuple[int, Dict]] = []
+        self.is_connected = False
+
+    # -- lifecycle --------------------------------------------------------
+
+    async def connect(self):
+        """Open the connection pool and register any pending subscriptions."""
+        if self.is_connected:
+            return
+        # Whatever is left of a lost pool must not shadow the new connections
+        self._drop_connections()
+        for _ in range(self.pool_size):
+            if self.path is not None:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            else:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            self._connections.append(_ClientConnection(self, reader, writer))
+        self.is_connected = True
+        for index, request in self._subscriptions:
+            self._connections[index].frames.write(encode_control(CONTROL, request))
+        await self.flush()
+        logger.info(f"🌐 Connected to hub with {self.pool_size} connections")
+
+    async def close(self):
+        """Close every pooled connection."""
+        self.is_connected = False
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            await connection.frames.close()
+            connection.task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._inboxes.clear()
+        for future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    async def flush(self):
+        """Wait until the server has processed everything sent so far."""
+        await asyncio.gather(*(
+            self._control(index, {'op': 'ping'}) for index in range(len(self._connections))
+        ))
+
+    # -- subscriptions ----------------------------------------------------
+
+    def subscribe(self, role: AgentRole, callback: Callable):
+        """Receive messages for ``role`` (takes effect once sent to the server)."""
+        self._register(self._index_for(role), callback, {'op': 'subscribe', 'role': role.value})
+
+    def subscribe_to_all(self, callback: Callable):
+        """Observe every message."""
+        self.add_subscription(callback)
+
+    def add_subscription(self, callback: Callable,
+                         recipients: Optional[List[AgentRole]] = None,
+                         message_types: Optional[List[MessageType]] = None,
+                         priorities: Optional[List[MessagePriority]] = None,
+                         metadata_keys: Optional[List[str]] = None):
+        """Observe messages matching the filters (see ``CommunicationHub``)."""
+        self._register(0, callback, {
+            'op': 'observe',
+            'recipients': _enum_values(recipients),
+            'message_types': _enum_values(message_types),
+            'priorities': _enum_values(priorities),
+            'metadata_keys': list(metadata_keys) if metadata_keys is not None else None
+        })
+
+    def _register(self, index: int, callback: Callable, request: Dict):
+        channel = next(self._channel_ids)
+        self._channels[channel] = callback
+        request['channel'] = channel
+        self._subscriptions.append((index, request))
+        if self.is_connected:
+            self._connections[index].frames.write(encode_control(CONTROL, request))
+
+    # -- messaging --------------------------------------------------------
+
+    async def send_message(self, message: Message) -> bool:
+        """
+        Send a message to the remote hub (pipelined, no round trip).
+
+        Returns:
+            bool: True if the message was handed to the connection
+        """
+        if not self.is_connected:
+            logger.error("❌ Hub client is not connected")
+            return False
+        connection = self._connections[self._index_for(message.recipient)]
+        await connection.frames.send(encode_frame(MESSAGE, self.codec.encode(message)))
+        return True
+
+    async def send_messages(self, messages: Iterable[Message]) -> int:
+        """Send several messages; returns how many were handed off."""
+        sent = 0
+        for message in messages:
+            if await self.send_message(message):
+                sent += 1
+        return sent
+
+    async def send_request(self, sender: AgentRole, recipient: AgentRole,
+                           content: str, message_type: MessageType = MessageType.TASK_REQUEST,
+                           timeout: float = 30.0) -> Optional[Message]:
+        """
+        Send a request through the remote hub and wait for the response.
+
+        Returns:
+            Response message, or None on timeout or if the connection is lost
+        """
+        if not self.is_connected:
+            logger.error("❌ Hub client is not connected")
+            return None
+        request = Message(
+            sender=sender,
+            recipient=recipient,
+            message_type=message_type,
+            content=content,
+            requires_response=True,
+            metadata={DEADLINE: time.time() + timeout}
+        )
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request.id] = future
+        try:
+            connection = self._connections[self._index_for(recipient)]
+            await connection.frames.send(encode_frame(
+                REQUEST, _REQUEST_HEADER.pack(timeout) + self.codec.encode(request)
+            ))
+            # The server enforces the timeout; the margin covers the round trip
+            return await asyncio.wait_for(future, timeout=timeout + 5.0)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏰ Request timeout: {sender.value} → {recipient.value}")
+            return None
+        except ConnectionError as e:
+            logger.error(f"❌ Request failed: {e}")
+            return None
+        finally:
+            self._pending.pop(request.id, None)
+
+    # -- internals --------------------------------------------------------
+
+    def _index_for(self, role: AgentRole) -> int:
+        return hash(role.value) % self.pool_size
+
+    async def _control(self, index: int, request: Dict):
+        request_id = next(self._control_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[('control', request_id)] = future
+        try:
+            await self._connections[index].frames.send(
+                encode_control(CONTROL, {**request, 'id': request_id})
+            )
+            await future
+        finally:
+            self._pending.pop(('control', request_id), None)
+
+    def _resolve(self, key, result):
+        future = self._pending.get(key)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def _dispatch(self, channel: int, message: Message):
+        inbox = self._inboxes.get(channel)
+        if inbox is None:
+            if channel not in self._channels:
+                return
+            inbox = self._inboxes[channel] = asyncio.Queue()
+            self._workers.append(asyncio.ensure_future(self._drain(self._channels[channel], inbox)))
+        inbox.put_nowait(message)
+
+    async def _drain(self, callback: Callable, inbox: asyncio.Queue):
+        while True:
+            message = await inbox.get()
+            try:
+                result = callback(message)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"❌ Remote subscriber error: {e}")
+
+    def _connection_lost(self, connection: _ClientConnection):
+        if connection not in self._connections:
+            return
+        # One lost connection takes down the pool; connect() opens a new one
+        self.is_connected = False
+        self._drop_connections()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Connection to hub lost"))
+
+    def _drop_connections(self):
+        connections, self._connections = self._connections, []
+        current = asyncio.current_task()
+        for connection in connections:
+            connection.frames.writer.close()
+            if connection.task is not current:
+                connection.task.cancel()
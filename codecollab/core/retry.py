@@ -0,0 +1,220 @@
+"""Delivery retries and dead letters for the Communication Hub.
+
+With a ``RetryPolicy`` the hub delivers at least once: a handler that
+raises gets the message again after a jittered exponential backoff, until
+``max_attempts`` is reached and the message moves to the dead-letter queue.
+
+Backoffs are kept on a ``TimerWheel`` rather than in sleeping tasks or one
+``call_later`` handle each. Scheduling and cancelling are O(1), and a
+single loop callback per tick fires everything that is due. The callback
+only runs while timers are pending.
+
+``DeadLetterQueue`` keeps the most recent failures, up to a fixed size, so
+they can be inspected and replayed.
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how quickly a failed delivery is retried."""
+    max_attempts: int = 5
+    base_delay: float = 0.1
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    # Fraction of each delay that is randomised (0 = none, 1 = "full jitter")
+    jitter: float = 0.5
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if not 0.0 <= self.jitter <= 1.0:
+            raise ValueError("jitter must be between 0 and 1")
+
+    def delay_for(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """
+        Backoff before retrying after failed attempt number ``attempt``.
+
+        Args:
+            attempt: Attempts made so far (1 for the first failure)
+            rng: Source of uniform [0, 1) numbers
+
+        Returns:
+            Delay in seconds, in ``[d * (1 - jitter), d]`` where ``d`` is the
+            capped exponential delay
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1.0 - self.jitter * rng())
+
+
+class _Timer:
+    """A scheduled callback on a TimerWheel (returned as its handle)."""
+
+    __slots__ = ('due', 'callback', 'args', 'cancelled')
+
+    def __init__(self, due: int, callback: Callable, args: Tuple):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class TimerWheel:
+    """Hashed timing wheel driven by the running event loop."""
+
+    def __init__(self, tick: float = 0.01, slots: int = 512):
+        """
+        Args:
+            tick: Timer resolution in seconds (delays round up to whole ticks)
+            slots: Wheel size; a timer further out than ``slots`` ticks
+                stays in its slot until its tick comes round
+        """
+        self.tick = tick
+        self._slots: List[List[_Timer]] = [[] for _ in range(slots)]
+        self._origin = 0.0
+        self._current = 0
+        self._size = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, delay: float, callback: Callable, *args: Any) -> _Timer:
+        """Call ``callback(*args)`` after ``delay`` seconds; returns a handle."""
+        loop = asyncio.get_running_loop()
+        if self._size == 0:
+            self._origin = loop.time()
+            self._current = 0
+        due = self._tick_at(loop.time()) + max(1, math.ceil(delay / self.tick))
+        timer = _Timer(due, callback, args)
+        self._slots[due % len(self._slots)].append(timer)
+        self._size += 1
+        if self._handle is None:
+            self._handle = loop.call_at(self._origin + (self._current + 1) * self.tick, self._advance)
+        return timer
+
+    def cancel(self, timer: _Timer):
+        """Cancel a pending timer (no-op if it already fired)."""
+        if not timer.cancelled:
+            timer.cancelled = True
+            self._size -= 1
+            if self._size == 0:
+                self._stop_ticking()
+
+    def drain(self) -> List[Tuple[Callable, Tuple]]:
+        """Remove every pending timer; returns their ``(callback, args)``."""
+        pending = [
+            (timer.callback, timer.args)
+            for slot in self._slots for timer in slot if not timer.cancelled
+        ]
+        for slot in self._slots:
+            slot.clear()
+        self._size = 0
+        self._stop_ticking()
+        return pending
+
+    def _tick_at(self, now: float) -> int:
+        return int((now - self._origin) / self.tick)
+
+    def _advance(self):
+        self._handle = None
+        loop = asyncio.get_running_loop()
+        # The loop may run this a hair before the tick boundary
+        target = max(self._tick_at(loop.time()), self._current + 1)
+        # Visit each slot between the last tick and now at most once
+        steps = min(target - self._current, len(self._slots))
+        due = []
+        for step in range(1, steps + 1):
+            slot = self._slots[(self._current + step) % len(self._slots)]
+            if not slot:
+                continue
+            keep = []
+            for timer in slot:
+                if timer.cancelled:
+                    continue
+                if timer.due <= target:
+                    due.append(timer)
+                else:
+                    keep.append(timer)
+            slot[:] = keep
+        self._current = max(self._current, target)
+        for timer in due:
+            timer.cancelled = True
+            self._size -= 1
+        if self._size:
+            self._handle = loop.call_at(self._origin + (self._current + 1) * self.tick, self._advance)
+        for timer in due:
+            timer.callback(*timer.args)
+
+    def _stop_ticking(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+
+@dataclass
+class DeadLetter:
+    """A message whose delivery to one destination was given up."""
+    message: Any
+    destination: Hashable
+    error: str
+    attempts: int
+    failed_at: float = field(default_factory=time.time)
+
+
+class DeadLetterQueue:
+    """The most recent dead letters, oldest first, bounded in size."""
+
+    def __init__(self, max_size: int = 1000):
+        """
+        Args:
+            max_size: Dead letters kept; the oldest is evicted beyond this
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._letters: Deque[DeadLetter] = deque(maxlen=max_size)
+        self.total = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._letters)
+
+    def __iter__(self) -> Iterator[DeadLetter]:
+        return iter(self._letters)
+
+    def append(self, letter: DeadLetter):
+        """Record a dead letter, evicting the oldest when full."""
+        if len(self._letters) == self._letters.maxlen:
+            self.evicted += 1
+        self._letters.append(letter)
+        self.total += 1
+
+    def take(self, message_ids: Optional[Iterable[str]] = None) -> List[DeadLetter]:
+        """
+        Remove and return dead letters, oldest first.
+
+        Args:
+            message_ids: Only letters for these message ids (None = all)
+        """
+        if message_ids is None:
+            taken = list(self._letters)
+            self._letters.clear()
+            return taken
+        wanted = set(message_ids)
+        taken = [letter for letter in self._letters if letter.message.id in wanted]
+        if taken:
+            kept = [letter for letter in self._letters if letter.message.id not in wanted]
+            self._letters.clear()
+            self._letters.extend(kept)
+        return taken
+
+    def get_stats(self) -> Dict[str, int]:
+        """Current size and lifetime counters."""
+        return {'size': len(self._letters), 'total': self.total, 'evicted': self.evicted}
@@ -0,0 +1,144 @@
+"""Subscription router for Communication Hub observers.
+
+Observers register a ``Subscription`` with optional filters on recipient
+role, message type, priority and required metadata keys. Instead of calling
+every observer for every message, ``SubscriptionRouter.match`` looks up the
+candidates for a message's (recipients, message_type, priority) in a table
+that is computed once per distinct combination and reused until the set of
+subscriptions changes. Only subscriptions that also filter on metadata keys
+need a per-message check.
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+from codecollab.core.message import AgentRole, Message, MessagePriority, MessageType
+
+_MISSING = object()
+
+
+def _frozen(values: Optional[Iterable[Any]]) -> Optional[FrozenSet[Any]]:
+    return frozenset(values) if values is not None else None
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """An observer callback plus the filters selecting its messages."""
+    id: str
+    callback: Callable
+    recipients: Optional[FrozenSet[AgentRole]] = None
+    message_types: Optional[FrozenSet[MessageType]] = None
+    priorities: Optional[FrozenSet[MessagePriority]] = None
+    metadata_keys: FrozenSet[str] = frozenset()
+
+    @property
+    def is_catch_all(self) -> bool:
+        """True if this subscription receives every message."""
+        return (self.recipients is None and self.message_types is None
+                and self.priorities is None and not self.metadata_keys)
+
+    def matches_route(self, targets: Iterable[AgentRole], message_type: MessageType,
+                      priority: MessagePriority) -> bool:
+        """Check the recipient/type/priority filters."""
+        if self.message_types is not None and message_type not in self.message_types:
+            return False
+        if self.priorities is not None and priority not in self.priorities:
+            return False
+        if self.recipients is not None and self.recipients.isdisjoint(targets):
+            return False
+        return True
+
+    def matches_metadata(self, message: Message) -> bool:
+        """Check that every required metadata key is present."""
+        for key in self.metadata_keys:
+            if message.get_meta(key, _MISSING) is _MISSING:
+                return False
+        return True
+
+    def matches(self, message: Message) -> bool:
+        """Check all filters against ``message``."""
+        return (self.matches_route(tuple(message.targets()), message.message_type, message.priority)
+                and self.matches_metadata(message))
+
+
+class SubscriptionRouter:
+    """Indexes subscriptions and resolves the observers for a message."""
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._ids = itertools.count(1)
+        # (targets, message_type, priority) -> (unconditional, metadata-filtered)
+        self._table: Dict[Hashable, Tuple[Tuple[Subscription, ...], Tuple[Subscription, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    @property
+    def subscriptions(self) -> List[Subscription]:
+        """Registered subscriptions in registration order."""
+        return list(self._subscriptions.values())
+
+    def add(self, callback: Callable,
+            recipients: Optional[Iterable[AgentRole]] = None,
+            message_types: Optional[Iterable[MessageType]] = None,
+            priorities: Optional[Iterable[MessagePriority]] = None,
+            metadata_keys: Optional[Iterable[str]] = None) -> Subscription:
+        """
+        Register an observer.
+
+        Args:
+            callback: Called (and awaited if it returns an awaitable) per match
+            recipients: Only messages addressed to one of these roles
+            message_types: Only messages of these types
+            priorities: Only messages with these priorities
+            metadata_keys: Only messages whose metadata has all of these keys
+
+        Returns:
+            The new subscription (its ``id`` is used to unsubscribe)
+        """
+        subscription = Subscription(
+            id=f"sub-{next(self._ids)}",
+            callback=callback,
+            recipients=_frozen(recipients),
+            message_types=_frozen(message_types),
+            priorities=_frozen(priorities),
+            metadata_keys=frozenset(metadata_keys or ())
+        )
+        self._subscriptions[subscription.id] = subscription
+        self._table.clear()
+        return subscription
+
+    def remove(self, subscription_id: str) -> bool:
+        """Unregister a subscription; returns False if it was unknown."""
+        if self._subscriptions.pop(subscription_id, None) is None:
+            return False
+        self._table.clear()
+        return True
+
+    def match(self, message: Message) -> Tuple[Subscription, ...]:
+        """Subscriptions that should observe ``message``."""
+        if not self._subscriptions:
+            return ()
+        targets = message.recipients if message.recipients is not None else message.recipient
+        key = (targets, message.message_type, message.priority)
+        entry = self._table.get(key)
+        if entry is None:
+            entry = self._table[key] = self._build_entry(message)
+        unconditional, keyed = entry
+        if not keyed:
+            return unconditional
+        if not message.has_metadata:
+            return unconditional
+        matched = tuple(sub for sub in keyed if sub.matches_metadata(message))
+        return unconditional + matched if matched else unconditional
+
+    def _build_entry(self, message: Message):
+        targets = tuple(message.targets())
+        unconditional = []
+        keyed = []
+        for sub in self._subscriptions.values():
+            if not sub.matches_route(targets, message.message_type, message.priority):
+                continue
+            (keyed if sub.metadata_keys else unconditional).append(sub)
+        return tuple(unconditional), tuple(keyed)
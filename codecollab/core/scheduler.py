@@ -0,0 +1,252 @@
+"""Priority scheduler for the Communication Hub message queue.
+
+A bucket queue with one FIFO lane per priority level. Items inside a level
+are served strictly in arrival order, levels are served highest first, and
+a starvation guard lets lower-level items that have waited longer than
+``aging_threshold`` seconds jump ahead so a steady stream of urgent traffic
+cannot park them forever.
+
+Entries are stored as ``(sequence, enqueued_at, item)`` tuples; the monotonic
+sequence number is the only tiebreak ever compared, so queued items (e.g.
+``Message`` objects) never need to be orderable.
+
+``close()`` is the consumer shutdown signal: waiting (and later) ``get``
+calls raise ``SchedulerClosed`` while producers can keep queueing, so a
+consumer loop can await the queue directly instead of polling with a
+timeout.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+class SchedulerClosed(Exception):
+    """Raised by ``get``/``get_batch`` once the scheduler has been closed."""
+
+
+class PriorityScheduler:
+    """
+    Asyncio-compatible priority queue with FIFO order inside each level.
+
+    The interface mirrors ``asyncio.Queue`` (``put``/``get``/``task_done``/
+    ``join``/``qsize``) except that ``put`` takes the priority level
+    explicitly. Higher level values are served first.
+    """
+
+    def __init__(self, levels: Iterable[int],
+                 aging_threshold: Optional[float] = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            levels: Priority levels accepted by ``put`` (any order)
+            aging_threshold: Seconds a lower-level item may wait before it is
+                served ahead of higher levels; ``None`` disables aging
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._levels: Tuple[int, ...] = tuple(sorted(set(levels), reverse=True))
+        if not self._levels:
+            raise ValueError("PriorityScheduler needs at least one level")
+        self._buckets: Dict[int, Deque[Tuple[int, float, Any]]] = {
+            level: deque() for level in self._levels
+        }
+        self.aging_threshold = aging_threshold
+        self._clock = clock
+        self._sequence = itertools.count()
+        self._size = 0
+        self._unfinished = 0
+        self._getters: Deque[asyncio.Future] = deque()
+        self._joiners: Deque[asyncio.Future] = deque()
+        self._closed = False
+        self.promotions = 0
+
+    # -- size -------------------------------------------------------------
+
+    def qsize(self) -> int:
+        """Number of queued items across all levels."""
+        return self._size
+
+    def empty(self) -> bool:
+        """True if nothing is queued."""
+        return self._size == 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def depths(self) -> Dict[int, int]:
+        """Queued item count per priority level."""
+        return {level: len(bucket) for level, bucket in self._buckets.items()}
+
+    # -- producer side ----------------------------------------------------
+
+    def put_nowait(self, item: Any, priority: int):
+        """Queue ``item`` at ``priority`` without blocking."""
+        try:
+            bucket = self._buckets[priority]
+        except KeyError:
+            raise ValueError(f"Unknown priority level: {priority}") from None
+        bucket.append((next(self._sequence), self._clock(), item))
+        self._size += 1
+        self._unfinished += 1
+        self._wakeup_next()
+
+    async def put(self, item: Any, priority: int):
+        """Queue ``item`` at ``priority``."""
+        self.put_nowait(item, priority)
+
+    def put_many(self, entries: Iterable[Tuple[Any, int]]) -> int:
+        """
+        Queue several ``(item, priority)`` pairs with a single wake-up.
+
+        Returns:
+            Number of items queued
+        """
+        buckets = self._buckets
+        try:
+            # Resolve every bucket first so a bad level leaves the queue untouched
+            resolved = [(buckets[priority], item) for item, priority in entries]
+        except KeyError as e:
+            raise ValueError(f"Unknown priority level: {e.args[0]}") from None
+        sequence = self._sequence
+        now = self._clock()
+        for bucket, item in resolved:
+            bucket.append((next(sequence), now, item))
+        count = len(resolved)
+        self._size += count
+        self._unfinished += count
+        for _ in range(min(count, len(self._getters))):
+            self._wakeup_next()
+        return count
+
+    # -- consumer side ----------------------------------------------------
+
+    def get_nowait(self) -> Any:
+        """Remove and return the next item; raise ``asyncio.QueueEmpty`` if none."""
+        if not self._size:
+            raise asyncio.QueueEmpty
+        bucket = self._select_bucket()
+        _, _, item = bucket.popleft()
+        self._size -= 1
+        return item
+
+    async def get(self) -> Any:
+        """
+        Remove and return the next item, waiting until one is available.
+
+        Raises:
+            SchedulerClosed: If the scheduler is (or becomes) closed
+        """
+        while not self._size:
+            if self._closed:
+                raise SchedulerClosed
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                try:
+                    self._getters.remove(getter)
+                except ValueError:
+                    pass
+                if self._size and not getter.cancelled():
+                    self._wakeup_next()
+                raise
+        if self._closed:
+            raise SchedulerClosed
+        return self.get_nowait()
+
+    def get_many_nowait(self, max_items: int) -> List[Any]:
+        """Remove and return up to ``max_items`` items in scheduling order."""
+        items = []
+        while self._size and len(items) < max_items:
+            items.append(self.get_nowait())
+        return items
+
+    async def get_batch(self, max_items: int) -> List[Any]:
+        """Wait for at least one item, then return up to ``max_items``."""
+        items = [await self.get()]
+        if max_items > 1 and self._size:
+            items.extend(self.get_many_nowait(max_items - 1))
+        return items
+
+    def task_done(self):
+        """Mark a previously fetched item as processed (see ``asyncio.Queue``)."""
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            while self._joiners:
+                joiner = self._joiners.popleft()
+                if not joiner.done():
+                    joiner.set_result(None)
+
+    async def join(self):
+        """Wait until every queued item has been marked done."""
+        if self._unfinished:
+            joiner = asyncio.get_running_loop().create_future()
+            self._joiners.append(joiner)
+            await joiner
+
+    # -- shutdown ---------------------------------------------------------
+
+    @property
+    def closed(self) -> bool:
+        """True between ``close()`` and ``reopen()``."""
+        return self._closed
+
+    def close(self):
+        """
+        Make ``get`` raise ``SchedulerClosed`` and wake every waiting getter.
+
+        Queued items stay put and ``put``/``get_nowait`` keep working, so a
+        consumer that wants to drain first waits on ``join()`` before closing.
+        """
+        self._closed = True
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+
+    def reopen(self):
+        """Undo ``close()``."""
+        self._closed = False
+
+    # -- internals --------------------------------------------------------
+
+    def _select_bucket(self) -> Deque[Tuple[int, float, Any]]:
+        """Pick the bucket to serve next, applying the starvation guard."""
+        top = None
+        for level in self._levels:
+            if self._buckets[level]:
+                top = level
+                break
+        selected = self._buckets[top]
+
+        if self.aging_threshold is not None:
+            deadline = self._clock() - self.aging_threshold
+            # Only promote items that arrived before the current top head
+            oldest_seq = None
+            top_seq = selected[0][0]
+            for level in self._levels:
+                if level >= top:
+                    continue
+                bucket = self._buckets[level]
+                if bucket and bucket[0][1] <= deadline:
+                    seq = bucket[0][0]
+                    if seq < top_seq and (oldest_seq is None or seq < oldest_seq):
+                        oldest_seq = seq
+                        selected = bucket
+            if oldest_seq is not None:
+                self.promotions += 1
+
+        return selected
+
+    def _wakeup_next(self):
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                break
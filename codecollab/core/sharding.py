@@ -0,0 +1,445 @@
+"""Multi-process sharded Communication Hub.
+
+``ShardedHub`` partitions agent roles across worker processes. Each shard
+runs an ordinary ``CommunicationHub`` on its own event loop (and core) and
+delivers to the subscribers of the roles it owns. Shards listen on Unix
+domain sockets and exchange length-prefixed, binary-encoded messages (see
+``codecollab.core.transport``); a ``ShardRoutingTable`` maps every role to
+its shard.
+
+The API mirrors the hub:
+
+- ``subscribe``/``subscribe_to_all``/``add_subscription`` register
+  callbacks before ``start()``. Worker processes are forked, so callbacks
+  (and anything they close over) are inherited rather than pickled.
+- ``send_message``/``send_messages`` work from the parent process and from
+  inside handlers. Messages to a role on the same shard stay local;
+  everything else is forwarded to the owning shard. A multicast message is
+  sent once to each shard that owns one of its recipients.
+- ``send_request`` works inside handlers: the request is forwarded to the
+  recipient's shard and the reply comes back to the sender's shard, where
+  the local hub correlates it.
+
+Observers run in the shard that dispatches a message, so a multicast that
+spans several shards is observed once per shard.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from typing import Callable, Dict, Iterable, List, Optional
+
+from codecollab.core.codec import get_codec
+from codecollab.core.communication_hub import CommunicationHub
+from codecollab.core.message import (
+    AgentRole, Message, MessagePriority, MessageType
+)
+from codecollab.core.transport import (
+    CONTROL, MESSAGE, REPLY, FrameWriter, decode_control, encode_control,
+    encode_frame, read_frame
+)
+
+logger = logging.getLogger(__name__)
+
+_ROLES = tuple(AgentRole)
+
+
+class ShardRoutingTable:
+    """Maps each agent role to the shard that owns it."""
+
+    def __init__(self, shards: int, assignments: Optional[Dict[AgentRole, int]] = None):
+        """
+        Args:
+            shards: Number of shards
+            assignments: Explicit role -> shard mapping; unlisted roles are
+                spread round-robin
+        """
+        if shards < 1:
+            raise ValueError("A sharded hub needs at least one shard")
+        self.shards = shards
+        assignments = assignments or {}
+        self._shard_of: Dict[AgentRole, int] = {}
+        for position, role in enumerate(_ROLES):
+            shard = assignments.get(role, position % shards)
+            if not 0 <= shard < shards:
+                raise ValueError(f"Shard {shard} for {role.value} out of range")
+            self._shard_of[role] = shard
+
+    def shard_for(self, role: AgentRole) -> int:
+        """Shard owning ``role``."""
+        return self._shard_of[role]
+
+    def roles_for(self, shard: int) -> List[AgentRole]:
+        """Roles owned by ``shard``."""
+        return [role for role, owner in self._shard_of.items() if owner == shard]
+
+    def shards_for(self, message: Message) -> List[int]:
+        """Distinct shards owning the recipients of ``message``."""
+        if message.recipients is None:
+            return [self._shard_of[message.recipient]]
+        return sorted({self._shard_of[role] for role in message.recipients})
+
+
+class _ShardLocalHub(CommunicationHub):
+    """The hub inside one shard: forwards messages for roles it does not own."""
+
+    def __init__(self, node: "_ShardNode", **options):
+        super().__init__(**options)
+        self._node = node
+
+    async def send_message(self, message: Message) -> bool:
+        node = self._node
+        queued = True
+        for shard in node.routing.shards_for(message):
+            if shard == node.index:
+                queued = await super().send_message(message) and queued
+            else:
+                await node.forward(shard, message)
+        return queued
+
+    async def send_messages(self, messages: Iterable[Message]) -> int:
+        node = self._node
+        local = []
+        forwarded = 0
+        for message in messages:
+            for shard in node.routing.shards_for(message):
+                if shard == node.index:
+                    local.append(message)
+                else:
+                    await node.forward(shard, message)
+                    forwarded += 1
+        return await super().send_messages(local) + forwarded
+
+    async def accept(self, message: Message) -> bool:
+        """Queue a message forwarded by another shard (no re-routing)."""
+        return await super().send_message(message)
+
+
+class _ShardNode:
+    """Runs one shard inside its worker process."""
+
+    def __init__(self, sharded: "ShardedHub", index: int):
+        self.sharded = sharded
+        self.index = index
+        self.routing = sharded.routing
+        self.codec = get_codec("binary")
+        self.hub: Optional[_ShardLocalHub] = None
+        self.forwarded = 0
+        self._peers: Dict[int, asyncio.Task] = {}
+        self._stopped: Optional[asyncio.Event] = None
+
+    async def run(self):
+        self._stopped = asyncio.Event()
+        self.hub = hub = _ShardLocalHub(self, **self.sharded.hub_options)
+        for role in self.routing.roles_for(self.index):
+            if role in self.sharded._subscribers:
+                callback, batch_size = self.sharded._subscribers[role]
+                hub.subscribe(role, callback, batch_size=batch_size)
+        for callback, filters in self.sharded._observers:
+            hub.add_subscription(callback, **filters)
+        self.sharded._node = self
+
+        server = await asyncio.start_unix_server(
+            self._serve, path=self.sharded.socket_path(self.index)
+        )
+        await hub.start()
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            await hub.stop()
+            for task in self._peers.values():
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    await task.result().close()
+
+    async def forward(self, shard: int, message: Message):
+        """Send ``message`` to the shard that owns its recipient."""
+        task = self._peers.get(shard)
+        if task is None:
+            task = self._peers[shard] = asyncio.ensure_future(self._connect(shard))
+        peer = await task
+        await peer.send(encode_frame(MESSAGE, self.codec.encode(message)))
+        self.forwarded += 1
+
+    async def _connect(self, shard: int) -> FrameWriter:
+        _, writer = await asyncio.open_unix_connection(self.sharded.socket_path(shard))
+        return FrameWriter(writer)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        replies = FrameWriter(writer)
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame is None:
+                    break
+                kind, body = frame
+                if kind == MESSAGE:
+                    await self.hub.accept(self.codec.decode(body))
+                elif kind == CONTROL:
+                    request = decode_control(body)
+                    if request.get('op') == 'stats':
+                        await replies.send(encode_control(REPLY, self.stats()))
+                        await replies.flush()
+                    elif request.get('op') == 'stop':
+                        await replies.send(encode_control(REPLY, {'stopped': self.index}))
+                        await replies.flush()
+                        self._stopped.set()
+                        break
+        except Exception as e:
+            logger.error(f"❌ Shard {self.index} connection error: {e}")
+        finally:
+            writer.close()
+
+    def stats(self) -> Dict:
+        hub_stats = self.hub.get_stats()
+        return {
+            'shard': self.index,
+            'pid': os.getpid(),
+            'roles': [role.value for role in self.routing.roles_for(self.index)],
+            'forwarded': self.forwarded,
+            'queue_size': hub_stats['queue_size'],
+            'pending_deliveries': hub_stats['pending_deliveries'],
+            **hub_stats['delivery_stats']
+        }
+
+
+def _run_shard(sharded: "ShardedHub", index: int):
+    """Worker process entry point."""
+    asyncio.run(_ShardNode(sharded, index).run())
+
+
+class ShardedHub:
+    """Communication hub partitioned by role across worker processes."""
+
+    def __init__(self, shards: Optional[int] = None,
+                 routing: Optional[ShardRoutingTable] = None,
+                 socket_dir: Optional[str] = None,
+                 start_timeout: float = 10.0,
+                 **hub_options):
+        """
+        Args:
+            shards: Number of worker processes (default: CPU count, at most
+                one per role); ignored when ``routing`` is given
+            routing: Role -> shard table
+            socket_dir: Directory for the shard sockets (default: a temp dir)
+            start_timeout: Seconds to wait for every shard to come up
+            **hub_options: Passed to each shard's ``CommunicationHub``
+        """
+        if routing is None:
+            if shards is None:
+                shards = max(1, min(os.cpu_count() or 1, len(_ROLES)))
+            routing = ShardRoutingTable(shards)
+        self.routing = routing
+        self.hub_options = hub_options
+        self.start_timeout = start_timeout
+        self._socket_dir = socket_dir
+        self._owns_socket_dir = socket_dir is None
+        self._subscribers: Dict[AgentRole, tuple] = {}
+        self._observers: List[tuple] = []
+        self._processes: List[multiprocessing.Process] = []
+        self._writers: Dict[int, FrameWriter] = {}
+        self._readers: Dict[int, asyncio.StreamReader] = {}
+        self._control_locks: Dict[int, asyncio.Lock] = {}
+        self._codec = get_codec("binary")
+        # Set inside a worker process to the shard it runs
+        self._node: Optional[_ShardNode] = None
+        self.is_running = False
+
+    @property
+    def shards(self) -> int:
+        """Number of shards."""
+        return self.routing.shards
+
+    @property
+    def local_hub(self) -> Optional[CommunicationHub]:
+        """The shard's own hub when called inside a worker process."""
+        return self._node.hub if self._node is not None else None
+
+    def socket_path(self, shard: int) -> str:
+        """Unix socket the given shard listens on."""
+        return os.path.join(self._socket_dir, f"shard-{shard}.sock")
+
+    # -- subscriptions (before start) -------------------------------------
+
+    def subscribe(self, role: AgentRole, callback: Callable,
+                  batch_size: Optional[int] = None):
+        """Subscribe a handler for ``role``; it runs in the role's shard."""
+        self._check_not_started()
+        self._subscribers[role] = (callback, batch_size)
+        logger.info(f"📝 Agent {role.value} subscribed on shard {self.routing.shard_for(role)}")
+
+    def subscribe_to_all(self, callback: Callable):
+        """Observe every message (runs in each dispatching shard)."""
+        self.add_subscription(callback)
+
+    def add_subscription(self, callback: Callable,
+                         recipients: Optional[List[AgentRole]] = None,
+                         message_types: Optional[List[MessageType]] = None,
+                         priorities: Optional[List[MessagePriority]] = None,
+                         metadata_keys: Optional[List[str]] = None):
+        """Register a filtered observer in every shard (see ``CommunicationHub``)."""
+        self._check_not_started()
+        self._observers.append((callback, {
+            'recipients': recipients,
+            'message_types': message_types,
+            'priorities': priorities,
+            'metadata_keys': metadata_keys
+        }))
+
+    def _check_not_started(self):
+        if self.is_running or self._node is not None:
+            raise RuntimeError("ShardedHub subscriptions must be registered before start()")
+
+    # -- lifecycle --------------------------------------------------------
+
+    async def start(self):
+        """Fork the shard processes and connect to each of them."""
+        if self.is_running:
+            return
+        if self._socket_dir is None:
+            self._socket_dir = tempfile.mkdtemp(prefix="codecollab-shards-")
+        context = multiprocessing.get_context("fork")
+        # Fork every shard before opening any connection so children do not
+        # inherit the parent's sockets
+        for index in range(self.shards):
+            process = context.Process(
+                target=_run_shard, args=(self, index),
+                name=f"codecollab-shard-{index}", daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+        try:
+            for index in range(self.shards):
+                reader, writer = await self._connect(index)
+                self._readers[index] = reader
+                self._writers[index] = FrameWriter(writer)
+                self._control_locks[index] = asyncio.Lock()
+        except Exception:
+            await self._terminate()
+            raise
+        self.is_running = True
+        logger.info(f"📡 Sharded hub started with {self.shards} shards")
+
+    async def stop(self):
+        """Stop every shard and wait for the processes to exit."""
+        if not self.is_running:
+            return
+        self.is_running = False
+        for index in list(self._writers):
+            try:
+                await self._control(index, {'op': 'stop'})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+        for writer in self._writers.values():
+            await writer.close()
+        self._writers.clear()
+        self._readers.clear()
+        await self._terminate()
+        logger.info("📡 Sharded hub stopped")
+
+    async def _connect(self, index: int):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.start_timeout
+        path = self.socket_path(index)
+        while True:
+            try:
+                return await asyncio.open_unix_connection(path)
+            except (FileNotFoundError, ConnectionRefusedError):
+                if not self._processes[index].is_alive():
+                    raise RuntimeError(f"Shard {index} exited during start-up")
+                if loop.time() > deadline:
+                    raise TimeoutError(f"Shard {index} did not start within {self.start_timeout}s")
+                await asyncio.sleep(0.01)
+
+    async def _terminate(self):
+        loop = asyncio.get_running_loop()
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join, 5.0)
+            if process.is_alive():
+                process.terminate()
+                await loop.run_in_executor(None, process.join, 1.0)
+        self._processes = []
+        if self._owns_socket_dir and self._socket_dir is not None:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+            self._socket_dir = None
+
+    async def _control(self, index: int, request: Dict) -> Dict:
+        async with self._control_locks[index]:
+            writer = self._writers[index]
+            await writer.send(encode_control(CONTROL, request))
+            await writer.flush()
+            frame = await read_frame(self._readers[index])
+            if frame is None or frame[0] != REPLY:
+                raise ConnectionError(f"Shard {index} closed the control channel")
+            return decode_control(frame[1])
+
+    # -- messaging --------------------------------------------------------
+
+    async def send_message(self, message: Message) -> bool:
+        """
+        Send a message to the shard(s) owning its recipient(s).
+
+        Returns:
+            bool: True if the message was handed to its shard(s)
+        """
+        if self._node is not None:
+            return await self._node.hub.send_message(message)
+        if not self.is_running:
+            logger.error("❌ Sharded hub is not running")
+            return False
+        try:
+            frame = encode_frame(MESSAGE, self._codec.encode(message))
+            for shard in self.routing.shards_for(message):
+                await self._writers[shard].send(frame)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to send message: {e}")
+            return False
+
+    async def send_messages(self, messages: Iterable[Message]) -> int:
+        """Send several messages; returns how many were handed off."""
+        if self._node is not None:
+            return await self._node.hub.send_messages(messages)
+        sent = 0
+        for message in messages:
+            if await self.send_message(message):
+                sent += 1
+        return sent
+
+    async def send_request(self, sender: AgentRole, recipient: AgentRole,
+                           content: str, message_type: MessageType = MessageType.TASK_REQUEST,
+                           timeout: float = 30.0) -> Optional[Message]:
+        """
+        Send a request and wait for the response (inside a shard only).
+
+        The reply is routed to the sender's shard, so the request must be
+        made from a handler running there.
+        """
+        if self._node is None:
+            raise RuntimeError("send_request is only available inside a shard")
+        if self.routing.shard_for(sender) != self._node.index:
+            raise RuntimeError(f"{sender.value} is not owned by shard {self._node.index}")
+        return await self._node.hub.send_request(sender, recipient, content, message_type, timeout)
+
+    async def flush(self):
+        """Wait until every message sent so far has been accepted by its shard."""
+        await asyncio.gather(*(
+            self._control(index, {'op': 'stats'}) for index in range(self.shards)
+        ))
+
+    async def get_stats(self) -> Dict:
+        """Per-shard counters plus totals."""
+        if self._node is not None:
+            return {'shards': [self._node.stats()]}
+        shards = await asyncio.gather(*(
+            self._control(index, {'op': 'stats'}) for index in range(self.shards)
+        ))
+        return {
+            'shards': list(shards),
+            'total_sent': sum(shard['total_sent'] for shard in shards),
+            'total_delivered': sum(shard['total_delivered'] for shard in shards),
+            'total_forwarded': sum(shard['forwarded'] for shard in shards)
+        }
@@ -0,0 +1,140 @@
+"""Length-prefixed framing for hub IPC and network transports.
+
+Every frame on a stream is::
+
+    payload length (u32, big-endian) | kind (1 byte) | body
+
+``MESSAGE`` bodies are codec-encoded ``Message`` records; ``CONTROL`` and
+``REPLY`` carry small JSON payloads. The network transport adds
+``DELIVERY``, ``REQUEST`` and ``RESPONSE`` frames with a short binary
+header in front of the encoded message.
+
+``FrameWriter`` coalesces frames written in the same event-loop iteration
+into a single socket write, and only waits on the socket once its buffer
+passes a high-water mark. Bursts of messages therefore cost few system
+calls, while slow readers still apply backpressure.
+"""
+
+import asyncio
+import json
+import struct
+from typing import Any, Optional, Tuple
+
+_LENGTH = struct.Struct('!I')
+
+# Frame kinds
+MESSAGE = 1
+CONTROL = 2
+REPLY = 3
+DELIVERY = 4
+REQUEST = 5
+RESPONSE = 6
+
+# Refuse frames larger than this (a corrupt length prefix would otherwise
+# make the reader try to allocate gigabytes)
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class FrameError(ConnectionError):
+    """Raised on a malformed or oversized frame."""
+
+
+def encode_frame(kind: int, body: bytes) -> bytes:
+    """Build one frame."""
+    return _LENGTH.pack(len(body) + 1) + bytes((kind,)) + body
+
+
+def encode_control(kind: int, payload: Any) -> bytes:
+    """Build a frame with a JSON body."""
+    return encode_frame(kind, json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_control(body: bytes) -> Any:
+    """Parse the JSON body of a control/reply frame."""
+    return json.loads(body.decode('utf-8'))
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Tuple[int, bytes]]:
+    """
+    Read one frame.
+
+    Returns:
+        ``(kind, body)``, or None if the peer closed the stream cleanly
+    """
+    try:
+        header = await reader.readexactly(_LENGTH.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise FrameError("Connection closed mid-frame") from None
+        return None
+    (length,) = _LENGTH.unpack(header)
+    if length == 0 or length > MAX_FRAME_BYTES:
+        raise FrameError(f"Invalid frame length: {length}")
+    try:
+        payload = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        raise FrameError("Connection closed mid-frame") from None
+    return payload[0], payload[1:]
+
+
+class FrameWriter:
+    """Coalescing frame writer with high-water-mark backpressure."""
+
+    def __init__(self, writer: asyncio.StreamWriter, high_water: int = 256 * 1024):
+        """
+        Args:
+            writer: Underlying stream writer
+            high_water: Buffered bytes above which ``send`` waits for the socket
+        """
+        self.writer = writer
+        self.high_water = high_water
+        self.frames_sent = 0
+        self.writes = 0
+        self._pending = []
+        self._pending_bytes = 0
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+    def write(self, frame: bytes):
+        """Queue ``frame`` for the next coalesced write (never waits)."""
+        self._pending.append(frame)
+        self._pending_bytes += len(frame)
+        self.frames_sent += 1
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._write_pending)
+
+    async def send(self, frame: bytes):
+        """Queue ``frame``; waits only while the buffered bytes are over the mark."""
+        self.write(frame)
+        if self._pending_bytes + self.writer.transport.get_write_buffer_size() > self.high_water:
+            self._write_pending()
+            await self.writer.drain()
+
+    async def flush(self):
+        """Wait until everything queued has been handed to the socket."""
+        self._write_pending()
+        await self.writer.drain()
+
+    def _write_pending(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        data = self._pending[0] if len(self._pending) == 1 else b"".join(self._pending)
+        self._pending = []
+        self._pending_bytes = 0
+        if not self.writer.is_closing():
+            self.writer.write(data)
+            self.writes += 1
+
+    async def close(self):
+        """Flush and close the stream."""
+        try:
+            await self.flush()
+        except ConnectionError:
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
@@ -0,0 +1,349 @@
+"""Write-ahead message log for the Communication Hub.
+
+Every message accepted by ``send_message`` is appended to the log before it
+is queued, and acknowledged once every delivery lane has handled it. After a
+crash or restart, messages that were logged but never acknowledged are
+replayed by ``CommunicationHub.start``.
+
+On disk the log is a directory of append-only segment files
+(``wal-00000001.log``, ...). Each record is a frame::
+
+    kind (1 byte) | payload length (4) | crc32 of payload (4) | payload
+
+``ENQUEUE`` payloads are codec-encoded messages; ``ACK`` payloads are
+message ids. A torn or corrupt frame ends recovery of its segment.
+
+Durability uses group commit: ``append`` adds the frame to an in-memory
+batch and waits; a single flusher writes the whole batch and fsyncs it once
+(in a worker thread), then wakes every waiter. Concurrent senders therefore
+share one fsync. Acks are buffered and ride along with the next commit;
+losing one in a crash only means the message is delivered again.
+
+A segment is deleted once every message it logged has been acknowledged
+and all older segments are gone. Compacting only from the front means an
+ACK record is never deleted while the ENQUEUE it refers to survives.
+"""
+
+import asyncio
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from codecollab.core.codec import CodecError, MessageCodec, get_codec
+from codecollab.core.message import Message
+
+_FRAME = struct.Struct('!BII')
+_ENQUEUE = 1
+_ACK = 2
+
+_SEGMENT_PREFIX = "wal-"
+_SEGMENT_SUFFIX = ".log"
+
+
+def _segment_name(segment_id: int) -> str:
+    return f"{_SEGMENT_PREFIX}{segment_id:08d}{_SEGMENT_SUFFIX}"
+
+
+def _frame(kind: int, payload: bytes) -> bytes:
+    return _FRAME.pack(kind, len(payload), zlib.crc32(payload)) + payload
+
+
+class WriteAheadLog:
+    """Segmented, append-only message log with group-commit fsync."""
+
+    def __init__(self, directory: str, segment_bytes: int = 16 * 1024 * 1024,
+                 codec: Optional[MessageCodec] = None, fsync: bool = True):
+        """
+        Args:
+            directory: Directory holding the segment files (created if missing)
+            segment_bytes: Size after which a new segment is started
+            codec: Message codec for ENQUEUE records (default: binary)
+            fsync: fsync each commit (False = write only, e.g. for tests)
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.codec = codec or get_codec("binary")
+        self.fsync = fsync
+
+        # Segment id -> messages logged there and not yet acknowledged
+        self._live: "OrderedDict[int, int]" = OrderedDict()
+        self._segment_of: Dict[str, int] = {}
+        self._recovered: List[Message] = []
+        self._active_id = 0
+        self._active_size = 0
+
+        # Group commit state (event-loop side)
+        # (segment id, frame, message id of an ENQUEUE record or None)
+        self._batch: List[Tuple[int, bytes, Optional[str]]] = []
+        self._waiters: List[asyncio.Future] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # Writer state (only touched by the flusher's worker thread)
+        self._file = None
+        self._file_id = 0
+
+        self.is_open = False
+        self.stats = {
+            'appended': 0, 'acked': 0, 'commits': 0, 'bytes_written': 0,
+            'recovered': 0, 'compacted_segments': 0, 'corrupt_frames': 0
+        }
+
+    # -- lifecycle --------------------------------------------------------
+
+    def open(self):
+        """
+        Scan existing segments, collect unacknowledged messages, start a new segment.
+
+        Reopening a log closed in this process resumes from its in-memory
+        state instead: nothing is scanned or recovered twice, and no file is
+        opened until the next write.
+        """
+        if self.is_open:
+            return
+        if self._active_id:
+            self.is_open = True
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        pending: "OrderedDict[str, Tuple[int, Message]]" = OrderedDict()
+        segment_ids = self._existing_segments()
+        for segment_id in segment_ids:
+            self._live[segment_id] = 0
+            for kind, payload in self._read_segment(segment_id):
+                if kind == _ENQUEUE:
+                    try:
+                        message = self.codec.decode(payload)
+                    except CodecError:
+                        self.stats['corrupt_frames'] += 1
+                        continue
+                    pending[message.id] = (segment_id, message)
+                elif kind == _ACK:
+                    pending.pop(payload.decode('utf-8'), None)
+        for message_id, (segment_id, message) in pending.items():
+            self._live[segment_id] += 1
+            self._segment_of[message_id] = segment_id
+            self._recovered.append(message)
+        self.stats['recovered'] = len(self._recovered)
+
+        self._active_id = (segment_ids[-1] if segment_ids else 0) + 1
+        self._active_size = 0
+        self._live[self._active_id] = 0
+        self.is_open = True
+        # Segments with nothing pending can go straight away
+        self._delete_segments(self._compactable())
+
+    async def close(self):
+        """Commit everything buffered and close the active segment (``open`` resumes)."""
+        await self.commit()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_id = 0
+        self.is_open = False
+
+    def take_recovered(self) -> List[Message]:
+        """Unacknowledged messages found by ``open``, oldest first (returned once)."""
+        recovered, self._recovered = self._recovered, []
+        return recovered
+
+    # -- writing ----------------------------------------------------------
+
+    async def append(self, message: Message):
+        """Log ``message``; returns once the record is durable."""
+        self._add(_ENQUEUE, self.codec.encode(message), message.id)
+        await self._commit_pending()
+
+    async def append_many(self, messages: Iterable[Message]):
+        """Log several messages with one commit."""
+        encode = self.codec.encode
+        for message in messages:
+            self._add(_ENQUEUE, encode(message), message.id)
+        await self._commit_pending()
+
+    def ack(self, message_id: str):
+        """Mark a message as fully delivered (persisted with the next commit)."""
+        segment_id = self._segment_of.pop(message_id, None)
+        if segment_id is None:
+            return
+        self._live[segment_id] -= 1
+        self.stats['acked'] += 1
+        # Rides along with the next append or commit; no fsync of its own
+        frame = _frame(_ACK, message_id.encode('utf-8'))
+        self._batch.append((self._place(len(frame)), frame, None))
+
+    async def commit(self):
+        """Wait until everything buffered so far is on disk."""
+        if self._batch or (self._flush_task is not None and not self._flush_task.done()):
+            await self._commit_pending()
+
+    def pending_count(self) -> int:
+        """Messages logged and not yet acknowledged."""
+        return len(self._segment_of)
+
+    def get_stats(self) -> Dict:
+        """Counters plus the current segment and pending counts."""
+        return {
+            **self.stats,
+            'pending': self.pending_count(),
+            'segments': len(self._live),
+            'active_segment': self._active_id
+        }
+
+    # -- group commit -----------------------------------------------------
+
+    def _add(self, kind: int, payload: bytes, message_id: str):
+        if not self.is_open:
+            raise RuntimeError("WriteAheadLog is not open")
+        frame = _frame(kind, payload)
+        segment_id = self._place(len(frame))
+        self._batch.append((segment_id, frame, message_id))
+        self._live[segment_id] += 1
+        self._segment_of[message_id] = segment_id
+        self.stats['appended'] += 1
+
+    def _place(self, size: int) -> int:
+        """Segment the next ``size``-byte frame goes to, rotating when full."""
+        if self._active_size and self._active_size + size > self.segment_bytes:
+            self._active_id += 1
+            self._active_size = 0
+            self._live[self._active_id] = 0
+        self._active_size += size
+        return self._active_id
+
+    async def _commit_pending(self):
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._ensure_flusher()
+        await waiter
+
+    def _ensure_flusher(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        while self._batch or self._waiters:
+            batch, self._batch = self._batch, []
+            waiters, self._waiters = self._waiters, []
+            try:
+                try:
+                    written = await loop.run_in_executor(None, self._write_batch, batch)
+                except Exception:
+                    self._forget(batch)
+                    raise
+                self.stats['commits'] += 1
+                self.stats['bytes_written'] += written
+                compactable = self._compactable()
+                if compactable:
+                    await loop.run_in_executor(None, self._delete_segments, compactable)
+            except Exception as e:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                continue
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _forget(self, batch: List[Tuple[int, bytes, Optional[str]]]):
+        # The senders are told the append failed and never ack these messages;
+        # still counting them would keep their segments from compacting
+        for segment_id, _, message_id in batch:
+            if message_id is not None and self._segment_of.get(message_id) == segment_id:
+                del self._segment_of[message_id]
+                self._live[segment_id] -= 1
+
+    # -- worker-thread side -----------------------------------------------
+
+    def _write_batch(self, batch: List[Tuple[int, bytes, Optional[str]]]) -> int:
+        written = 0
+        index = 0
+        while index < len(batch):
+            segment_id = batch[index][0]
+            chunk = []
+            while index < len(batch) and batch[index][0] == segment_id:
+                chunk.append(batch[index][1])
+                index += 1
+            handle = self._writer_for(segment_id)
+            data = b"".join(chunk)
+            handle.write(data)
+            written += len(data)
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        return written
+
+    def _writer_for(self, segment_id: int):
+        if self._file_id != segment_id:
+            if self._file is not None:
+                # The previous segment is complete; make it durable before moving on
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                self._file.close()
+            self._file = open(os.path.join(self.directory, _segment_name(segment_id)), "ab")
+            self._file_id = segment_id
+            if self.fsync:
+                self._sync_directory()
+        return self._file
+
+    def _sync_directory(self):
+        # Make the new segment's directory entry durable (POSIX only)
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def _compactable(self) -> List[int]:
+        # Only a fully acknowledged prefix of segments, never the one being written
+        segment_ids = []
+        for segment_id, live in self._live.items():
+            if live or segment_id >= self._active_id or segment_id == self._file_id:
+                break
+            segment_ids.append(segment_id)
+        for segment_id in segment_ids:
+            del self._live[segment_id]
+        return segment_ids
+
+    def _delete_segments(self, segment_ids: List[int]):
+        for segment_id in segment_ids:
+            try:
+                os.remove(os.path.join(self.directory, _segment_name(segment_id)))
+            except FileNotFoundError:
+                pass
+            self.stats['compacted_segments'] += 1
+
+    # -- reading ----------------------------------------------------------
+
+    def _existing_segments(self) -> List[int]:
+        segment_ids = []
+        for name in os.listdir(self.directory):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+                try:
+                    segment_ids.append(int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(segment_ids)
+
+    def _read_segment(self, segment_id: int) -> Iterable[Tuple[int, bytes]]:
+        with open(os.path.join(self.directory, _segment_name(segment_id)), "rb") as handle:
+            data = handle.read()
+        offset = 0
+        while offset + _FRAME.size <= len(data):
+            kind, length, checksum = _FRAME.unpack_from(data, offset)
+            start = offset + _FRAME.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum or kind not in (_ENQUEUE, _ACK):
+                # Torn write at the tail (or corruption): nothing after it is trusted
+                self.stats['corrupt_frames'] += 1
+                return
+            yield kind, payload
+            offset = start + length
@@ -0,0 +1,12 @@
+"""
+Shared fixtures for the test suite (helpers live in tests/helpers.py)
+"""
+
+import pytest
+from tests.helpers import FakeClock
+
+
+@pytest.fixture
+def clock():
+    """A FakeClock starting at 0."""
+    return FakeClock()
@@ -0,0 +1,27 @@
+"""
+Shared test helpers: a manual clock and a message factory
+"""
+
+from codecollab.core.message import AgentRole, Message, MessageType
+
+
+class FakeClock:
+    """Manually advanced clock; set or bump ``now`` to move time."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_message(content="hi", sender=AgentRole.ORCHESTRATOR, recipient=AgentRole.DEVELOPER,
+                 message_type=MessageType.STATUS_UPDATE, **fields):
+    """A message with test defaults; any other Message field by keyword."""
+    return Message(
+        sender=sender,
+        recipient=recipient,
+        message_type=message_type,
+        content=content,
+        **fields
+    )
@@ -0,0 +1,157 @@
+"""
+Test suite for hub admission control and backpressure
+"""
+
+import pytest
+import asyncio
+from codecollab.core.admission import AdmissionController, OverflowPolicy
+from codecollab.core.communication_hub import (
+    CommunicationHub, AgentRole, MessagePriority
+)
+from tests.helpers import make_message
+
+
+async def drain(hub, received):
+    async def handler(message):
+        received.append(message.content)
+    hub.subscribe(AgentRole.DEVELOPER, handler)
+    await hub.start()
+    await asyncio.sleep(0.05)
+    await hub.stop()
+
+
+class TestAdmissionControl:
+    """Test suite for AdmissionController policies."""
+
+    @pytest.mark.asyncio
+    async def test_reject_policy(self):
+        hub = CommunicationHub(admission=AdmissionController(
+            priority_capacity={MessagePriority.LOW: 2}
+        ))
+        results = [await hub.send_message(make_message(str(i), priority=MessagePriority.LOW))
+                   for i in range(3)]
+        assert results == [True, True, False]
+        assert await hub.send_message(make_message("medium"))
+
+        stats = hub.get_stats()
+        assert stats['delivery_stats']['total_rejected'] == 1
+        assert stats['admission']['pending_by_priority'] == {'LOW': 2}
+        assert stats['queue_depths']['LOW'] == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self):
+        hub = CommunicationHub(admission=AdmissionController(
+            sender_capacity=2, sender_policy=OverflowPolicy.DROP_OLDEST
+        ))
+        for i in range(4):
+            assert await hub.send_message(make_message(str(i)))
+        assert hub.get_stats()['admission']['pending_by_sender'] == {'orchestrator': 2}
+
+        received = []
+        await drain(hub, received)
+        assert received == ["2", "3"]
+        assert hub.delivery_stats['total_dropped'] == 2
+        assert hub.admission.pending_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_rejection_in_one_group_drops_nothing_in_another(self):
+        hub = CommunicationHub(admission=AdmissionController(
+            priority_capacity={MessagePriority.MEDIUM: 2},
+            priority_policy=OverflowPolicy.DROP_OLDEST,
+            sender_capacity=1
+        ))
+        assert await hub.send_message(make_message("reviewer", sender=AgentRole.REVIEWER))
+        assert await hub.send_message(make_message("pm", sender=AgentRole.PRODUCT_MANAGER))
+        # The priority class would drop "reviewer", but the PM's own limit refuses the message
+        assert not await hub.send_message(make_message("pm-2", sender=AgentRole.PRODUCT_MANAGER))
+        assert hub.delivery_stats['total_dropped'] == 0
+        # A victim shared by both full groups makes room in each
+        assert await hub.send_message(make_message("reviewer-2", sender=AgentRole.REVIEWER))
+        assert hub.delivery_stats['total_dropped'] == 1
+
+        received = []
+        await drain(hub, received)
+        assert received == ["pm", "reviewer-2"]
+
+    @pytest.mark.asyncio
+    async def test_drop_lowest_priority_policy(self):
+        hub = CommunicationHub(admission=AdmissionController(
+            sender_capacity={AgentRole.ORCHESTRATOR: 2},
+            sender_policy=OverflowPolicy.DROP_LOWEST_PRIORITY
+        ))
+        assert await hub.send_message(make_message("low", priority=MessagePriority.LOW))
+        assert await hub.send_message(make_message("high", priority=MessagePriority.HIGH))
+        assert await hub.send_message(make_message("urgent", priority=MessagePriority.URGENT))
+        # Nothing lower than LOW is pending, so a new LOW message is refused
+        assert not await hub.send_message(make_message("low-2", priority=MessagePriority.LOW))
+        # Senders without a configured limit are not constrained
+        assert await hub.send_message(make_message("pm", sender=AgentRole.PRODUCT_MANAGER))
+
+        received = []
+        await drain(hub, received)
+        assert received == ["urgent", "high", "pm"]
+
+    @pytest.mark.asyncio
+    async def test_block_policy_waits_for_delivery(self):
+        hub = CommunicationHub(admission=AdmissionController(
+            priority_capacity={MessagePriority.MEDIUM: 1},
+            priority_policy=OverflowPolicy.BLOCK
+        ))
+        received = []
+
+        async def handler(message):
+            received.append(message.content)
+
+        hub.subscribe(AgentRole.DEVELOPER, handler)
+        assert await hub.send_message(make_message("first"))
+        blocked = asyncio.create_task(hub.send_message(make_message("second")))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        await hub.start()
+        try:
+            assert await asyncio.wait_for(blocked, timeout=1.0)
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+        assert received == ["first", "second"]
+        assert hub.admission.stats['blocked'] == 1
+
+    @pytest.mark.asyncio
+    async def test_block_timeout_rejects(self):
+        hub = CommunicationHub(admission=AdmissionController(
+            priority_capacity={MessagePriority.MEDIUM: 1},
+            priority_policy=OverflowPolicy.BLOCK,
+            block_timeout=0.02
+        ))
+        assert await hub.send_message(make_message("first"))
+        assert not await hub.send_message(make_message("second"))
+        assert hub.delivery_stats['total_rejected'] == 1
+
+    def test_drop_lowest_priority_refused_for_priority_classes(self):
+        with pytest.raises(ValueError):
+            AdmissionController(
+                priority_capacity={MessagePriority.LOW: 2},
+                priority_policy=OverflowPolicy.DROP_LOWEST_PRIORITY
+            )
+
+    @pytest.mark.asyncio
+    async def test_failed_queueing_releases_capacity(self):
+        class FullDisk:
+            def open(self):
+                pass
+
+            async def append(self, message):
+                raise OSError("disk full")
+
+            async def append_many(self, messages):
+                raise OSError("disk full")
+
+        hub = CommunicationHub(admission=AdmissionController(sender_capacity=1))
+        hub.wal = FullDisk()
+        assert not await hub.send_message(make_message("lost"))
+        assert await hub.send_messages([make_message("lost-too")]) == 0
+        assert hub.admission.pending_count() == 0
+
+        hub.wal = None
+        assert await hub.send_message(make_message("kept"))
@@ -0,0 +1,165 @@
+"""
+Test suite for the memory-mapped message archive
+"""
+
+import asyncio
+import threading
+
+import pytest
+from codecollab.core.archive import MessageArchive
+from codecollab.core.communication_hub import (
+    CommunicationHub, Message, AgentRole, MessageType
+)
+from tests.helpers import make_message
+
+
+class TestMessageArchive:
+    """Test suite for MessageArchive."""
+
+    def test_lookup_by_id_across_segments_and_reopen(self, tmp_path):
+        archive = MessageArchive(str(tmp_path), segment_messages=4)
+        messages = [make_message(str(i)) for i in range(10)]
+        for message in messages:
+            archive.append(message)
+        assert archive.get_stats()['segments'] == 2
+        assert archive.get(messages[1].id) == messages[1]
+        assert archive.get(messages[9].id) == messages[9]  # still buffered
+        assert archive.get("missing") is None
+        archive.close()
+
+        reopened = MessageArchive(str(tmp_path), segment_messages=4)
+        assert len(reopened) == 10
+        assert reopened.get(messages[9].id) == messages[9]
+        reopened.append(make_message("after reopen"))
+        reopened.flush()
+        assert [m.content for m in reopened.between(
+            AgentRole.ORCHESTRATOR, AgentRole.DEVELOPER, limit=2
+        ).messages] == ["9", "after reopen"]
+        reopened.close()
+
+    def test_pages_by_pair_and_conversation(self, tmp_path):
+        archive = MessageArchive(str(tmp_path), segment_messages=3)
+        for i in range(7):
+            # Both directions count as the same pair
+            if i % 2:
+                archive.append(make_message(f"pair-{i}", conversation_id="conv-b"))
+            else:
+                archive.append(make_message(f"pair-{i}", sender=AgentRole.DEVELOPER,
+                                            recipient=AgentRole.ORCHESTRATOR))
+            archive.append(make_message(f"noise-{i}", recipient=AgentRole.TESTER))
+
+        pages = []
+        cursor = None
+        while True:
+            page = archive.between(AgentRole.DEVELOPER, AgentRole.ORCHESTRATOR,
+                                   limit=3, before=cursor)
+            pages.append([m.content for m in page.messages])
+            cursor = page.cursor
+            if cursor is None:
+                break
+        assert pages == [["pair-4", "pair-5", "pair-6"], ["pair-1", "pair-2", "pair-3"], ["pair-0"]]
+
+        conversation = archive.by_conversation("conv-b", limit=10)
+        assert [m.content for m in conversation.messages] == ["pair-1", "pair-3", "pair-5"]
+        assert conversation.cursor is None
+        archive.close()
+
+    def test_multicast_indexed_for_every_recipient(self, tmp_path):
+        archive = MessageArchive(str(tmp_path))
+        message = Message(
+            sender=AgentRole.ORCHESTRATOR,
+            recipient=AgentRole.ORCHESTRATOR,
+            message_type=MessageType.STATUS_UPDATE,
+            content="kickoff",
+            recipients=[AgentRole.DEVELOPER, AgentRole.TESTER]
+        )
+        archive.append(message)
+        archive.flush()
+        for role in (AgentRole.DEVELOPER, AgentRole.TESTER):
+            assert archive.between(AgentRole.ORCHESTRATOR, role).messages == [message]
+        assert archive.between(AgentRole.ORCHESTRATOR, AgentRole.REVIEWER).messages == []
+        archive.close()
+
+
+class TestHubArchive:
+    """Test hub integration of the archive."""
+
+    @pytest.mark.asyncio
+    async def test_evicted_history_is_paged_from_archive(self, tmp_path):
+        archive = MessageArchive(str(tmp_path), segment_messages=4)
+        hub = CommunicationHub(history_limit=5, archive=archive)
+        messages = [make_message(str(i)) for i in range(20)]
+        for message in messages:
+            await hub.send_message(message)
+
+        assert len(hub.message_history) == 5
+        history = hub.get_conversation_history(AgentRole.ORCHESTRATOR, AgentRole.DEVELOPER, limit=12)
+        assert [m.content for m in history] == [str(i) for i in range(8, 20)]
+        memory_only = hub.get_conversation_history(
+            AgentRole.ORCHESTRATOR, AgentRole.DEVELOPER, limit=12, include_archived=False
+        )
+        assert len(memory_only) == 5
+
+        page = hub.get_archived_history(AgentRole.DEVELOPER, AgentRole.ORCHESTRATOR, limit=10)
+        assert [m.content for m in page.messages] == [str(i) for i in range(5, 15)]
+        page = hub.get_archived_history(AgentRole.DEVELOPER, AgentRole.ORCHESTRATOR,
+                                        limit=10, before=page.cursor)
+        assert [m.content for m in page.messages] == [str(i) for i in range(5)]
+        assert hub.get_archived_message(messages[0].id) == messages[0]
+        assert hub.get_stats()['archive']['messages'] == 15
+        archive.close()
+
+    @pytest.mark.asyncio
+    async def test_segments_sealed_off_the_loop_and_closed_on_stop(self, tmp_path, monkeypatch):
+        archive = MessageArchive(str(tmp_path), segment_messages=4)
+        loop_thread = threading.get_ident()
+        writers = []
+        write_segment = archive._write_segment
+
+        def recording_write(segment_id, buffer):
+            writers.append(threading.get_ident())
+            return write_segment(segment_id, buffer)
+
+        monkeypatch.setattr(archive, "_write_segment", recording_write)
+        hub = CommunicationHub(history_limit=1, archive=archive)
+        await hub.start()
+        messages = [make_message(str(i)) for i in range(10)]
+        for message in messages:
+            await hub.send_message(message)
+        # Sealing or not, every evicted message is still found
+        assert len(archive) == 9
+        assert archive.get(messages[0].id) == messages[0]
+
+        await hub.stop()
+        assert writers and loop_thread not in writers
+        assert not archive.is_open and archive.get_stats()['segments'] == 0
+
+        await hub.start()
+        assert archive.get_stats()['segments'] == 3
+        assert archive.get(messages[8].id) == messages[8]
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_batches_requeued_in_sequence(self, tmp_path, monkeypatch):
+        archive = MessageArchive(str(tmp_path), segment_messages=2)
+        write_segment = archive._write_segment
+        failures = [OSError("disk full")] * 2
+
+        def flaky_write(segment_id, buffer):
+            if failures:
+                raise failures.pop()
+            return write_segment(segment_id, buffer)
+
+        monkeypatch.setattr(archive, "_write_segment", flaky_write)
+        for i in range(5):
+            archive.append(make_message(str(i)))
+        await asyncio.wait([asyncio.wrap_future(future) for _, _, future in archive._sealing])
+        await asyncio.sleep(0)  # let the done callbacks collect
+
+        assert archive.get_stats()['segments'] == 0
+        assert [seq for seq, _ in archive._buffer] == [1, 2, 3, 4, 5]
+        archive.flush()
+        assert [m.content for m in archive.between(
+            AgentRole.ORCHESTRATOR, AgentRole.DEVELOPER, limit=10
+        ).messages] == ["0", "1", "2", "3", "4"]
+        archive.close()
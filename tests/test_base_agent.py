@@ -5,11 +5,13 @@ Comprehensive test suite for BaseAgent and related systems
 import pytest
 import pytest_asyncio
 import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 from codecollab.agents.base_agent import BaseAgent, AgentConfig, AgentState, AgentCapability
 from codecollab.agents.memory import AgentMemory, MemoryType, MemoryPriority
 from codecollab.agents.tools import ToolManager
 from codecollab.core.communication_hub import CommunicationHub, Message, AgentRole, MessageType
+from codecollab.core.message import DEADLINE
 
 
 # Concrete implementation for testing
@@ -152,6 +154,38 @@ class TestAgentIntegration:
         assert state_changes[1] == (AgentState.PROCESSING, AgentState.WAITING_FOR_RESPONSE)
         assert state_changes[2] == (AgentState.WAITING_FOR_RESPONSE, AgentState.IDLE)
     
+    @pytest.mark.asyncio
+    async def test_abandoned_requests_cancel_handler(self, test_agent, communication_hub):
+        """Test that handlers stop when the requester gives up or the deadline passes."""
+        finished = []
+        
+        async def slow_handler(message):
+            await asyncio.sleep(0.5)
+            finished.append(message.id)
+            return "too late"
+        
+        test_agent.register_message_handler(MessageType.TASK_REQUEST, slow_handler)
+        response = await communication_hub.send_request(
+            AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "slow task", timeout=0.05
+        )
+        assert response is None
+        
+        # A plain message whose deadline passes while the handler runs
+        await communication_hub.send_message(Message(
+            sender=AgentRole.PRODUCT_MANAGER,
+            recipient=AgentRole.DEVELOPER,
+            message_type=MessageType.TASK_REQUEST,
+            content="deadlined",
+            metadata={DEADLINE: time.time() + 0.05}
+        ))
+        await asyncio.sleep(0.15)
+        
+        assert finished == []
+        assert test_agent.metrics.tasks_cancelled == 2
+        assert test_agent.metrics.messages_sent == 0
+        assert test_agent.inflight_requests == {}
+        assert test_agent.state == AgentState.IDLE
+    
     @pytest.mark.asyncio
     async def test_agent_status(self, test_agent):
         """Test agent status reporting."""
@@ -0,0 +1,154 @@
+"""
+Test suite for the response cache
+"""
+
+import pytest
+from codecollab.core.cache import CACHE_RESPONSE, ResponseCache
+from codecollab.core.coalescing import request_key
+from codecollab.core.communication_hub import (
+    CommunicationHub, Message, AgentRole, MessageType
+)
+
+REVIEW = MessageType.COLLABORATION_REQUEST
+
+
+def make_response(content="ok", message_type=MessageType.TASK_RESPONSE, **metadata):
+    return Message(
+        sender=AgentRole.REVIEWER,
+        recipient=AgentRole.DEVELOPER,
+        message_type=message_type,
+        content=content,
+        metadata=metadata or None
+    )
+
+
+def key(content):
+    return request_key(AgentRole.REVIEWER, REVIEW, content)
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache."""
+
+    def test_lru_and_ttl_eviction(self, clock):
+        cache = ResponseCache({REVIEW: 10.0}, max_entries=2, clock=clock)
+        for content in ("a", "b"):
+            assert cache.put(key(content), REVIEW, make_response(content))
+        assert cache.get(key("a"), AgentRole.DEVELOPER).content == "a"  # "b" is now LRU
+        cache.put(key("c"), REVIEW, make_response("c"))
+        assert cache.get(key("b"), AgentRole.DEVELOPER) is None
+        clock.now = 11.0
+        assert cache.get(key("a"), AgentRole.DEVELOPER) is None
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['evicted'], stats['expired']) == (1, 2, 1, 1)
+        assert stats['entries'] == 1
+
+    def test_response_metadata_overrides_ttl(self, clock):
+        cache = ResponseCache([REVIEW], ttl=10.0, clock=clock)
+        assert not cache.put(key("no"), REVIEW, make_response(cache_ttl=0))
+        assert not cache.put(key("text"), REVIEW, make_response(cache_ttl="30"))
+        assert not cache.put(key("bool"), REVIEW, make_response(cache_ttl=True))
+        assert not cache.put(key("err"), REVIEW, make_response(message_type=MessageType.ERROR_REPORT))
+        assert cache.put(key("long"), REVIEW, make_response(cache_ttl=100))
+        assert cache.put(key("short"), REVIEW, make_response())
+        clock.now = 50.0
+        assert cache.get(key("long"), AgentRole.DEVELOPER) is not None
+        assert cache.get(key("short"), AgentRole.DEVELOPER) is None
+        assert not cache.caches(MessageType.TASK_REQUEST)
+
+    def test_request_metadata_opts_in_and_out(self):
+        cache = ResponseCache([REVIEW], ttl=10.0)
+        assert not cache.caches(REVIEW, {CACHE_RESPONSE: False})
+        assert cache.caches(MessageType.TASK_REQUEST, {CACHE_RESPONSE: True})
+        assert cache.caches(REVIEW, {'other': 1})
+
+    def test_hit_is_a_copy_addressed_to_the_requester(self):
+        cache = ResponseCache([REVIEW])
+        response = make_response(response_to="request-1")
+        cache.put(key("a"), REVIEW, response)
+        hit = cache.get(key("a"), AgentRole.TESTER)
+        assert (hit.sender, hit.recipient, hit.content) == (AgentRole.REVIEWER, AgentRole.TESTER, "ok")
+        assert hit.id != response.id and hit.get_meta('response_to') is None
+        assert response.recipient == AgentRole.DEVELOPER
+
+    def test_invalidation(self):
+        cache = ResponseCache([REVIEW, MessageType.TASK_REQUEST])
+        cache.put(key("a"), REVIEW, make_response())
+        cache.put(key("b"), REVIEW, make_response())
+        cache.put(request_key(AgentRole.TESTER, REVIEW, "a"), REVIEW, make_response())
+        cache.put(request_key(AgentRole.TESTER, MessageType.TASK_REQUEST, "a"),
+                  MessageType.TASK_REQUEST, make_response())
+        assert cache.invalidate(AgentRole.REVIEWER, REVIEW, "b") == 1
+        assert cache.invalidate(content="a", message_type=REVIEW) == 2
+        assert cache.invalidate(recipient=AgentRole.REVIEWER) == 0
+        assert cache.invalidate() == 1
+        assert len(cache) == 0
+        assert cache.get_stats()['invalidated'] == 4
+
+
+class TestHubResponseCache:
+    """Test the cache in front of send_request."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_requests_skip_the_handler(self):
+        hub = CommunicationHub(response_cache=ResponseCache([REVIEW]), coalesce_window=1.0)
+        calls = []
+
+        async def reviewer(message):
+            calls.append(message.content)
+            await hub.send_message(Message(
+                sender=AgentRole.REVIEWER,
+                recipient=message.sender,
+                message_type=MessageType.TASK_RESPONSE,
+                content=f"lgtm: {message.content}",
+                metadata={'response_to': message.id}
+            ))
+
+        hub.subscribe(AgentRole.REVIEWER, reviewer)
+        await hub.start()
+        try:
+            async def review(content, message_type=REVIEW, sender=AgentRole.DEVELOPER, **metadata):
+                return await hub.send_request(sender, AgentRole.REVIEWER, content,
+                                              message_type=message_type, timeout=1.0,
+                                              metadata=metadata or None)
+
+            first = await review("diff 1")
+            hit = await review("diff 1", sender=AgentRole.TESTER)
+            assert hit.content == first.content and hit.recipient == AgentRole.TESTER
+            await review("diff 2")
+            await review("diff 1", MessageType.TASK_REQUEST)  # not a cached type
+            await review("diff 1", MessageType.TASK_REQUEST)
+            await review("diff 2", **{CACHE_RESPONSE: False})  # opted out
+            await review("diff 3", MessageType.TASK_REQUEST, **{CACHE_RESPONSE: True})
+            await review("diff 3", MessageType.TASK_REQUEST, **{CACHE_RESPONSE: True})
+            assert hub.invalidate_responses(AgentRole.REVIEWER, REVIEW, "diff 1") == 1
+            assert (await review("diff 1")).content == "lgtm: diff 1"
+        finally:
+            await hub.stop()
+
+        assert calls == ["diff 1", "diff 2", "diff 1", "diff 1", "diff 2", "diff 3", "diff 1"]
+        stats = hub.get_stats()['response_cache']
+        assert (stats['hits'], stats['misses'], stats['entries']) == (2, 4, 3)
+        assert CommunicationHub().invalidate_responses() == 0
+
+    @pytest.mark.asyncio
+    async def test_bad_cache_ttl_from_responder_is_not_cached(self):
+        hub = CommunicationHub(response_cache=ResponseCache([REVIEW]))
+
+        async def reviewer(message):
+            await hub.send_message(Message(
+                sender=AgentRole.REVIEWER,
+                recipient=message.sender,
+                message_type=MessageType.TASK_RESPONSE,
+                content="lgtm",
+                metadata={'response_to': message.id, 'cache_ttl': "30"}
+            ))
+
+        hub.subscribe(AgentRole.REVIEWER, reviewer)
+        await hub.start()
+        try:
+            response = await hub.send_request(AgentRole.DEVELOPER, AgentRole.REVIEWER, "diff",
+                                              message_type=REVIEW, timeout=1.0)
+        finally:
+            await hub.stop()
+        assert response.content == "lgtm"
+        assert len(hub.response_cache) == 0
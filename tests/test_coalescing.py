@@ -0,0 +1,158 @@
+"""
+Test suite for single-flight request coalescing
+"""
+
+import asyncio
+import pytest
+from codecollab.core.coalescing import RequestCoalescer, request_key
+from codecollab.core.communication_hub import (
+    CommunicationHub, Message, AgentRole, MessageType
+)
+
+
+def make_hub(calls, delay=0.02, **options):
+    hub = CommunicationHub(**options)
+
+    async def developer(message):
+        calls.append(message.content)
+        await asyncio.sleep(delay)
+        await hub.send_message(Message(
+            sender=AgentRole.DEVELOPER,
+            recipient=message.sender,
+            message_type=MessageType.TASK_RESPONSE,
+            content=f"done: {message.content}",
+            metadata={'response_to': message.id}
+        ))
+
+    hub.subscribe(AgentRole.DEVELOPER, developer)
+    return hub
+
+
+class TestRequestCoalescer:
+    """Test suite for RequestCoalescer."""
+
+    def test_request_key(self):
+        key = request_key(AgentRole.DEVELOPER, MessageType.TASK_REQUEST, "build it")
+        assert key == request_key(AgentRole.DEVELOPER, MessageType.TASK_REQUEST, "build it")
+        assert key != request_key(AgentRole.TESTER, MessageType.TASK_REQUEST, "build it")
+        assert key != request_key(AgentRole.DEVELOPER, MessageType.TASK_REQUEST, "build it!")
+
+    @pytest.mark.asyncio
+    async def test_window_limits_joining(self, clock):
+        coalescer = RequestCoalescer(window=1.0, clock=clock)
+        assert coalescer.join("k") is None
+        flight = coalescer.lead("k")
+        clock.now = 0.5
+        assert coalescer.join("k") is flight
+        clock.now = 1.5
+        assert coalescer.join("k") is None
+        newer = coalescer.lead("k")
+        coalescer.land("k", flight, None)  # the older flight must not retire the newer one
+        assert coalescer.join("k") is newer
+        coalescer.land("k", newer, None)
+        assert len(coalescer) == 0
+        assert coalescer.get_stats() == {'in_flight': 0, 'led': 2, 'coalesced': 2}
+
+
+class TestHubCoalescing:
+    """Test coalescing through send_request."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_delivery(self):
+        calls = []
+        hub = make_hub(calls, coalesce_window=1.0)
+        senders = [AgentRole.PRODUCT_MANAGER, AgentRole.REVIEWER, AgentRole.TESTER]
+        await hub.start()
+        try:
+            responses = await asyncio.gather(
+                *(hub.send_request(sender, AgentRole.DEVELOPER, "build", timeout=1.0)
+                  for sender in senders),
+                hub.send_request(AgentRole.TESTER, AgentRole.DEVELOPER, "test", timeout=1.0),
+                hub.send_request(AgentRole.TESTER, AgentRole.DEVELOPER, "build",
+                                 timeout=1.0, coalesce=False)
+            )
+            # Once the flight has landed, the next request is sent again
+            again = await hub.send_request(AgentRole.TESTER, AgentRole.DEVELOPER, "build", timeout=1.0)
+        finally:
+            await hub.stop()
+
+        assert sorted(calls) == ["build", "build", "build", "test"]
+        # Each caller gets a reply addressed to itself, answering the request sent for all
+        assert [r.recipient for r in responses[:3]] == senders
+        assert len({r.get_meta('response_to') for r in responses[:3]}) == 1
+        assert responses[1] is not responses[0] and responses[1].id != responses[0].id
+        assert [r.content for r in responses] == ["done: build"] * 3 + ["done: test", "done: build"]
+        assert again is not responses[0]
+        assert hub.get_stats()['coalescing'] == {'in_flight': 0, 'led': 3, 'coalesced': 2}
+
+    @pytest.mark.asyncio
+    async def test_follower_timeout_leaves_leader_waiting(self):
+        calls = []
+        hub = make_hub(calls, delay=0.05, coalesce_window=1.0)
+        await hub.start()
+        try:
+            leader = asyncio.create_task(hub.send_request(
+                AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "build", timeout=1.0
+            ))
+            await asyncio.sleep(0)
+            follower = await hub.send_request(
+                AgentRole.REVIEWER, AgentRole.DEVELOPER, "build", timeout=0.01
+            )
+            assert follower is None
+            assert (await leader).content == "done: build"
+        finally:
+            await hub.stop()
+        assert calls == ["build"]
+
+    @pytest.mark.asyncio
+    async def test_short_leader_timeout_does_not_cut_off_followers(self):
+        calls = []
+        hub = make_hub(calls, delay=0.2, coalesce_window=1.0)
+        await hub.start()
+        try:
+            leader, follower = await asyncio.gather(
+                hub.send_request(AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "build", timeout=0.05),
+                hub.send_request(AgentRole.REVIEWER, AgentRole.DEVELOPER, "build", timeout=5.0)
+            )
+        finally:
+            await hub.stop()
+        assert leader is None
+        assert follower.content == "done: build"
+        assert calls == ["build"]
+        assert hub.delivery_stats['total_abandoned'] == 0
+
+    @pytest.mark.asyncio
+    async def test_abandoned_once_every_waiter_gave_up(self):
+        calls = []
+        hub = make_hub(calls, delay=0.2, coalesce_window=1.0)
+        await hub.start()
+        try:
+            responses = await asyncio.gather(*(
+                hub.send_request(AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "build", timeout=timeout)
+                for timeout in (0.02, 0.05)
+            ))
+            await asyncio.sleep(0)
+        finally:
+            await hub.stop()
+        assert responses == [None, None]
+        assert hub.delivery_stats['total_abandoned'] == 1
+        assert len(hub.coalescer) == 0
+        with pytest.raises(ValueError):
+            await CommunicationHub().send_request(
+                AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "build", coalesce=True
+            )
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        calls = []
+        hub = make_hub(calls)
+        await hub.start()
+        try:
+            await asyncio.gather(*(
+                hub.send_request(AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "build", timeout=1.0)
+                for _ in range(3)
+            ))
+        finally:
+            await hub.stop()
+        assert calls == ["build"] * 3
+        assert hub.get_stats()['coalescing'] is None
@@ -0,0 +1,85 @@
+"""
+Test suite for Message wire codecs
+"""
+
+import json
+import pytest
+from codecollab.core.codec import (
+    BinaryCodec, CodecError, JsonCodec, available_codecs, get_codec
+)
+from codecollab.core.message import AgentRole, Message, MessagePriority, MessageType
+
+
+def sample_messages():
+    return [
+        Message(
+            sender=AgentRole.PRODUCT_MANAGER,
+            recipient=AgentRole.DEVELOPER,
+            message_type=MessageType.TASK_REQUEST,
+            content="Implement login"
+        ),
+        Message(
+            id="fixed-id",
+            sender=AgentRole.TESTER,
+            recipient=AgentRole.REVIEWER,
+            message_type=MessageType.ERROR_REPORT,
+            content="Ünïcödé ✅ " * 100,
+            priority=MessagePriority.URGENT,
+            timestamp=1234.5,
+            metadata={'response_to': 'abc', 'nested': {'list': [1, 2.5, None, "x"]}},
+            requires_response=True,
+            conversation_id="conv-1"
+        ),
+        Message(
+            id="",
+            sender=AgentRole.ORCHESTRATOR,
+            recipient=AgentRole.ORCHESTRATOR,
+            message_type=MessageType.CONSENSUS,
+            content="",
+            priority=MessagePriority.LOW
+        ),
+        Message(
+            sender=AgentRole.ORCHESTRATOR,
+            recipient=AgentRole.ORCHESTRATOR,
+            message_type=MessageType.STATUS_UPDATE,
+            content="Broadcast",
+            metadata={'broadcast': True},
+            recipients=[AgentRole.DEVELOPER, AgentRole.TESTER]
+        ),
+    ]
+
+
+class TestCodecs:
+    """Round-trip tests for all registered codecs."""
+
+    @pytest.mark.parametrize("codec_name", ["json", "binary"])
+    def test_round_trip_matches_from_dict(self, codec_name):
+        codec = get_codec(codec_name)
+        for message in sample_messages():
+            decoded = codec.decode(codec.encode(message))
+            assert decoded == message
+            assert decoded == Message.from_dict(message.to_dict())
+
+    def test_json_codec_matches_to_dict_layout(self):
+        message = sample_messages()[1]
+        assert json.loads(JsonCodec().encode(message)) == message.to_dict()
+        assert Message.from_dict(json.loads(JsonCodec().encode(message))) == message
+
+    def test_binary_is_smaller_than_json(self):
+        message = sample_messages()[0]
+        assert len(BinaryCodec().encode(message)) < len(JsonCodec().encode(message))
+
+    def test_binary_rejects_bad_payloads(self):
+        codec = BinaryCodec()
+        payload = codec.encode(sample_messages()[1])
+        with pytest.raises(CodecError):
+            codec.decode(payload[:10])
+        with pytest.raises(CodecError):
+            codec.decode(payload[:-5])
+        with pytest.raises(CodecError):
+            codec.decode(b'\x09' + payload[1:])
+
+    def test_registry(self):
+        assert {"json", "binary"} <= set(available_codecs())
+        with pytest.raises(ValueError):
+            get_codec("xml")
@@ -10,6 +10,8 @@ from unittest.mock import AsyncMock, patch
 from codecollab.core.communication_hub import (
     CommunicationHub, Message, AgentRole, MessageType, MessagePriority, ConversationThread
 )
+from codecollab.core.message import DEADLINE
+from tests.helpers import make_message
 
 # --- TestMessage class ---
 class TestMessage:
@@ -108,6 +110,44 @@ class TestMessage:
         msg2 = Message.from_dict(data_no_meta)
         assert isinstance(msg2.metadata, dict)
         assert msg2.metadata == {}
+    def test_message_is_slotted_with_lazy_metadata(self):
+        message = Message(
+            sender=AgentRole.DEVELOPER,
+            recipient=AgentRole.REVIEWER,
+            message_type=MessageType.STATUS_UPDATE,
+            content="Compact"
+        )
+        assert not hasattr(message, '__dict__')
+        assert not message.has_metadata
+        assert message.get_meta('missing', 'default') == 'default'
+        assert message._metadata is None
+        message.metadata['key'] = 'value'
+        assert message.get_meta('key') == 'value'
+        assert message.to_dict()['metadata'] == {'key': 'value'}
+    def test_generated_ids_are_unique(self):
+        messages = [
+            Message(
+                sender=AgentRole.DEVELOPER,
+                recipient=AgentRole.REVIEWER,
+                message_type=MessageType.STATUS_UPDATE,
+                content=str(i)
+            )
+            for i in range(1000)
+        ]
+        ids = {m.id for m in messages} | {m.conversation_id for m in messages}
+        assert len(ids) == 2000
+    def test_message_equality(self):
+        kwargs = dict(
+            id="eq-1",
+            sender=AgentRole.DEVELOPER,
+            recipient=AgentRole.REVIEWER,
+            message_type=MessageType.STATUS_UPDATE,
+            content="Same",
+            timestamp=1.0,
+            conversation_id="conv"
+        )
+        assert Message(**kwargs) == Message(**kwargs, metadata={})
+        assert Message(**kwargs) != Message(**kwargs, metadata={'x': 1})
 
 # --- TestConversationThread class ---
 class TestConversationThread:
@@ -169,6 +209,267 @@ class TestConversationThread:
 # (Insert all test methods for TestCommunicationHub here)
 # ... (Due to length, the rest of the test suite code is as provided by the user) ...
 
+# --- TestRequestResponse class ---
+class TestRequestResponse:
+    """Test suite for send_request correlation."""
+
+    @staticmethod
+    def make_responder(hub, role):
+        async def responder(message):
+            if message.requires_response:
+                await hub.send_message(Message(
+                    sender=role,
+                    recipient=message.sender,
+                    message_type=MessageType.TASK_RESPONSE,
+                    content=f"done: {message.content}",
+                    metadata={'response_to': message.id}
+                ))
+        return responder
+
+    @pytest.mark.asyncio
+    async def test_request_resolves_and_clears_entry(self):
+        hub = CommunicationHub()
+        hub.subscribe(AgentRole.DEVELOPER, self.make_responder(hub, AgentRole.DEVELOPER))
+        await hub.start()
+        try:
+            for i in range(5):
+                response = await hub.send_request(
+                    AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, f"task {i}", timeout=1.0
+                )
+                assert response is not None
+                assert response.content == f"done: task {i}"
+            assert len(hub.pending_requests) == 0
+            assert hub.broadcast_subscribers == []
+        finally:
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_cancellation_clear_entry(self):
+        hub = CommunicationHub()
+        await hub.start()
+        try:
+            response = await hub.send_request(
+                AgentRole.PRODUCT_MANAGER, AgentRole.TESTER, "nobody home", timeout=0.05
+            )
+            assert response is None
+            assert len(hub.pending_requests) == 0
+
+            task = asyncio.create_task(hub.send_request(
+                AgentRole.PRODUCT_MANAGER, AgentRole.TESTER, "cancel me", timeout=5.0
+            ))
+            await asyncio.sleep(0.01)
+            assert len(hub.pending_requests) == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert len(hub.pending_requests) == 0
+        finally:
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_expired_messages_dropped_before_delivery(self):
+        hub = CommunicationHub()
+        seen = []
+
+        async def slow(message):
+            await asyncio.sleep(0.05)
+            seen.append(message.content)
+
+        hub.subscribe(AgentRole.DEVELOPER, slow)
+        for content, metadata in (
+            ("stale", {DEADLINE: time.time() - 1}),
+            ("fresh", {DEADLINE: time.time() + 60}),
+            ("app", {'deadline': time.time() - 1}),  # application metadata, not a hub deadline
+            ("odd", {DEADLINE: "Friday"}),  # not a number: ignored
+        ):
+            await hub.send_message(Message(
+                sender=AgentRole.PRODUCT_MANAGER,
+                recipient=AgentRole.DEVELOPER,
+                message_type=MessageType.STATUS_UPDATE,
+                content=content,
+                metadata=metadata
+            ))
+        await hub.start()
+        try:
+            # Queued behind "fresh"; its requester gives up before it is delivered
+            response = await hub.send_request(
+                AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "late", timeout=0.01
+            )
+            assert response is None
+            await hub.stop(drain=True, timeout=5.0)
+        finally:
+            await hub.stop()
+        assert seen == ["fresh", "app", "odd"]
+        assert hub.delivery_stats['total_failed'] == 0
+        assert hub.delivery_stats['total_expired'] == 2
+        assert hub.delivery_stats['total_abandoned'] == 1
+
+    @pytest.mark.asyncio
+    async def test_reply_from_wrong_sender_ignored(self):
+        hub = CommunicationHub()
+        # The reviewer answers requests addressed to the developer
+        hub.subscribe(AgentRole.DEVELOPER, self.make_responder(hub, AgentRole.REVIEWER))
+        await hub.start()
+        try:
+            response = await hub.send_request(
+                AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "task", timeout=0.1
+            )
+            assert response is None
+        finally:
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_sync_subscribers_supported(self):
+        hub = CommunicationHub()
+        seen = []
+        hub.subscribe(AgentRole.DEVELOPER, seen.append)
+        hub.subscribe_to_all(lambda message: seen.append(message.id))
+        await hub.start()
+        try:
+            message = Message(
+                sender=AgentRole.PRODUCT_MANAGER,
+                recipient=AgentRole.DEVELOPER,
+                message_type=MessageType.STATUS_UPDATE,
+                content="sync"
+            )
+            await hub.send_message(message)
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+        assert message in seen and message.id in seen
+        assert hub.delivery_stats['total_failed'] == 0
+
 # Run tests
 if __name__ == "__main__":
-    pytest.main([__file__, "-v", "--tb=short"]) 
\ No newline at end of file
+    pytest.main([__file__, "-v", "--tb=short"]) 
+
+# --- TestBatchSend class ---
+class TestBatchSend:
+    """Test suite for send_messages and batch-mode subscribers."""
+
+    @staticmethod
+    def make_messages(count, recipient=AgentRole.DEVELOPER):
+        return [
+            Message(
+                sender=AgentRole.PRODUCT_MANAGER,
+                recipient=recipient,
+                message_type=MessageType.STATUS_UPDATE,
+                content=f"msg {i}"
+            )
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_send_messages_matches_individual_sends(self):
+        hub = CommunicationHub()
+        received = []
+        hub.subscribe(AgentRole.DEVELOPER, lambda message: received.append(message.content))
+        messages = self.make_messages(50)
+        assert await hub.send_messages(iter(messages)) == 50
+        assert await hub.send_messages([]) == 0
+
+        stats = hub.get_stats()
+        assert stats['total_messages'] == 50
+        assert stats['delivery_stats']['total_sent'] == 50
+        assert stats['queue_size'] == 50
+        assert all(message.conversation_id in hub.conversations for message in messages)
+
+        await hub.start()
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+        assert received == [f"msg {i}" for i in range(50)]
+
+    @pytest.mark.asyncio
+    async def test_batch_subscriber_receives_lists(self):
+        hub = CommunicationHub()
+        batches = []
+        hub.subscribe(AgentRole.DEVELOPER, batches.append, batch_size=16)
+        await hub.send_messages(self.make_messages(40))
+        await hub.start()
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+
+        assert [len(batch) for batch in batches] == [16, 16, 8]
+        assert [m.content for batch in batches for m in batch] == [f"msg {i}" for i in range(40)]
+        assert hub.delivery_stats['total_delivered'] == 40
+        assert hub.get_stats()['lanes']['dev']['delivered'] == 40
+
+    @pytest.mark.asyncio
+    async def test_negotiation_notifies_participants_in_one_batch(self):
+        hub = CommunicationHub()
+        participants = [AgentRole.DEVELOPER, AgentRole.REVIEWER, AgentRole.TESTER]
+        negotiation_id = await hub.start_negotiation(participants, "API design")
+        assert negotiation_id in hub.active_negotiations
+        assert hub.message_queue.qsize() == 3
+        notices = hub.get_messages_by_type(MessageType.NEGOTIATION)
+        assert [m.recipient for m in notices] == participants
+        assert all(m.metadata['negotiation_id'] == negotiation_id for m in notices)
+
+
+# --- TestHubShutdown class ---
+class TestHubShutdown:
+    """Test the dispatcher loop's stop and drain modes."""
+
+    @pytest.mark.asyncio
+    async def test_drain_delivers_follow_up_messages(self):
+        hub = CommunicationHub()
+        received = []
+
+        async def developer(message):
+            await asyncio.sleep(0.001)
+            # Handlers may still send while the hub drains
+            await hub.send_message(Message(
+                sender=AgentRole.DEVELOPER,
+                recipient=AgentRole.TESTER,
+                message_type=MessageType.STATUS_UPDATE,
+                content=f"re: {message.content}"
+            ))
+
+        hub.subscribe(AgentRole.DEVELOPER, developer)
+        hub.subscribe(AgentRole.TESTER, lambda message: received.append(message.content))
+        await hub.start()
+        for i in range(20):
+            await hub.send_message(make_message(str(i)))
+        await hub.stop(drain=True, timeout=5.0)
+
+        assert received == [f"re: {i}" for i in range(20)]
+        assert hub.processing_task is None
+        assert hub.get_stats()['queue_size'] == 0
+
+    @pytest.mark.asyncio
+    async def test_drain_deadline_and_restart(self):
+        hub = CommunicationHub()
+        received = []
+
+        async def slow(message):
+            await asyncio.sleep(0.05)
+            received.append(message.content)
+
+        hub.subscribe(AgentRole.DEVELOPER, slow)
+        await hub.start()
+        for i in range(10):
+            await hub.send_message(make_message(str(i)))
+        await hub.stop(drain=True, timeout=0.12)
+        assert 1 <= len(received) < 10
+        assert hub.delivery.pending() + hub.message_queue.qsize() > 0
+
+        # Queued messages survive; only the handler cut off at the deadline is lost
+        await hub.start()
+        await hub.stop(drain=True, timeout=5.0)
+        assert len(received) == 9
+        assert received == sorted(received, key=int)
+
+    @pytest.mark.asyncio
+    async def test_plain_stop_leaves_ingress_queued(self):
+        hub = CommunicationHub()
+        await hub.start()
+        await asyncio.sleep(0)
+        task = hub.processing_task
+        await hub.send_message(make_message("late"))
+        await hub.stop()
+        assert task.done() and not task.cancelled()
+        assert hub.message_queue.qsize() == 1
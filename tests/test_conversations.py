@@ -0,0 +1,156 @@
+"""
+Test suite for the conversation store
+"""
+
+import pytest
+from codecollab.core.conversations import ConversationStore, ConversationThread
+from codecollab.core.communication_hub import (
+    CommunicationHub, Message, AgentRole, MessageType
+)
+from tests.helpers import make_message
+
+
+class TestConversationStore:
+    """Test suite for ConversationStore."""
+
+    def test_idle_threads_archived_after_ttl_and_revived(self, clock):
+        archived = []
+        store = ConversationStore(idle_ttl=60, clock=clock, on_archive=archived.append)
+        store.track(make_message(conversation_id="a"))
+        store.track(make_message(conversation_id="b"))
+        clock.now += 30
+        store.track(make_message("again", conversation_id="a"))
+        clock.now += 40  # "b" idle for 70s, "a" for 40s
+        store.expire()
+
+        assert list(store) == ["a"]
+        assert [thread.id for thread in archived] == ["b"]
+        summary = store.get_archived("b")
+        assert summary.message_count == 1
+        assert summary.final_status == "active"
+        assert "b" in store
+        assert store.count("active") == 1
+        assert store.count("archived") == 1
+
+        revived = store.track(make_message("back", conversation_id="b"))
+        assert revived.messages[0].content == "back"
+        assert revived.created_at == summary.created_at
+        assert store.get_archived("b") is None
+        assert store.count("active") == 2
+
+    def test_status_counters_follow_assignment(self):
+        store = ConversationStore()
+        for conversation_id in ("a", "b", "c"):
+            store.track(make_message(conversation_id=conversation_id))
+        store["a"].status = "completed"
+        assert store.set_status("b", "completed")
+        assert not store.set_status("missing", "completed")
+        assert (store.count("active"), store.count("completed")) == (1, 2)
+
+        store["c"].status = "archived"
+        assert "c" not in list(store)
+        assert store.get_archived("c").final_status == "active"
+        assert store.get_stats()['active'] == 0
+        assert store.count("archived") == 1
+
+    def test_default_limits_hold_only_what_is_tracked(self):
+        store = ConversationStore()
+        for i in range(2000):
+            store.track(make_message(f"one-off {i}"))
+        # One slot per message, however large the default window is
+        assert len(store) == 2000
+        assert sum(len(store[conversation_id].messages._slots) for conversation_id in store) == 2000
+
+    def test_live_and_archived_limits(self):
+        store = ConversationStore(max_live=2, max_archived=1)
+        for conversation_id in ("a", "b", "c", "d"):
+            store.track(make_message(conversation_id=conversation_id))
+        assert list(store) == ["c", "d"]
+        assert store.get_archived("b") is not None
+        assert "a" not in store
+        stats = store.get_stats()
+        assert stats['archived_total'] == 2
+        assert stats['forgotten'] == 1
+        with pytest.raises(ValueError):
+            ConversationStore(max_live=0)
+
+
+class TestConversationWindow:
+    """Test the ring-buffer message window and context views."""
+
+    def make_thread(self, **options):
+        return ConversationThread(id="conv", participants=[], messages=[], created_at=0.0, **options)
+
+    def test_window_caps_memory_and_views_stay_stable(self):
+        thread = self.make_thread(max_messages=5)
+        for i in range(8):
+            thread.add_message(make_message(str(i)))
+        assert [m.content for m in thread.messages] == ["3", "4", "5", "6", "7"]
+        assert thread.messages[-1].content == "7"
+        assert thread.message_count == 8
+
+        context = thread.get_context(3)
+        assert [m.content for m in context] == ["5", "6", "7"]
+        thread.add_message(make_message("8"))
+        # The view still shows the messages it was created over
+        assert [m.content for m in context] == ["5", "6", "7"]
+        assert context[-1].content == "7"
+        assert len(thread.get_context(50)) == 5
+        for i in range(9, 12):
+            thread.add_message(make_message(str(i)))
+        with pytest.raises(IndexError):
+            context[0]  # "5" has been evicted
+
+    def test_window_grows_on_demand(self):
+        thread = self.make_thread(max_messages=1000)
+        thread.add_message(make_message("only"))
+        # A one-message thread must not reserve the whole ring
+        assert len(thread.messages._slots) == 1
+        for i in range(1500):
+            thread.add_message(make_message(str(i)))
+        assert len(thread.messages._slots) == 1000
+        assert thread.messages[0].content == "500"
+
+    def test_summarizer_collapses_evicted_batches(self):
+        def summarize(digest, evicted):
+            covered = (digest.get_meta('covers') if digest else 0) + len(evicted)
+            return Message(
+                sender=AgentRole.ORCHESTRATOR,
+                recipient=AgentRole.ORCHESTRATOR,
+                message_type=MessageType.STATUS_UPDATE,
+                content=f"summary of {covered} messages",
+                metadata={'covers': covered}
+            )
+
+        thread = self.make_thread(max_messages=4, summarizer=summarize, summary_batch=2)
+        for i in range(7):
+            thread.add_message(make_message(str(i)))
+        # Full at 4; messages 4 and 6 each evicted a batch of two
+        assert [m.content for m in thread.messages] == ["4", "5", "6"]
+        context = thread.get_context(2)
+        assert [m.content for m in context] == ["summary of 4 messages", "5", "6"]
+        assert [m.content for m in thread.get_context(2, include_digest=False)] == ["5", "6"]
+
+
+class TestHubConversations:
+    """Test hub integration of the conversation store."""
+
+    @pytest.mark.asyncio
+    async def test_one_off_messages_stay_bounded(self):
+        hub = CommunicationHub(max_conversations=100)
+        for i in range(500):
+            await hub.send_message(make_message(f"one-off {i}"))
+        stats = hub.get_stats()
+        assert len(hub.conversations) == 100
+        assert stats['active_conversations'] == 100
+        assert stats['conversations']['archived'] == 400
+
+    @pytest.mark.asyncio
+    async def test_conversation_window_option(self):
+        hub = CommunicationHub(conversation_window=3)
+        for i in range(10):
+            await hub.send_message(make_message(str(i), conversation_id="long"))
+        thread = hub.conversations["long"]
+        assert len(thread.messages) == 3
+        assert thread.message_count == 10
+        assert [m.content for m in thread.get_context()] == ["7", "8", "9"]
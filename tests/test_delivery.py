@@ -0,0 +1,142 @@
+"""
+Test suite for the Communication Hub delivery engine
+"""
+
+import pytest
+import asyncio
+from codecollab.core.communication_hub import (
+    CommunicationHub, AgentRole
+)
+from tests.helpers import make_message
+
+
+class TestDeliveryEngine:
+    """Test suite for per-recipient delivery lanes."""
+
+    @pytest.mark.asyncio
+    async def test_slow_recipient_does_not_block_others(self):
+        hub = CommunicationHub()
+        release = asyncio.Event()
+        fast_received = []
+
+        async def slow_handler(message):
+            await release.wait()
+
+        async def fast_handler(message):
+            fast_received.append(message.content)
+
+        hub.subscribe(AgentRole.REVIEWER, slow_handler)
+        hub.subscribe(AgentRole.DEVELOPER, fast_handler)
+        await hub.start()
+        try:
+            await hub.send_message(make_message("slow-1", recipient=AgentRole.REVIEWER))
+            await hub.send_message(make_message("slow-2", recipient=AgentRole.REVIEWER))
+            for i in range(5):
+                await hub.send_message(make_message(f"fast-{i}", recipient=AgentRole.DEVELOPER))
+            await asyncio.sleep(0.05)
+
+            assert fast_received == [f"fast-{i}" for i in range(5)]
+            stats = hub.get_stats()
+            assert stats['in_flight']['reviewer'] == 1
+            assert stats['lanes']['reviewer']['pending'] == 1
+            assert stats['lanes']['dev']['delivered'] == 5
+        finally:
+            release.set()
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_per_recipient_order_preserved(self):
+        hub = CommunicationHub()
+        received = []
+
+        async def handler(message):
+            await asyncio.sleep(0)
+            received.append(message.content)
+
+        hub.subscribe(AgentRole.TESTER, handler)
+        await hub.start()
+        try:
+            for i in range(20):
+                await hub.send_message(make_message(str(i), recipient=AgentRole.TESTER))
+            await asyncio.sleep(0.1)
+        finally:
+            await hub.stop()
+        assert received == [str(i) for i in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_max_concurrent_deliveries(self):
+        hub = CommunicationHub(max_concurrent_deliveries=1)
+        running = 0
+        peak = 0
+
+        async def handler(message):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for role in (AgentRole.DEVELOPER, AgentRole.REVIEWER, AgentRole.TESTER):
+            hub.subscribe(role, handler)
+        await hub.start()
+        try:
+            for role in (AgentRole.DEVELOPER, AgentRole.REVIEWER, AgentRole.TESTER):
+                await hub.send_message(make_message("work", recipient=role))
+            await asyncio.sleep(0.1)
+        finally:
+            await hub.stop()
+        assert peak == 1
+        assert hub.delivery_stats['total_delivered'] == 3
+
+
+class TestBroadcastDelivery:
+    """Test suite for multicast broadcast delivery."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_shares_one_message(self):
+        hub = CommunicationHub()
+        received = {}
+        monitored = []
+
+        def make_handler(role):
+            async def handler(message):
+                received[role] = message
+            return handler
+
+        for role in (AgentRole.DEVELOPER, AgentRole.REVIEWER, AgentRole.TESTER):
+            hub.subscribe(role, make_handler(role))
+        hub.subscribe_to_all(monitored.append)
+        await hub.start()
+        try:
+            sent = await hub.broadcast_message(AgentRole.DEVELOPER, "Kickoff")
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+
+        assert sent.recipients == {AgentRole.REVIEWER, AgentRole.TESTER}
+        assert set(received) == {AgentRole.REVIEWER, AgentRole.TESTER}
+        assert all(message is sent for message in received.values())
+        assert monitored == [sent]
+        stats = hub.get_stats()
+        assert stats['total_messages'] == 1
+        assert stats['delivery_stats']['total_delivered'] == 2
+        assert stats['lanes']['reviewer']['delivered'] == 1
+        assert stats['lanes']['tester']['delivered'] == 1
+        history = hub.get_conversation_history(AgentRole.TESTER, AgentRole.DEVELOPER)
+        assert history == [sent]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_with_no_audience(self):
+        hub = CommunicationHub()
+        hub.subscribe(AgentRole.DEVELOPER, lambda message: None)
+        assert await hub.broadcast_message(AgentRole.DEVELOPER, "Only me") is None
+        assert hub.get_stats()['total_messages'] == 0
+
+    @pytest.mark.asyncio
+    async def test_broadcast_to_chosen_recipients(self):
+        hub = CommunicationHub()
+        sent = await hub.broadcast_message(
+            AgentRole.ORCHESTRATOR, "Subset",
+            recipients=[AgentRole.DEVELOPER, AgentRole.ORCHESTRATOR]
+        )
+        assert sent.recipients == {AgentRole.DEVELOPER}
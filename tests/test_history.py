@@ -0,0 +1,76 @@
+"""
+Test suite for the bounded, indexed message history
+"""
+
+import pytest
+from codecollab.core.history import MessageHistory
+from codecollab.core.communication_hub import (
+    CommunicationHub, AgentRole, MessageType
+)
+from tests.helpers import make_message
+
+
+class TestMessageHistory:
+    """Test suite for MessageHistory."""
+
+    def test_count_retention_keeps_newest(self):
+        evicted = []
+        history = MessageHistory(max_messages=3, on_evict=evicted.append)
+        for i in range(5):
+            history.append(make_message(sender=AgentRole.DEVELOPER, recipient=AgentRole.REVIEWER, content=str(i)))
+        assert [m.content for m in history] == ["2", "3", "4"]
+        assert [m.content for m in evicted] == ["0", "1"]
+        assert history.get_stats()['evicted'] == 2
+
+    def test_age_retention(self, clock):
+        history = MessageHistory(max_messages=None, max_age=10.0, clock=clock)
+        history.append(make_message(sender=AgentRole.DEVELOPER, recipient=AgentRole.TESTER, content="old"))
+        clock.now += 5
+        history.append(make_message(sender=AgentRole.DEVELOPER, recipient=AgentRole.TESTER, content="new"))
+        clock.now += 6
+        history.expire()
+        assert [m.content for m in history] == ["new"]
+        assert [m.content for m in history.by_type(MessageType.STATUS_UPDATE)] == ["new"]
+
+    def test_between_merges_both_directions(self):
+        history = MessageHistory()
+        dev, rev = AgentRole.DEVELOPER, AgentRole.REVIEWER
+        history.append(make_message(sender=dev, recipient=rev, content="a"))
+        history.append(make_message(sender=rev, recipient=dev, content="b"))
+        history.append(make_message(sender=dev, recipient=AgentRole.TESTER, content="other"))
+        history.append(make_message(sender=dev, recipient=rev, content="c"))
+        history.append(make_message(sender=rev, recipient=dev, content="d"))
+
+        assert [m.content for m in history.between(dev, rev)] == ["a", "b", "c", "d"]
+        assert [m.content for m in history.between(rev, dev, limit=3)] == ["b", "c", "d"]
+        assert [m.content for m in history.by_pair(dev, rev)] == ["a", "c"]
+
+    def test_indexes_shrink_on_eviction(self):
+        history = MessageHistory(max_messages=2)
+        for i in range(4):
+            history.append(make_message(sender=
+                AgentRole.DEVELOPER, recipient=AgentRole.REVIEWER, content=str(i),
+                message_type=MessageType.TASK_REQUEST if i % 2 else MessageType.NEGOTIATION,
+                conversation_id=f"conv-{i}"
+            ))
+        assert history.by_conversation("conv-0") == []
+        assert [m.content for m in history.by_conversation("conv-3")] == ["3"]
+        assert [m.content for m in history.by_type(MessageType.TASK_REQUEST)] == ["3"]
+        assert history.get_stats()['conversations_indexed'] == 2
+
+
+class TestHubHistory:
+    """Test hub integration of the history store."""
+
+    @pytest.mark.asyncio
+    async def test_hub_history_is_bounded(self):
+        hub = CommunicationHub(history_limit=10)
+        for i in range(25):
+            await hub.send_message(make_message(sender=
+                AgentRole.PRODUCT_MANAGER, recipient=AgentRole.DEVELOPER, content=str(i)
+            ))
+        stats = hub.get_stats()
+        assert stats['total_messages'] == 10
+        assert stats['delivery_stats']['total_sent'] == 25
+        history = hub.get_conversation_history(AgentRole.DEVELOPER, AgentRole.PRODUCT_MANAGER, limit=3)
+        assert [m.content for m in history] == ["22", "23", "24"]
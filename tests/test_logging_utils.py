@@ -0,0 +1,100 @@
+"""
+Test suite for hot-path logging helpers
+"""
+
+import io
+import json
+import logging
+import queue
+import pytest
+from codecollab.core import logging_utils
+from codecollab.core.logging_utils import (
+    BatchingLogListener, EventLogger, JsonFormatter, LogSampler,
+    configure_logging, shutdown_logging
+)
+
+
+class CountingArg:
+    """Counts how often it is rendered into a log message."""
+
+    def __init__(self):
+        self.rendered = 0
+
+    def __str__(self):
+        self.rendered += 1
+        return "arg"
+
+
+@pytest.fixture
+def reset_sampler():
+    yield
+    logging_utils.sampler.configure()
+
+
+class TestLogSampler:
+    """Test suite for LogSampler."""
+
+    def test_keeps_one_in_n_per_event(self):
+        sampler = LogSampler(rate=0.25, event_rates={'rare': 0.0, 'all': 1.0})
+        kept = [sampler.sample('queued') for _ in range(8)]
+        assert kept == [True, False, False, False, True, False, False, False]
+        assert not any(sampler.sample('rare') for _ in range(5))
+        assert all(sampler.sample('all') for _ in range(5))
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            LogSampler(rate=1.5)
+
+
+class TestEventLogger:
+    """Test suite for EventLogger."""
+
+    def test_disabled_level_never_formats(self, caplog):
+        logger = logging.getLogger("codecollab.test.disabled")
+        arg = CountingArg()
+        with caplog.at_level(logging.WARNING, logger="codecollab.test.disabled"):
+            EventLogger(logger).info("queued", "message %s", arg)
+        assert arg.rendered == 0
+        assert caplog.records == []
+
+    def test_sampled_events_carry_structured_fields(self, caplog, reset_sampler):
+        logging_utils.sampler.configure(rate=0.5)
+        logger = logging.getLogger("codecollab.test.sampled")
+        with caplog.at_level(logging.INFO, logger="codecollab.test.sampled"):
+            for i in range(4):
+                EventLogger(logger).info("queued", "message %d", i, sender="pm")
+        assert [r.getMessage() for r in caplog.records] == ["message 0", "message 2"]
+        record = json.loads(JsonFormatter().format(caplog.records[0]))
+        assert record['event'] == "queued"
+        assert record['sender'] == "pm"
+        assert record['message'] == "message 0"
+
+
+class TestBatchingLogListener:
+    """Test suite for the background log writer."""
+
+    def test_writes_batches_and_flushes_on_stop(self):
+        records = queue.SimpleQueue()
+        stream = io.StringIO()
+        listener = BatchingLogListener(records, stream, logging.Formatter("%(message)s"), max_batch=4)
+        for i in range(10):
+            records.put(logging.makeLogRecord({'msg': "line %d", 'args': (i,)}))
+        listener.start()
+        listener.stop()
+        assert stream.getvalue().splitlines() == [f"line {i}" for i in range(10)]
+        assert listener.written == 10
+        assert listener.batches >= 3
+
+    def test_configure_logging_routes_through_listener(self, reset_sampler):
+        stream = io.StringIO()
+        listener = configure_logging(structured=True, stream=stream)
+        try:
+            arg = CountingArg()
+            EventLogger(logging.getLogger("codecollab.test.configured")).info(
+                "queued", "message %s", arg
+            )
+        finally:
+            shutdown_logging()
+        assert listener.written == 1
+        assert json.loads(stream.getvalue())['message'] == "message arg"
+        assert logging.getLogger("codecollab").propagate
@@ -0,0 +1,109 @@
+"""
+Test suite for hub latency histograms and instrumentation
+"""
+
+import asyncio
+import json
+import pytest
+from codecollab.core.metrics import HubMetrics, LatencyHistogram
+from codecollab.core.communication_hub import (
+    CommunicationHub, AgentRole, MessagePriority
+)
+from tests.helpers import make_message
+
+
+class TestLatencyHistogram:
+    """Test suite for LatencyHistogram."""
+
+    def test_percentiles_within_relative_error(self):
+        histogram = LatencyHistogram()
+        samples = [i / 10_000 for i in range(1, 10_001)]  # 0.1ms .. 1s
+        for sample in samples:
+            histogram.record(sample)
+        assert histogram.count == 10_000
+        for pct, expected in ((50, 0.5), (99, 0.99), (99.9, 0.999)):
+            assert histogram.percentile(pct) == pytest.approx(expected, rel=0.02)
+        assert histogram.percentile(100) == pytest.approx(1.0)
+        assert histogram.snapshot()['p50_ms'] == pytest.approx(500, rel=0.02)
+
+    def test_merge_and_cumulative_counts(self):
+        fast, slow = LatencyHistogram(), LatencyHistogram()
+        for _ in range(3):
+            fast.record(0.0002)
+        slow.record(0.2)
+        slow.record(7200.0)  # clamped to max_seconds
+        fast.merge(slow)
+        assert fast.count == 5
+        assert fast.cumulative_counts([0.0001, 0.001, 1.0, 10_000.0]) == [0, 3, 4, 5]
+        assert LatencyHistogram().percentile(50) == 0.0
+        with pytest.raises(ValueError):
+            fast.merge(LatencyHistogram(precision_bits=4))
+
+
+class TestHubMetrics:
+    """Test stage timing through the hub."""
+
+    @pytest.mark.asyncio
+    async def test_stages_recorded_per_dimension(self):
+        metrics = HubMetrics()
+        hub = CommunicationHub(metrics=metrics)
+
+        async def slow_handler(message):
+            await asyncio.sleep(0.02)
+
+        hub.subscribe(AgentRole.DEVELOPER, slow_handler)
+        hub.subscribe(AgentRole.TESTER, lambda message: None)
+        await hub.start()
+        try:
+            await hub.send_message(make_message("a", priority=MessagePriority.HIGH))
+            await hub.send_messages([make_message("b", recipient=AgentRole.TESTER),
+                                     make_message("c", recipient=AgentRole.TESTER)])
+            await asyncio.sleep(0.1)
+        finally:
+            await hub.stop()
+
+        handler = metrics.histogram('handler', recipient=AgentRole.DEVELOPER)
+        assert handler.count == 1
+        assert handler.percentile(50) >= 0.02
+        total = metrics.histogram('total')
+        assert total.count == 3
+        assert total.max >= handler.max
+
+        snapshot = hub.get_stats()['latency']
+        assert snapshot['total']['all']['count'] == 3
+        assert snapshot['queue_wait']['recipient']['tester']['count'] == 2
+        assert snapshot['handler']['priority']['HIGH']['count'] == 1
+        assert snapshot['lane_wait']['message_type']['status_update']['count'] == 3
+        assert json.loads(metrics.to_json()) == snapshot
+
+    @pytest.mark.asyncio
+    async def test_prometheus_export(self):
+        metrics = HubMetrics()
+        hub = CommunicationHub(metrics=metrics)
+        hub.subscribe(AgentRole.DEVELOPER, lambda message: None)
+        await hub.start()
+        try:
+            await hub.send_message(make_message("x"))
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+
+        text = metrics.to_prometheus()
+        assert "# TYPE codecollab_hub_total_seconds histogram" in text
+        labels = 'recipient="dev",message_type="status_update",priority="MEDIUM"'
+        assert f'codecollab_hub_handler_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f'codecollab_hub_handler_seconds_count{{{labels}}} 1' in text
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        hub = CommunicationHub()
+        hub.subscribe(AgentRole.DEVELOPER, lambda message: None)
+        message = make_message("x")
+        await hub.start()
+        try:
+            await hub.send_message(message)
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+        assert hub.get_stats()['latency'] is None
+        assert not hasattr(message, '_trace')
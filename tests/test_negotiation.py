@@ -0,0 +1,150 @@
+"""
+Test suite for the negotiation engine
+"""
+
+import asyncio
+import pytest
+from codecollab.core.negotiation import (
+    AGREED, FAILED, NegotiationEngine, NegotiationError
+)
+from codecollab.core.communication_hub import (
+    CommunicationHub, AgentRole, MessageType
+)
+
+PM, DEV, REVIEWER, TESTER = (
+    AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, AgentRole.REVIEWER, AgentRole.TESTER
+)
+
+
+class TestNegotiationEngine:
+    """Test suite for NegotiationEngine."""
+
+    def test_majority_decides_on_the_deciding_vote(self):
+        engine = NegotiationEngine()
+        negotiation = engine.start("n1", [PM, DEV, REVIEWER], "API style")
+        rest = engine.propose("n1", DEV, "REST")
+        grpc = engine.propose("n1", REVIEWER, "gRPC")
+        engine.vote("n1", DEV, rest.id)
+        engine.vote("n1", PM, grpc.id)
+        engine.vote("n1", PM, rest.id)  # moved vote: 2 of 3
+        assert negotiation.status == AGREED
+        assert negotiation.winner is rest
+        assert "n1" not in engine.active
+        outcome = engine.get_outcome("n1")
+        assert outcome.winner.content == "REST"
+        assert outcome.support == pytest.approx(2 / 3)
+        with pytest.raises(NegotiationError):
+            engine.vote("n1", REVIEWER, grpc.id)
+
+    def test_weighted_and_quorum_modes(self):
+        engine = NegotiationEngine()
+        weighted = engine.start("w", [PM, DEV, REVIEWER], "scope", mode="weighted",
+                                weights={PM: 3, DEV: 1, REVIEWER: 1})
+        small = engine.propose("w", DEV, "small")
+        large = engine.propose("w", PM, "large")
+        engine.vote("w", DEV, small.id)
+        engine.vote("w", REVIEWER, small.id)
+        assert weighted.is_active  # 2 of 5
+        engine.vote("w", PM, large.id)  # 3 of 5
+        assert weighted.winner is large
+
+        quorum = engine.start("q", [PM, DEV, REVIEWER, TESTER], "db", mode="quorum", quorum=3)
+        pg = engine.propose("q", DEV, "postgres")
+        engine.vote("q", DEV, pg.id)
+        engine.vote("q", TESTER, pg.id)
+        assert quorum.is_active  # unanimous so far, but below quorum
+        engine.vote("q", PM, engine.propose("q", PM, "sqlite").id)
+        assert quorum.status == AGREED  # quorum reached: postgres holds 2 of 3 cast
+        assert quorum.winner is pg
+
+        with pytest.raises(NegotiationError):
+            engine.propose("unknown", PM, "x")
+        with pytest.raises(ValueError):
+            engine.start("bad", [PM], "x", mode="plurality")
+
+    def test_split_rounds_fail_and_outcomes_are_bounded(self):
+        engine = NegotiationEngine(max_rounds=2, max_finished=1)
+        negotiation = engine.start("split", [PM, DEV], "naming")
+        for expected_round in (1, 2):
+            assert negotiation.round == expected_round
+            a = engine.propose("split", PM, "a")
+            b = engine.propose("split", DEV, "b")
+            engine.vote("split", PM, a.id)
+            engine.vote("split", DEV, b.id)
+        assert negotiation.status == FAILED
+        assert engine.get_outcome("split").rounds == 2
+
+        engine.start("other", [PM], "x")
+        engine.cancel("other")
+        assert list(engine.finished) == ["other"]
+        assert engine.get_stats()['forgotten'] == 1
+        with pytest.raises(NegotiationError):
+            engine.propose("other", PM, "too late")
+
+    def test_many_voters_tally_incrementally(self):
+        engine = NegotiationEngine()
+        voters = list(AgentRole)
+        negotiation = engine.start("big", voters, "x")
+        proposals = [engine.propose("big", voters[0], str(i)) for i in range(200)]
+        half = len(voters) // 2
+        for voter in voters[:half]:
+            engine.vote("big", voter, proposals[-1].id)
+        assert negotiation.is_active
+        engine.vote("big", voters[half], proposals[-1].id)
+        assert negotiation.winner is proposals[-1]
+
+    @pytest.mark.asyncio
+    async def test_round_timeout_moves_on(self):
+        engine = NegotiationEngine(round_timeout=0.02, max_rounds=2)
+        negotiation = engine.start("slow", [PM, DEV], "x")
+        await asyncio.sleep(0.05)
+        assert negotiation.round == 2
+        await asyncio.sleep(0.05)
+        assert negotiation.status == FAILED
+        assert engine.get_stats()['rounds_timed_out'] == 2
+
+
+class TestHubNegotiation:
+    """Test negotiations through the hub."""
+
+    @pytest.mark.asyncio
+    async def test_participants_are_notified_of_the_outcome(self):
+        hub = CommunicationHub()
+        inbox = {DEV: [], REVIEWER: []}
+        for role in inbox:
+            hub.subscribe(role, lambda message, role=role: inbox[role].append(message))
+        await hub.start()
+        negotiation_id = await hub.start_negotiation([DEV, REVIEWER], "linting")
+        proposal = await hub.submit_proposal(negotiation_id, DEV, "ruff")
+        assert await hub.cast_vote(negotiation_id, DEV, proposal.id) == "active"
+        assert await hub.cast_vote(negotiation_id, REVIEWER, proposal.id) == "agreed"
+        await hub.stop(drain=True, timeout=5.0)
+
+        assert negotiation_id not in hub.active_negotiations
+        assert hub.get_negotiation_outcome(negotiation_id).winner.content == "ruff"
+        actions = [m.metadata['action'] for m in inbox[REVIEWER]]
+        assert actions == ['start', 'proposal', 'agreed']
+        assert all(m.message_type == MessageType.NEGOTIATION for m in inbox[DEV])
+        stats = hub.get_stats()
+        assert stats['active_negotiations'] == 0
+        assert stats['negotiations']['agreed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_stopped_hub_sends_nothing_on_round_timeouts(self):
+        hub = CommunicationHub(negotiation_round_timeout=0.02)
+        await hub.start()
+        negotiation_id = await hub.start_negotiation([DEV, REVIEWER], "naming", max_rounds=5)
+        await hub.stop()
+        sent = hub.delivery_stats['total_sent']
+        await asyncio.sleep(0.1)
+        assert hub.delivery_stats['total_sent'] == sent
+        negotiation = hub.active_negotiations[negotiation_id]
+        assert negotiation.is_active and negotiation.round == 1
+
+        # Restarting re-arms the round timer
+        await hub.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert negotiation.round >= 2
+        finally:
+            await hub.stop()
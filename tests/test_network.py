@@ -0,0 +1,189 @@
+"""
+Test suite for the networked hub server and client proxy
+"""
+
+import asyncio
+import pytest
+from codecollab.core.network import HubServer, HubClient
+from codecollab.core.transport import (
+    CONTROL, MESSAGE, decode_control, encode_control, encode_frame, read_frame
+)
+from codecollab.core.communication_hub import (
+    CommunicationHub, Message, AgentRole, MessageType
+)
+from tests.helpers import make_message
+
+
+async def wait_until(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate() and loop.time() < deadline:
+        await asyncio.sleep(0.01)
+
+
+class TestHubNetwork:
+    """Test HubClient against a HubServer on localhost."""
+
+    @pytest.mark.asyncio
+    async def test_messages_delivered_in_order_over_tcp(self):
+        hub = CommunicationHub()
+        server = HubServer(hub)
+        await hub.start()
+        await server.start()
+        received = []
+        observed = []
+        client = HubClient(port=server.address[1], pool_size=3)
+        client.subscribe(AgentRole.DEVELOPER, lambda message: received.append(message.content))
+        client.subscribe_to_all(lambda message: observed.append(message.content))
+        try:
+            await client.connect()
+            assert await client.send_messages(make_message(str(i)) for i in range(200)) == 200
+            await wait_until(lambda: len(received) == 200 and len(observed) == 200)
+            stats = server.get_stats()
+        finally:
+            await client.close()
+            await server.stop()
+            await hub.stop()
+
+        assert received == [str(i) for i in range(200)]
+        assert sorted(observed) == sorted(received)
+        assert stats['open_connections'] == 3
+        assert stats['messages_in'] == 200
+
+    @pytest.mark.asyncio
+    async def test_request_between_remote_agents_over_unix_socket(self, tmp_path):
+        hub = CommunicationHub()
+        server = HubServer(hub, path=str(tmp_path / "hub.sock"))
+        await hub.start()
+        await server.start()
+        pm = HubClient(path=server.address)
+        dev = HubClient(path=server.address)
+
+        async def answer(message):
+            # Reply from inside the delivery callback over the same connection
+            await dev.send_message(Message(
+                sender=AgentRole.DEVELOPER,
+                recipient=message.sender,
+                message_type=MessageType.TASK_RESPONSE,
+                content=f"done: {message.content}",
+                metadata={'response_to': message.id}
+            ))
+
+        dev.subscribe(AgentRole.DEVELOPER, answer)
+        try:
+            await pm.connect()
+            await dev.connect()
+            responses = await asyncio.gather(*(
+                pm.send_request(AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, f"task {i}", timeout=5.0)
+                for i in range(10)
+            ))
+            timed_out = await pm.send_request(
+                AgentRole.PRODUCT_MANAGER, AgentRole.TESTER, "nobody listens", timeout=0.1
+            )
+        finally:
+            await pm.close()
+            await dev.close()
+            await server.stop()
+            await hub.stop()
+
+        assert [r.content for r in responses] == [f"done: task {i}" for i in range(10)]
+        assert timed_out is None
+        assert len(hub.pending_requests) == 0
+
+    @pytest.mark.asyncio
+    async def test_disconnect_removes_remote_subscriptions(self):
+        hub = CommunicationHub()
+        server = HubServer(hub)
+        await hub.start()
+        await server.start()
+        client = HubClient(port=server.address[1], pool_size=1)
+        client.subscribe(AgentRole.TESTER, lambda message: None)
+        client.subscribe_to_all(lambda message: None)
+        try:
+            await client.connect()
+            assert AgentRole.TESTER in hub.subscribers
+            await client.close()
+            await wait_until(lambda: not server.connections)
+            assert AgentRole.TESTER not in hub.subscribers
+            assert hub.broadcast_subscribers == []
+            assert not await client.send_message(make_message("late"))
+        finally:
+            await server.stop()
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_bad_frames_do_not_drop_the_connection(self):
+        hub = CommunicationHub()
+        server = HubServer(hub)
+        await hub.start()
+        await server.start()
+        received = []
+        hub.subscribe(AgentRole.DEVELOPER, lambda message: received.append(message.content))
+        reader, writer = await asyncio.open_connection(*server.address)
+        try:
+            writer.write(encode_frame(MESSAGE, b"not a message"))
+            writer.write(encode_control(CONTROL, {'op': 'subscribe', 'role': 'nobody',
+                                                  'channel': 1, 'id': 7}))
+            writer.write(encode_frame(MESSAGE, server.codec.encode(make_message("still here"))))
+            kind, body = await asyncio.wait_for(read_frame(reader), timeout=5.0)
+            await wait_until(lambda: received)
+        finally:
+            writer.close()
+            await server.stop()
+            await hub.stop()
+
+        reply = decode_control(body)
+        assert reply['id'] == 7 and 'nobody' in reply['error']
+        assert received == ["still here"]
+        assert server.get_stats()['bad_frames'] == 2
+
+    @pytest.mark.asyncio
+    async def test_request_returns_none_when_the_server_stops(self):
+        hub = CommunicationHub()
+        server = HubServer(hub)
+        await hub.start()
+        await server.start()
+        client = HubClient(port=server.address[1], pool_size=1)
+        try:
+            await client.connect()
+            request = asyncio.create_task(client.send_request(
+                AgentRole.PRODUCT_MANAGER, AgentRole.TESTER, "nobody listens", timeout=5.0
+            ))
+            await wait_until(lambda: len(hub.pending_requests))
+            await server.stop()
+            assert server.connections == set()
+            assert await asyncio.wait_for(request, timeout=1.0) is None
+        finally:
+            await client.close()
+            await hub.stop()
+        assert len(hub.pending_requests) == 0
+
+    @pytest.mark.asyncio
+    async def test_reconnect_after_lost_pool(self):
+        hub = CommunicationHub()
+        server = HubServer(hub)
+        await hub.start()
+        await server.start()
+        received = []
+        client = HubClient(port=server.address[1], pool_size=2)
+        client.subscribe(AgentRole.DEVELOPER, lambda message: received.append(message.content))
+        try:
+            await client.connect()
+            for connection in list(server.connections):
+                connection.frames.writer.close()
+            await wait_until(lambda: not client.is_connected and not server.connections)
+            assert not client.is_connected
+
+            await asyncio.wait_for(client.connect(), timeout=5.0)
+            assert len(client._connections) == 2
+            assert await client.send_message(make_message("after reconnect"))
+            await wait_until(lambda: received)
+        finally:
+            await client.close()
+            await server.stop()
+            await hub.stop()
+        assert received == ["after reconnect"]
+
+    def test_requires_address(self):
+        with pytest.raises(ValueError):
+            HubClient()
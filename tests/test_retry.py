@@ -0,0 +1,158 @@
+"""
+Test suite for delivery retries, the timer wheel and the dead-letter queue
+"""
+
+import asyncio
+import pytest
+from codecollab.core.retry import DeadLetter, DeadLetterQueue, RetryPolicy, TimerWheel
+from codecollab.core.wal import WriteAheadLog
+from codecollab.core.communication_hub import (
+    CommunicationHub, Message, AgentRole, MessageType
+)
+from tests.helpers import make_message
+
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.01, jitter=0.0)
+
+
+class TestRetryPrimitives:
+    """Test RetryPolicy, TimerWheel and DeadLetterQueue."""
+
+    def test_backoff_is_exponential_capped_and_jittered(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0, multiplier=2.0, jitter=0.5)
+        assert policy.delay_for(1, rng=lambda: 0.0) == pytest.approx(0.1)
+        assert policy.delay_for(3, rng=lambda: 0.0) == pytest.approx(0.4)
+        assert policy.delay_for(10, rng=lambda: 0.0) == pytest.approx(1.0)
+        assert policy.delay_for(3, rng=lambda: 0.999) == pytest.approx(0.2, rel=0.01)
+        with pytest.raises(ValueError):
+            RetryPolicy(jitter=1.5)
+
+    @pytest.mark.asyncio
+    async def test_timer_wheel_fires_in_deadline_order(self):
+        wheel = TimerWheel(tick=0.005, slots=8)
+        fired = []
+        wheel.schedule(0.06, fired.append, "late")   # beyond one turn of the wheel
+        wheel.schedule(0.01, fired.append, "early")
+        cancelled = wheel.schedule(0.02, fired.append, "cancelled")
+        wheel.cancel(cancelled)
+        assert len(wheel) == 2
+        await asyncio.sleep(0.03)
+        assert fired == ["early"]
+        await asyncio.sleep(0.06)
+        assert fired == ["early", "late"]
+        assert len(wheel) == 0
+
+        wheel.schedule(10.0, fired.append, "pending")
+        assert [args for _, args in wheel.drain()] == [("pending",)]
+        assert len(wheel) == 0
+
+    def test_dead_letter_queue_is_bounded(self):
+        queue = DeadLetterQueue(max_size=2)
+        messages = [make_message(str(i)) for i in range(3)]
+        for message in messages:
+            queue.append(DeadLetter(message, AgentRole.DEVELOPER, "boom", 1))
+        assert [letter.message.content for letter in queue] == ["1", "2"]
+        assert queue.get_stats() == {'size': 2, 'total': 3, 'evicted': 1}
+        assert [letter.message.content for letter in queue.take([messages[2].id])] == ["2"]
+        assert len(queue) == 1
+
+
+class TestHubRetries:
+    """Test at-least-once delivery through the hub."""
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_retried_without_blocking_lane(self, tmp_path):
+        wal = WriteAheadLog(str(tmp_path), fsync=False)
+        hub = CommunicationHub(retry_policy=FAST_RETRY, wal=wal)
+        received = []
+        failures = {"flaky": 2}
+
+        def handler(message):
+            if failures.get(message.content, 0):
+                failures[message.content] -= 1
+                raise RuntimeError("agent busy")
+            received.append(message.content)
+
+        hub.subscribe(AgentRole.DEVELOPER, handler)
+        await hub.start()
+        try:
+            await hub.send_message(make_message("flaky"))
+            await hub.send_message(make_message("steady"))
+            await asyncio.sleep(0.01)
+            # The failing message waits on the timer; the lane moved on
+            assert received == ["steady"]
+            assert wal.pending_count() == 1
+            await asyncio.sleep(0.1)
+        finally:
+            await hub.stop()
+            await wal.close()
+
+        assert received == ["steady", "flaky"]
+        assert hub.delivery_stats['total_failed'] == 2
+        assert hub.delivery_stats['total_retried'] == 2
+        assert hub.get_dead_letters() == []
+        assert wal.pending_count() == 0
+        assert hub._attempts == {}
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_dead_letter_then_replay(self):
+        hub = CommunicationHub(retry_policy=FAST_RETRY)
+        healthy = False
+        received = []
+
+        def handler(message):
+            if not healthy:
+                raise RuntimeError("agent down")
+            received.append(message.content)
+
+        hub.subscribe(AgentRole.DEVELOPER, handler)
+        hub.subscribe(AgentRole.TESTER, lambda message: received.append(f"tester:{message.content}"))
+        await hub.start()
+        try:
+            await hub.send_message(Message(
+                sender=AgentRole.ORCHESTRATOR,
+                recipient=AgentRole.ORCHESTRATOR,
+                message_type=MessageType.STATUS_UPDATE,
+                content="kickoff",
+                recipients=[AgentRole.DEVELOPER, AgentRole.TESTER]
+            ))
+            await asyncio.sleep(0.2)
+            letters = hub.get_dead_letters()
+            assert len(letters) == 1
+            assert letters[0].destination == AgentRole.DEVELOPER
+            assert letters[0].attempts == 3
+            assert "agent down" in letters[0].error
+            assert received == ["tester:kickoff"]
+
+            healthy = True
+            assert hub.replay_dead_letters() == 1
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+
+        # Only the failed destination gets the replay
+        assert received == ["tester:kickoff", "kickoff"]
+        stats = hub.get_stats()
+        assert stats['dead_letters'] == {'size': 0, 'total': 1, 'evicted': 0}
+        assert stats['delivery_stats']['total_dead_lettered'] == 1
+
+    @pytest.mark.asyncio
+    async def test_without_policy_failures_are_dead_lettered_once(self):
+        hub = CommunicationHub()
+        calls = []
+
+        def handler(message):
+            calls.append(message.content)
+            raise RuntimeError("boom")
+
+        hub.subscribe(AgentRole.DEVELOPER, handler)
+        await hub.start()
+        try:
+            await hub.send_message(make_message("once"))
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+
+        assert calls == ["once"]
+        assert [letter.attempts for letter in hub.get_dead_letters()] == [1]
+        assert hub.delivery_stats['total_retried'] == 0
@@ -0,0 +1,95 @@
+"""
+Test suite for the observer subscription router
+"""
+
+import pytest
+import asyncio
+from codecollab.core.router import SubscriptionRouter
+from codecollab.core.communication_hub import (
+    CommunicationHub, Message, AgentRole, MessageType, MessagePriority
+)
+from tests.helpers import make_message
+
+
+class TestSubscriptionRouter:
+    """Test suite for SubscriptionRouter."""
+
+    def test_filters(self):
+        router = SubscriptionRouter()
+        everything = router.add(lambda m: None)
+        errors = router.add(lambda m: None, message_types=[MessageType.ERROR_REPORT])
+        reviewer = router.add(lambda m: None, recipients=[AgentRole.REVIEWER])
+        urgent = router.add(lambda m: None, priorities=[MessagePriority.URGENT])
+        replies = router.add(lambda m: None, metadata_keys=['response_to'])
+
+        assert router.match(make_message()) == (everything,)
+        assert set(router.match(make_message(message_type=MessageType.ERROR_REPORT))) == {everything, errors}
+        assert set(router.match(make_message(recipient=AgentRole.REVIEWER))) == {everything, reviewer}
+        assert set(router.match(make_message(priority=MessagePriority.URGENT))) == {everything, urgent}
+        assert set(router.match(make_message(metadata={'response_to': 'x'}))) == {everything, replies}
+
+    def test_multicast_matches_any_recipient(self):
+        router = SubscriptionRouter()
+        tester = router.add(lambda m: None, recipients=[AgentRole.TESTER])
+        message = Message(
+            sender=AgentRole.ORCHESTRATOR,
+            recipient=AgentRole.ORCHESTRATOR,
+            message_type=MessageType.STATUS_UPDATE,
+            content="multicast",
+            recipients=[AgentRole.DEVELOPER, AgentRole.TESTER]
+        )
+        assert router.match(message) == (tester,)
+
+    def test_table_invalidated_on_change(self):
+        router = SubscriptionRouter()
+        message = make_message(message_type=MessageType.NEGOTIATION)
+        assert router.match(message) == ()
+        first = router.add(lambda m: None, message_types=[MessageType.NEGOTIATION])
+        assert router.match(message) == (first,)
+        second = router.add(lambda m: None, recipients=[AgentRole.DEVELOPER])
+        assert set(router.match(message)) == {first, second}
+        assert router.remove(first.id)
+        assert not router.remove(first.id)
+        assert router.match(message) == (second,)
+
+
+class TestHubSubscriptions:
+    """Test hub integration of filtered observers."""
+
+    @pytest.mark.asyncio
+    async def test_filtered_observers(self):
+        hub = CommunicationHub()
+        errors = []
+        developer_watchers = [[], []]
+        hub.add_subscription(errors.append, message_types=[MessageType.ERROR_REPORT])
+        for seen in developer_watchers:
+            hub.add_subscription(seen.append, recipients=[AgentRole.DEVELOPER])
+
+        await hub.start()
+        try:
+            await hub.send_message(make_message(message_type=MessageType.ERROR_REPORT))
+            await hub.send_message(make_message(recipient=AgentRole.TESTER))
+            await hub.send_message(make_message())
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+
+        assert len(errors) == 1
+        assert all(len(seen) == 2 for seen in developer_watchers)
+        assert 'broadcast' in hub.get_stats()['lanes']
+        assert hub.get_stats()['observer_count'] == 3
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_stops_delivery(self):
+        hub = CommunicationHub()
+        seen = []
+        subscription = hub.subscribe_to_all(seen.append)
+        assert hub.unsubscribe(subscription.id)
+        await hub.start()
+        try:
+            await hub.send_message(make_message())
+            await asyncio.sleep(0.05)
+        finally:
+            await hub.stop()
+        assert seen == []
+        assert 'broadcast' not in hub.get_stats()['lanes']
@@ -0,0 +1,121 @@
+"""
+Test suite for the Communication Hub priority scheduler
+"""
+
+import pytest
+import asyncio
+from codecollab.core.scheduler import PriorityScheduler, SchedulerClosed
+from codecollab.core.communication_hub import (
+    CommunicationHub, AgentRole, MessagePriority
+)
+from tests.helpers import make_message
+
+
+class TestPriorityScheduler:
+    """Test suite for PriorityScheduler."""
+
+    def test_highest_priority_first_fifo_within_level(self):
+        scheduler = PriorityScheduler(levels=[1, 2, 3, 4], aging_threshold=None)
+        scheduler.put_nowait("low-1", 1)
+        scheduler.put_nowait("urgent-1", 4)
+        scheduler.put_nowait("low-2", 1)
+        scheduler.put_nowait("urgent-2", 4)
+        scheduler.put_nowait("medium", 2)
+
+        order = [scheduler.get_nowait() for _ in range(scheduler.qsize())]
+        assert order == ["urgent-1", "urgent-2", "medium", "low-1", "low-2"]
+        assert scheduler.empty()
+
+    def test_messages_are_never_compared(self):
+        scheduler = PriorityScheduler(levels=[p.value for p in MessagePriority])
+        first = make_message("a", priority=MessagePriority.HIGH)
+        second = make_message("b", priority=MessagePriority.HIGH)
+        scheduler.put_nowait(first, first.priority.value)
+        scheduler.put_nowait(second, second.priority.value)
+        assert scheduler.get_nowait() is first
+        assert scheduler.get_nowait() is second
+
+    def test_starvation_guard_promotes_aged_items(self, clock):
+        scheduler = PriorityScheduler(levels=[1, 4], aging_threshold=5.0, clock=clock)
+        scheduler.put_nowait("old-low", 1)
+        clock.now = 6.0
+        scheduler.put_nowait("urgent", 4)
+
+        assert scheduler.get_nowait() == "old-low"
+        assert scheduler.get_nowait() == "urgent"
+        assert scheduler.promotions == 1
+
+    def test_unknown_level_rejected(self):
+        scheduler = PriorityScheduler(levels=[1, 2])
+        with pytest.raises(ValueError):
+            scheduler.put_nowait("x", 9)
+
+    @pytest.mark.asyncio
+    async def test_get_waits_for_put(self):
+        scheduler = PriorityScheduler(levels=[1, 2])
+        getter = asyncio.create_task(scheduler.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        await scheduler.put("item", 2)
+        assert await asyncio.wait_for(getter, timeout=1.0) == "item"
+        scheduler.task_done()
+        await asyncio.wait_for(scheduler.join(), timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_put_many_and_get_batch(self):
+        scheduler = PriorityScheduler(levels=[1, 2])
+        with pytest.raises(ValueError):
+            scheduler.put_many([("a", 1), ("b", 9)])
+        assert scheduler.qsize() == 0
+
+        getter = asyncio.create_task(scheduler.get_batch(3))
+        await asyncio.sleep(0)
+        assert scheduler.put_many([("low", 1), ("high-1", 2), ("high-2", 2), ("rest", 1)]) == 4
+        assert await asyncio.wait_for(getter, timeout=1.0) == ["high-1", "high-2", "low"]
+        assert scheduler.get_many_nowait(10) == ["rest"]
+        for _ in range(4):
+            scheduler.task_done()
+        await asyncio.wait_for(scheduler.join(), timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_close_wakes_getters(self):
+        scheduler = PriorityScheduler(levels=[1, 2])
+        getter = asyncio.create_task(scheduler.get_batch(4))
+        await asyncio.sleep(0)
+        scheduler.close()
+        with pytest.raises(SchedulerClosed):
+            await asyncio.wait_for(getter, timeout=1.0)
+
+        # Producers keep working; consumers only get items without waiting
+        scheduler.put_nowait("kept", 1)
+        with pytest.raises(SchedulerClosed):
+            await scheduler.get()
+        assert scheduler.get_nowait() == "kept"
+        scheduler.reopen()
+        scheduler.put_nowait("next", 2)
+        assert await scheduler.get() == "next"
+
+    @pytest.mark.asyncio
+    async def test_hub_delivers_urgent_before_backlog(self):
+        hub = CommunicationHub()
+        received = []
+
+        async def handler(message):
+            received.append(message.content)
+
+        hub.subscribe(AgentRole.DEVELOPER, handler)
+        for i in range(20):
+            await hub.send_message(make_message(f"low-{i}", priority=MessagePriority.LOW))
+        await hub.send_message(make_message("urgent", priority=MessagePriority.URGENT))
+
+        stats = hub.get_stats()
+        assert stats['queue_depths']['LOW'] == 20
+        assert stats['queue_depths']['URGENT'] == 1
+
+        await hub.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await hub.stop()
+        assert received[0] == "urgent"
+        assert len(received) == 21
@@ -0,0 +1,98 @@
+"""
+Test suite for the multi-process sharded hub
+"""
+
+import asyncio
+import pytest
+from codecollab.core.sharding import ShardedHub, ShardRoutingTable
+from codecollab.core.communication_hub import Message, AgentRole, MessageType
+from tests.helpers import make_message
+
+
+async def wait_for_lines(path, count, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        if path.exists() and len(path.read_text().splitlines()) >= count:
+            break
+        await asyncio.sleep(0.02)
+    return path.read_text().splitlines() if path.exists() else []
+
+
+class TestShardRoutingTable:
+    """Test suite for ShardRoutingTable."""
+
+    def test_round_robin_and_overrides(self):
+        table = ShardRoutingTable(2, assignments={AgentRole.TESTER: 0})
+        assert table.shard_for(AgentRole.PRODUCT_MANAGER) == 0
+        assert table.shard_for(AgentRole.DEVELOPER) == 1
+        assert table.shard_for(AgentRole.TESTER) == 0
+        assert set(table.roles_for(0)) | set(table.roles_for(1)) == set(AgentRole)
+        multicast = make_message("all", recipients=[AgentRole.DEVELOPER, AgentRole.TESTER])
+        assert table.shards_for(multicast) == [0, 1]
+        with pytest.raises(ValueError):
+            ShardRoutingTable(2, assignments={AgentRole.TESTER: 5})
+
+
+class TestShardedHub:
+    """Test cross-process delivery through ShardedHub."""
+
+    @pytest.mark.asyncio
+    async def test_delivery_and_cross_shard_request(self, tmp_path):
+        log = tmp_path / "received.txt"
+        hub = ShardedHub(shards=2)
+
+        def record(line):
+            with open(log, "a") as handle:
+                handle.write(line + "\n")
+
+        async def pm_handler(message):
+            record(f"pm:{message.content}")
+            if message.content == "ask":
+                # PM (shard 0) asks the developer (shard 1) and waits for the reply
+                response = await hub.send_request(
+                    AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "estimate?", timeout=5.0
+                )
+                record(f"pm-got:{response.content if response else None}")
+
+        async def dev_handler(message):
+            record(f"dev:{message.content}")
+            if message.requires_response:
+                await hub.send_message(Message(
+                    sender=AgentRole.DEVELOPER,
+                    recipient=message.sender,
+                    message_type=MessageType.TASK_RESPONSE,
+                    content="3 days",
+                    metadata={'response_to': message.id}
+                ))
+
+        def tester_handler(message):
+            record(f"tester:{message.content}")
+
+        hub.subscribe(AgentRole.PRODUCT_MANAGER, pm_handler)
+        hub.subscribe(AgentRole.DEVELOPER, dev_handler)
+        hub.subscribe(AgentRole.TESTER, tester_handler)
+        with pytest.raises(RuntimeError):
+            await hub.send_request(AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, "x")
+
+        await hub.start()
+        try:
+            with pytest.raises(RuntimeError):
+                hub.subscribe(AgentRole.REVIEWER, tester_handler)
+            assert await hub.send_message(make_message("hello"))
+            assert await hub.send_message(make_message("ask", recipient=AgentRole.PRODUCT_MANAGER))
+            assert await hub.send_message(make_message(
+                "kickoff", recipients=[AgentRole.PRODUCT_MANAGER, AgentRole.DEVELOPER, AgentRole.TESTER]
+            ))
+            lines = await wait_for_lines(log, 8)
+            stats = await hub.get_stats()
+        finally:
+            await hub.stop()
+
+        assert sorted(lines) == sorted([
+            "dev:hello", "pm:ask", "pm:kickoff", "dev:kickoff", "tester:kickoff",
+            "dev:estimate?", "pm:3 days", "pm-got:3 days"
+        ])
+        assert len(stats['shards']) == 2
+        assert len({shard['pid'] for shard in stats['shards']}) == 2
+        assert stats['total_forwarded'] == 2
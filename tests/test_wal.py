@@ -0,0 +1,171 @@
+"""
+Test suite for the write-ahead message log
+"""
+
+import os
+import pytest
+import asyncio
+from codecollab.core.wal import WriteAheadLog
+from codecollab.core.communication_hub import (
+    CommunicationHub, AgentRole, MessagePriority
+)
+from tests.helpers import make_message
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+
+
+class TestWriteAheadLog:
+    """Test suite for WriteAheadLog."""
+
+    @pytest.mark.asyncio
+    async def test_recovers_unacknowledged_messages(self, tmp_path):
+        wal = WriteAheadLog(str(tmp_path), fsync=False)
+        wal.open()
+        messages = [make_message(str(i), metadata={'step': str(i)}) for i in range(5)]
+        for message in messages:
+            await wal.append(message)
+        wal.ack(messages[1].id)
+        wal.ack(messages[3].id)
+        await wal.close()
+
+        reopened = WriteAheadLog(str(tmp_path), fsync=False)
+        reopened.open()
+        recovered = reopened.take_recovered()
+        assert recovered == [messages[0], messages[2], messages[4]]
+        assert recovered[0].metadata == {'step': '0'}
+        assert reopened.take_recovered() == []
+        assert reopened.pending_count() == 3
+
+    @pytest.mark.asyncio
+    async def test_torn_tail_is_ignored(self, tmp_path):
+        wal = WriteAheadLog(str(tmp_path), fsync=False)
+        wal.open()
+        await wal.append_many([make_message("kept"), make_message("torn")])
+        await wal.close()
+        path = os.path.join(str(tmp_path), segment_files(str(tmp_path))[0])
+        with open(path, "r+b") as handle:
+            handle.truncate(os.path.getsize(path) - 3)
+
+        reopened = WriteAheadLog(str(tmp_path), fsync=False)
+        reopened.open()
+        assert [m.content for m in reopened.take_recovered()] == ["kept"]
+        assert reopened.stats['corrupt_frames'] == 1
+
+    @pytest.mark.asyncio
+    async def test_acknowledged_segments_are_compacted(self, tmp_path):
+        wal = WriteAheadLog(str(tmp_path), segment_bytes=512, fsync=False)
+        wal.open()
+        messages = [make_message(f"message {i}") for i in range(40)]
+        await wal.append_many(messages)
+        assert len(segment_files(str(tmp_path))) > 3
+
+        for message in messages[:-1]:
+            wal.ack(message.id)
+        await wal.commit()
+        await wal.append(make_message("rotate"))
+        # Everything before the segment holding the last unacked message is gone
+        oldest_live = wal._segment_of[messages[-1].id]
+        assert wal.stats['compacted_segments'] == oldest_live - 1
+        assert segment_files(str(tmp_path))[0] == f"wal-{oldest_live:08d}.log"
+        await wal.close()
+
+        reopened = WriteAheadLog(str(tmp_path), fsync=False)
+        reopened.open()
+        assert [m.content for m in reopened.take_recovered()] == ["message 39", "rotate"]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_does_not_pin_segments(self, tmp_path, monkeypatch):
+        wal = WriteAheadLog(str(tmp_path), segment_bytes=512, fsync=False)
+        wal.open()
+        messages = [make_message(f"message {i}") for i in range(10)]
+        await wal.append_many(messages)
+
+        def full_disk(batch):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(wal, "_write_batch", full_disk)
+        with pytest.raises(OSError):
+            await wal.append_many([make_message(f"lost {i}") for i in range(10)])
+        assert wal.pending_count() == 10
+        monkeypatch.undo()
+
+        for message in messages:
+            wal.ack(message.id)
+        await wal.commit()
+        await wal.append(make_message("rotate"))
+        # Only the active segment is left: nothing pins the ones the lost batch went to
+        assert list(wal._live) == [wal._active_id]
+        await wal.close()
+
+    @pytest.mark.asyncio
+    async def test_acks_ride_along_with_the_next_commit(self, tmp_path):
+        wal = WriteAheadLog(str(tmp_path), fsync=False)
+        wal.open()
+        message = make_message("once")
+        await wal.append(message)
+        wal.ack(message.id)
+        await asyncio.sleep(0.01)
+        assert wal.stats['commits'] == 1
+        await wal.commit()
+        assert wal.stats['commits'] == 2
+        await wal.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_share_commits(self, tmp_path):
+        wal = WriteAheadLog(str(tmp_path))
+        wal.open()
+        await asyncio.gather(*(wal.append(make_message(str(i))) for i in range(200)))
+        assert wal.stats['appended'] == 200
+        assert wal.stats['commits'] < 20
+        await wal.close()
+
+
+class TestHubRecovery:
+    """Test hub replay of undelivered messages."""
+
+    @pytest.mark.asyncio
+    async def test_restart_replays_undelivered_messages(self, tmp_path):
+        first = CommunicationHub(wal=WriteAheadLog(str(tmp_path), fsync=False))
+        await first.send_message(make_message("low", priority=MessagePriority.LOW))
+        await first.send_message(make_message("urgent", priority=MessagePriority.URGENT))
+        # Crash before the hub ever delivered anything
+        await first.wal.close()
+
+        received = []
+        second = CommunicationHub(wal=WriteAheadLog(str(tmp_path), fsync=False))
+        second.subscribe(AgentRole.DEVELOPER, lambda message: received.append(message.content))
+        await second.start()
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            await second.stop()
+        assert received == ["urgent", "low"]
+        assert second.get_stats()['wal']['pending'] == 0
+        assert second.get_stats()['total_messages'] == 2
+        await second.wal.close()
+
+        third = CommunicationHub(wal=WriteAheadLog(str(tmp_path), fsync=False))
+        assert third.wal.take_recovered() == []
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_the_log_and_start_resumes_it(self, tmp_path):
+        hub = CommunicationHub(wal=WriteAheadLog(str(tmp_path), fsync=False))
+        received = []
+        hub.subscribe(AgentRole.DEVELOPER, lambda message: received.append(message.content))
+        await hub.start()
+        await hub.send_message(make_message("first"))
+        await asyncio.sleep(0.02)
+        await hub.stop()
+        assert not hub.wal.is_open and hub.wal._file is None
+
+        # Sent while stopped: logged, and delivered once after the restart
+        assert await hub.send_message(make_message("second"))
+        await hub.start()
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            await hub.stop()
+        assert received == ["first", "second"]
+        assert hub.get_stats()['wal']['pending'] == 0